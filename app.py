@@ -1,496 +1,714 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import mysql.connector
-import bcrypt
-from datetime import datetime
-from dotenv import load_dotenv
-import os
-
-# ------------------ Load Environment Variables ------------------
-load_dotenv()
-DB_HOST = os.getenv("DB_HOST")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_NAME = os.getenv("DB_NAME")
-DB_ADMIN_USERNAME = os.getenv("DB_ADMIN_USERNAME")
-DB_ADMIN_PASSWORD = os.getenv("DB_ADMIN_PASSWORD")
-
-# ------------------ Utility Functions ------------------
-def hash_password(password):
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-def check_password(input_pw, hashed_pw):
-    return bcrypt.checkpw(input_pw.encode('utf-8'), hashed_pw.encode('utf-8'))
-
-# ------------------ Main Application Class ------------------
-class CarRentalApp(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("Car Rental System")
-        self.geometry("800x600")
-        
-        # Use ttk themed style for a modern look
-        self.style = ttk.Style(self)
-        self.style.theme_use("clam")
-        
-        # Initialize DB connection
-        try:
-            self.conn = mysql.connector.connect(
-                host=DB_HOST,
-                user=DB_USER,
-                password=DB_PASSWORD,
-                database=DB_NAME
-            )
-            self.cursor = self.conn.cursor()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", f"Failed to connect to DB:\n{err}")
-            self.destroy()
-            return
-
-        # Container frame to hold all pages
-        container = ttk.Frame(self)
-        container.pack(side="top", fill="both", expand=True)
-        container.grid_rowconfigure(0, weight=1)
-        container.grid_columnconfigure(0, weight=1)
-
-        # Dictionary of frames for page switching
-        self.frames = {}
-        for F in (StartPage, LoginPage, SignupPage, AdminPanel, UserPanel):
-            frame = F(parent=container, controller=self)
-            self.frames[F.__name__] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
-
-        self.show_frame("StartPage")
-
-    def show_frame(self, frame_name):
-        frame = self.frames[frame_name]
-        frame.tkraise()
-
-# ------------------ Start (Welcome) Page ------------------
-class StartPage(ttk.Frame):
-    def __init__(self, parent, controller):
-        super().__init__(parent)
-        self.controller = controller
-        title = ttk.Label(self, text="Welcome to the Car Rental System", font=("Arial", 20))
-        title.pack(pady=20)
-        ttk.Button(self, text="Login", width=20,
-                   command=lambda: controller.show_frame("LoginPage")).pack(pady=10)
-        ttk.Button(self, text="Sign Up", width=20,
-                   command=lambda: controller.show_frame("SignupPage")).pack(pady=10)
-
-# ------------------ Login Page ------------------
-class LoginPage(ttk.Frame):
-    def __init__(self, parent, controller):
-        super().__init__(parent)
-        self.controller = controller
-        
-        title = ttk.Label(self, text="Login", font=("Arial", 20))
-        title.grid(row=0, column=0, columnspan=2, pady=20)
-        
-        ttk.Label(self, text="Username:").grid(row=1, column=0, sticky="e", padx=5, pady=5)
-        self.username_entry = ttk.Entry(self)
-        self.username_entry.grid(row=1, column=1, padx=5, pady=5)
-        
-        ttk.Label(self, text="Password:").grid(row=2, column=0, sticky="e", padx=5, pady=5)
-        self.password_entry = ttk.Entry(self, show="*")
-        self.password_entry.grid(row=2, column=1, padx=5, pady=5)
-        
-        ttk.Button(self, text="Login", command=self.login).grid(row=3, column=0, columnspan=2, pady=10)
-        ttk.Button(self, text="Back",
-                   command=lambda: controller.show_frame("StartPage")).grid(row=4, column=0, columnspan=2, pady=10)
-    
-    def login(self):
-        username = self.username_entry.get()
-        password = self.password_entry.get()
-        if len(username) < 3 or len(password) < 5:
-            messagebox.showwarning("Validation Error", "Username must be at least 3 characters and password at least 5 characters.")
-            return
-        try:
-            self.controller.cursor.execute("SELECT userID, password, role FROM users WHERE userName = %s", (username,))
-            result = self.controller.cursor.fetchone()
-            if result:
-                userID, hashed_pw, role = result
-                if check_password(password, hashed_pw):
-                    # Switch to admin or user panel
-                    if role == 'admin':
-                        self.controller.frames["AdminPanel"].set_admin_details(userID)
-                        self.controller.show_frame("AdminPanel")
-                    else:
-                        self.controller.frames["UserPanel"].set_user_details(userID)
-                        self.controller.show_frame("UserPanel")
-                else:
-                    messagebox.showerror("Login Failed", "Incorrect password.")
-            else:
-                messagebox.showerror("Login Failed", "User does not exist. Please sign up first.")
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
-
-# ------------------ Sign Up Page ------------------
-class SignupPage(ttk.Frame):
-    def __init__(self, parent, controller):
-        super().__init__(parent)
-        self.controller = controller
-        
-        title = ttk.Label(self, text="Sign Up", font=("Arial", 20))
-        title.grid(row=0, column=0, columnspan=2, pady=20)
-        
-        ttk.Label(self, text="Username:").grid(row=1, column=0, sticky="e", padx=5, pady=5)
-        self.username_entry = ttk.Entry(self)
-        self.username_entry.grid(row=1, column=1, padx=5, pady=5)
-        
-        ttk.Label(self, text="Email:").grid(row=2, column=0, sticky="e", padx=5, pady=5)
-        self.email_entry = ttk.Entry(self)
-        self.email_entry.grid(row=2, column=1, padx=5, pady=5)
-        
-        ttk.Label(self, text="Password:").grid(row=3, column=0, sticky="e", padx=5, pady=5)
-        self.password_entry = ttk.Entry(self, show="*")
-        self.password_entry.grid(row=3, column=1, padx=5, pady=5)
-        
-        ttk.Button(self, text="Sign Up", command=self.signup).grid(row=4, column=0, columnspan=2, pady=10)
-        ttk.Button(self, text="Back",
-                   command=lambda: controller.show_frame("StartPage")).grid(row=5, column=0, columnspan=2, pady=10)
-    
-    def signup(self):
-        username = self.username_entry.get()
-        email = self.email_entry.get()
-        password = self.password_entry.get()
-        
-        if len(username) < 3 or len(password) < 5:
-            messagebox.showwarning("Validation Error", "Username must be at least 3 characters and password at least 5 characters.")
-            return
-
-        # Give admin role if username/password match admin settings
-        role = 'admin' if username.startswith(DB_ADMIN_USERNAME) and password == DB_ADMIN_PASSWORD else 'user'
-        hashed = hash_password(password)
-        try:
-            self.controller.cursor.execute(
-                "INSERT INTO users (userName, email, password, role) VALUES (%s, %s, %s, %s)",
-                (username, email, hashed, role)
-            )
-            self.controller.conn.commit()
-            messagebox.showinfo("Success", "Account created successfully. Please login.")
-            self.controller.show_frame("LoginPage")
-        except mysql.connector.Error as err:
-            messagebox.showerror("Error", str(err))
-
-# ------------------ Admin Panel Page ------------------
-class AdminPanel(ttk.Frame):
-    def __init__(self, parent, controller):
-        super().__init__(parent)
-        self.controller = controller
-        self.admin_id = None
-        
-        title = ttk.Label(self, text="Admin Panel", font=("Arial", 20))
-        title.pack(pady=10)
-        
-        # Inventory Treeview
-        self.tree = ttk.Treeview(self, columns=("Inventory ID", "Car Name", "Model", "Year", "License", "Price/Day"),
-                                 show='headings')
-        for col in self.tree['columns']:
-            self.tree.heading(col, text=col)
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        # Button frame for admin actions
-        btn_frame = ttk.Frame(self)
-        btn_frame.pack(pady=10)
-        ttk.Button(btn_frame, text="Add Car", command=self.add_car).grid(row=0, column=0, padx=5)
-        ttk.Button(btn_frame, text="Remove Car", command=self.remove_car).grid(row=0, column=1, padx=5)
-        ttk.Button(btn_frame, text="Edit Cost", command=self.edit_cost).grid(row=0, column=2, padx=5)
-        ttk.Button(btn_frame, text="Refresh", command=self.load_inventory).grid(row=0, column=3, padx=5)
-        ttk.Button(btn_frame, text="Logout",
-                   command=lambda: self.controller.show_frame("StartPage")).grid(row=0, column=4, padx=5)
-        
-        self.load_inventory()
-    
-    def set_admin_details(self, admin_id):
-        self.admin_id = admin_id
-        self.load_inventory()
-    
-    def load_inventory(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        query = """
-            SELECT ci.inventoryID, c.carName, c.carModel, c.carModelYear, c.carLicensePlate, ci.pricePerDay
-            FROM carInventory ci
-            JOIN cars c ON ci.carID = c.carID
-        """
-        try:
-            self.controller.cursor.execute(query)
-            for row in self.controller.cursor.fetchall():
-                self.tree.insert('', 'end', values=row)
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
-    
-    def add_car(self):
-        add_win = tk.Toplevel(self)
-        add_win.title("Add Car")
-        labels = ["Name", "Model", "Year", "License Plate", "Price/Day", "Horsepower", "Seating", "Fuel Efficiency"]
-        entries = {}
-        for i, text in enumerate(labels):
-            ttk.Label(add_win, text=f"{text}:").grid(row=i, column=0, sticky="e", padx=5, pady=5)
-            entry = ttk.Entry(add_win)
-            entry.grid(row=i, column=1, padx=5, pady=5)
-            entries[text] = entry
-
-        def confirm_add():
-            try:
-                carName = entries["Name"].get()
-                model = entries["Model"].get()
-                year = int(entries["Year"].get())
-                plate = entries["License Plate"].get()
-                price = float(entries["Price/Day"].get())
-                hp = entries["Horsepower"].get()
-                seat = int(entries["Seating"].get())
-                fuel = entries["Fuel Efficiency"].get()
-                cur = self.controller.cursor
-                conn = self.controller.conn
-
-                cur.execute("INSERT INTO cars (carName, carModel, carModelYear, carLicensePlate) VALUES (%s, %s, %s, %s)",
-                            (carName, model, year, plate))
-                carID = cur.lastrowid
-                cur.execute("INSERT INTO carInventory (carID, pricePerDay, isAvailable) VALUES (%s, %s, 1)", (carID, price))
-                inventoryID = cur.lastrowid
-                cur.execute("INSERT INTO carSpecs (inventoryID, horsepower, seatingCapacity, fuelEfficiency) VALUES (%s, %s, %s, %s)",
-                            (inventoryID, hp, seat, fuel))
-                conn.commit()
-                messagebox.showinfo("Success", "Car added successfully.")
-                add_win.destroy()
-                self.load_inventory()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-
-        ttk.Button(add_win, text="Add", command=confirm_add).grid(row=len(labels), column=0, columnspan=2, pady=10)
-    
-    def remove_car(self):
-        selected = self.tree.selection()
-        if not selected:
-            messagebox.showwarning("No Selection", "Select a car to remove.")
-            return
-        inventoryID = self.tree.item(selected[0])['values'][0]
-        try:
-            self.controller.cursor.execute("DELETE FROM carInventory WHERE inventoryID = %s", (inventoryID,))
-            self.controller.conn.commit()
-            messagebox.showinfo("Removed", "Car removed from inventory.")
-            self.load_inventory()
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-    
-    def edit_cost(self):
-        selected = self.tree.selection()
-        if not selected:
-            messagebox.showwarning("No Selection", "Select a car to edit.")
-            return
-        inventoryID = self.tree.item(selected[0])['values'][0]
-        current_cost = self.tree.item(selected[0])['values'][5]
-        cost_win = tk.Toplevel(self)
-        cost_win.title("Edit Cost")
-        ttk.Label(cost_win, text="New Price Per Day:").grid(row=0, column=0, padx=5, pady=5)
-        cost_entry = ttk.Entry(cost_win)
-        cost_entry.insert(0, str(current_cost))
-        cost_entry.grid(row=0, column=1, padx=5, pady=5)
-
-        def confirm_edit():
-            try:
-                new_cost = float(cost_entry.get())
-                self.controller.cursor.execute("UPDATE carInventory SET pricePerDay = %s WHERE inventoryID = %s",
-                                                 (new_cost, inventoryID))
-                self.controller.conn.commit()
-                messagebox.showinfo("Updated", "Rental cost updated.")
-                cost_win.destroy()
-                self.load_inventory()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-                
-        ttk.Button(cost_win, text="Update", command=confirm_edit).grid(row=1, column=0, columnspan=2, pady=10)
-
-# ------------------ User Panel Page ------------------
-class UserPanel(ttk.Frame):
-    def __init__(self, parent, controller):
-        super().__init__(parent)
-        self.controller = controller
-        self.user_id = None
-        
-        title = ttk.Label(self, text="User Panel", font=("Arial", 20))
-        title.pack(pady=10)
-        
-        # Available cars Treeview
-        self.tree = ttk.Treeview(self, columns=("Inventory ID", "Car Name", "Model", "Year", "License", "Price/Day"),
-                                 show='headings')
-        for col in self.tree['columns']:
-            self.tree.heading(col, text=col)
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        btn_frame = ttk.Frame(self)
-        btn_frame.pack(pady=10)
-        ttk.Button(btn_frame, text="View Car Specs", command=self.view_specs).grid(row=0, column=0, padx=5)
-        ttk.Button(btn_frame, text="Rent Car", command=self.rent_car).grid(row=0, column=1, padx=5)
-        ttk.Button(btn_frame, text="Return Car", command=self.return_car).grid(row=0, column=2, padx=5)
-        ttk.Button(btn_frame, text="Transaction Log", command=self.view_transactions).grid(row=0, column=3, padx=5)
-        ttk.Button(btn_frame, text="Refresh", command=self.load_available).grid(row=0, column=4, padx=5)
-        ttk.Button(btn_frame, text="Logout",
-                   command=lambda: self.controller.show_frame("StartPage")).grid(row=0, column=5, padx=5)
-        
-        self.load_available()
-    
-    def set_user_details(self, user_id):
-        self.user_id = user_id
-        self.load_available()
-    
-    def load_available(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        query = """
-            SELECT ci.inventoryID, c.carName, c.carModel, c.carModelYear, c.carLicensePlate, ci.pricePerDay
-            FROM carInventory ci
-            JOIN cars c ON ci.carID = c.carID
-            WHERE ci.isAvailable = 1
-        """
-        try:
-            self.controller.cursor.execute(query)
-            for row in self.controller.cursor.fetchall():
-                self.tree.insert('', 'end', values=row)
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
-    
-    def view_specs(self):
-        selected = self.tree.selection()
-        if not selected:
-            messagebox.showwarning("Select a Car", "Please select a car first.")
-            return
-        inventoryID = self.tree.item(selected[0])['values'][0]
-        try:
-            self.controller.cursor.execute("SELECT horsepower, seatingCapacity, fuelEfficiency FROM carSpecs WHERE inventoryID = %s", (inventoryID,))
-            result = self.controller.cursor.fetchone()
-            if result:
-                horsepower, seating, fuel = result
-                messagebox.showinfo("Car Specs", f"Horsepower: {horsepower}\nSeating Capacity: {seating}\nFuel Efficiency: {fuel}")
-            else:
-                messagebox.showinfo("Car Specs", "No specs found for this car.")
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
-    
-    def rent_car(self):
-        selected = self.tree.selection()
-        if not selected:
-            messagebox.showwarning("Select a Car", "Please select a car to rent.")
-            return
-        inventoryID = self.tree.item(selected[0])['values'][0]
-        
-        rent_win = tk.Toplevel(self)
-        rent_win.title("Rent Car")
-        ttk.Label(rent_win, text="Start Date (YYYY-MM-DD):").grid(row=0, column=0, padx=5, pady=5)
-        ttk.Label(rent_win, text="End Date (YYYY-MM-DD):").grid(row=1, column=0, padx=5, pady=5)
-        ttk.Label(rent_win, text="Insurance Type (basic, standard, premium):").grid(row=2, column=0, padx=5, pady=5)
-        start_entry = ttk.Entry(rent_win)
-        end_entry = ttk.Entry(rent_win)
-        insurance_entry = ttk.Entry(rent_win)
-        start_entry.grid(row=0, column=1, padx=5, pady=5)
-        end_entry.grid(row=1, column=1, padx=5, pady=5)
-        insurance_entry.grid(row=2, column=1, padx=5, pady=5)
-
-        def confirm_rent():
-            try:
-                rentDate = datetime.strptime(start_entry.get(), "%Y-%m-%d").date()
-                returnDate = datetime.strptime(end_entry.get(), "%Y-%m-%d").date()
-                insuranceType = insurance_entry.get().lower()
-                if insuranceType not in ['basic', 'standard', 'premium']:
-                    messagebox.showerror("Invalid Insurance", "Choose: basic, standard, or premium")
-                    return
-                days = (returnDate - rentDate).days
-                if days <= 0:
-                    messagebox.showerror("Invalid Date", "Return date must be after rent date.")
-                    return
-
-                self.controller.cursor.execute("SELECT pricePerDay FROM carInventory WHERE inventoryID = %s", (inventoryID,))
-                price = self.controller.cursor.fetchone()[0]
-                insuranceRate = {"basic": 10, "standard": 20, "premium": 30}[insuranceType]
-                rentalCost = days * price
-                insuranceCost = days * insuranceRate
-
-                query = """
-                    INSERT INTO rentedCars (renterID, inventoryID, rentDate, returnDate, insuranceType, insuranceCost, rentalCost)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """
-                self.controller.cursor.execute(query,
-                                               (self.user_id, inventoryID, rentDate, returnDate, insuranceType, insuranceCost, rentalCost))
-                self.controller.cursor.execute("UPDATE carInventory SET isAvailable = 0 WHERE inventoryID = %s", (inventoryID,))
-                self.controller.conn.commit()
-                messagebox.showinfo("Success", "Car rented successfully!")
-                rent_win.destroy()
-                self.load_available()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-        
-        ttk.Button(rent_win, text="Confirm", command=confirm_rent).grid(row=3, column=0, columnspan=2, pady=10)
-    
-    def return_car(self):
-        return_win = tk.Toplevel(self)
-        return_win.title("Return Car")
-        tree = ttk.Treeview(return_win, columns=("Rental ID", "Car", "Model", "Year", "Total Cost"), show='headings')
-        for col in tree['columns']:
-            tree.heading(col, text=col)
-        tree.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        query = """
-            SELECT r.rentalID, c.carName, c.carModel, c.carModelYear, (r.rentalCost + r.insuranceCost)
-            FROM rentedCars r
-            JOIN carInventory ci ON r.inventoryID = ci.inventoryID
-            JOIN cars c ON ci.carID = c.carID
-            WHERE r.renterID = %s AND ci.isAvailable = 0
-        """
-        try:
-            self.controller.cursor.execute(query, (self.user_id,))
-            for row in self.controller.cursor.fetchall():
-                tree.insert('', 'end', values=row)
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
-        
-        def confirm_return():
-            selected = tree.selection()
-            if not selected:
-                messagebox.showwarning("Select Rental", "Please select a rental to return.")
-                return
-            rentalID = tree.item(selected[0])['values'][0]
-            try:
-                self.controller.cursor.execute("SELECT inventoryID FROM rentedCars WHERE rentalID = %s", (rentalID,))
-                inventoryID = self.controller.cursor.fetchone()[0]
-                self.controller.cursor.execute("UPDATE rentedCars SET returnDate = CURDATE() WHERE rentalID = %s", (rentalID,))
-                self.controller.cursor.execute("UPDATE carInventory SET isAvailable = 1 WHERE inventoryID = %s", (inventoryID,))
-                self.controller.cursor.execute("INSERT INTO transactions (rentalID) VALUES (%s)", (rentalID,))
-                self.controller.conn.commit()
-                messagebox.showinfo("Returned", "Car returned and transaction logged.")
-                return_win.destroy()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-        
-        ttk.Button(return_win, text="Confirm Return", command=confirm_return).pack(pady=10)
-    
-    def view_transactions(self):
-        trans_win = tk.Toplevel(self)
-        trans_win.title("Transaction Log")
-        tree = ttk.Treeview(trans_win, columns=("Transaction ID", "Date", "Car", "Model", "Year", "Total Paid"), show='headings')
-        for col in tree['columns']:
-            tree.heading(col, text=col)
-        tree.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        query = """
-            SELECT t.transactionID, t.transactionDate, c.carName, c.carModel, c.carModelYear,
-                   (r.rentalCost + r.insuranceCost) AS totalPaid
-            FROM transactions t
-            JOIN rentedCars r ON t.rentalID = r.rentalID
-            JOIN carInventory ci ON r.inventoryID = ci.inventoryID
-            JOIN cars c ON ci.carID = c.carID
-            WHERE r.renterID = %s
-            ORDER BY t.transactionDate DESC
-        """
-        try:
-            self.controller.cursor.execute(query, (self.user_id,))
-            for row in self.controller.cursor.fetchall():
-                tree.insert('', 'end', values=row)
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
-
-# ------------------ Run the Application ------------------
-if __name__ == "__main__":
-    app = CarRentalApp()
-    app.mainloop()
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from datetime import date, datetime, timedelta
+from dotenv import load_dotenv
+import os
+
+import operations
+import fleet_import
+import pricing
+from db_executor import DBExecutor, LazyPool
+from paging import PagedTree
+from inventory_model import InventoryViewModel
+from reservations import ReservationIndex
+from replica import Replica
+from specs_cache import SpecsCache
+from instrumentation import METRICS
+from hashing import HASHER
+
+# ------------------ Load Environment Variables ------------------
+load_dotenv()
+DB_WORKERS = int(os.getenv("DB_WORKERS", "2"))
+SERVICE_URL = os.getenv("SERVICE_URL")
+
+# ------------------ Utility Functions ------------------
+def scrolled_tree(parent, columns):
+    frame = ttk.Frame(parent)
+    frame.pack(fill="both", expand=True, padx=10, pady=10)
+    tree = ttk.Treeview(frame, columns=columns, show='headings')
+    for col in tree['columns']:
+        tree.heading(col, text=col)
+    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+    scrollbar.pack(side="right", fill="y")
+    tree.pack(side="left", fill="both", expand=True)
+    return tree, scrollbar
+
+# Inventory grid headings and the operations.SORT_KEYS order each one sorts by
+INVENTORY_COLUMNS = {"Inventory ID": "id", "Car Name": "name", "Model": "model", "Year": "year",
+                     "License": "plate", "Price/Day": "price"}
+
+def search_bar(parent):
+    frame = ttk.Frame(parent)
+    frame.pack(fill="x", padx=10)
+    ttk.Label(frame, text="Search (name, model or plate):").pack(side="left", padx=5)
+    text = tk.StringVar()
+    ttk.Entry(frame, textvariable=text, width=30).pack(side="left", padx=5)
+    return text
+
+def make_searchable(pager, text):
+    # Every keystroke restarts the pager's debounce timer; headings sort on click
+    text.trace_add("write", lambda *_: pager.search_later(text.get()))
+    pager.sortable(INVENTORY_COLUMNS)
+
+def fill_tree(tree, rows):
+    # The window may have been closed while the query was running
+    if not tree.winfo_exists():
+        return
+    for row in rows:
+        tree.insert('', 'end', values=row)
+
+def create_db_pool():
+    # Imported here so mysql.connector loads on a DB worker thread, after the window is up
+    from db_pool import ConnectionPool
+    return ConnectionPool.from_env()
+
+def show_db_error(err):
+    if SERVICE_URL:
+        # A thin client never loads the MySQL driver; its database errors come from the service
+        from service_client import ServiceError
+        from_database = isinstance(err, ServiceError)
+    else:
+        import mysql.connector  # already loaded by the pool
+        from_database = isinstance(err, mysql.connector.Error)
+    messagebox.showerror("Database Error" if from_database else "Error", str(err))
+
+# ------------------ Main Application Class ------------------
+class CarRentalApp(tk.Tk):
+    def __init__(self):
+        super().__init__()
+        self.title("Car Rental System")
+        self.geometry("800x600")
+        
+        # Use ttk themed style for a modern look
+        self.style = ttk.Style(self)
+        self.style.theme_use("clam")
+        METRICS.configure_from_env()
+        HASHER.configure_from_env()
+        pricing.RATES.configure_from_env()
+        
+        # DB connection pool (created on first use), or the rental service as a thin client
+        if SERVICE_URL:
+            from service_client import ServiceClient, RemotePool, RemoteOperations
+            client = ServiceClient(SERVICE_URL)
+            self.pool = RemotePool(client)
+            self.ops = RemoteOperations(client)
+            self.importer = self.reservations = self.ops
+        else:
+            self.pool = LazyPool(create_db_pool)
+            self.ops = operations
+            self.importer = fleet_import
+            self.reservations = ReservationIndex()
+
+        # Browse and spec reads: a local read replica when REPLICA_PATH is set (not for thin clients)
+        self.replica = None if SERVICE_URL else Replica.from_env(self.pool)
+        self.browse = self.replica or self.ops
+        if self.replica:
+            self.reservations.fetch_page = self.replica.fetch_inventory_page
+            self.replica.start()
+
+        # Specs shared by both panels, prefetched for the rows on screen
+        self.specs_cache = SpecsCache()
+        # Rate table for quotes: this desk's RATES_FILE, or the service's for a thin client
+        self.rates = None
+
+        # All queries go through the background executor, never the Tk thread
+        self.db = DBExecutor(self, self.pool, workers=DB_WORKERS, on_error=show_db_error)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Status bar showing busy state with a cancel option
+        self.status_bar = StatusBar(self, self.db)
+        self.status_bar.pack(side="bottom", fill="x")
+
+        # Container frame to hold all pages
+        self.container = ttk.Frame(self)
+        self.container.pack(side="top", fill="both", expand=True)
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
+
+        # Frames for page switching, each built the first time it is shown
+        self.frame_classes = {F.__name__: F for F in (StartPage, LoginPage, SignupPage, AdminPanel, UserPanel)}
+        self.frames = {}
+
+        self.show_frame("StartPage")
+
+        # Connect (and start the password hashers) in the background, once the window is up
+        self.db.submit(self.connect, on_error=self.on_connect_failed, label="Connecting...")
+
+    def connect(self, conn):
+        self.ops.ping(conn)
+        if not SERVICE_URL:
+            # Thin clients leave bcrypt to the service, so they never start the hashers
+            HASHER.warm_up()
+        self.rates = self.ops.fetch_rates()
+        pricing.warm_up()
+
+    def on_connect_failed(self, err):
+        messagebox.showerror("Database Error", f"Failed to connect to DB:\n{err}")
+        self.on_close()
+
+    def get_frame(self, frame_name):
+        frame = self.frames.get(frame_name)
+        if frame is None:
+            frame = self.frame_classes[frame_name](parent=self.container, controller=self)
+            frame.grid(row=0, column=0, sticky="nsew")
+            self.frames[frame_name] = frame
+        return frame
+
+    def show_frame(self, frame_name):
+        with METRICS.timer("screen", f"show_frame:{frame_name}"):
+            frame = self.get_frame(frame_name)
+            frame.tkraise()
+
+    def written(self):
+        # This desk changed the inventory: browse from the primary until the replica has caught up
+        if self.replica:
+            self.replica.written()
+
+    def on_close(self):
+        self.db.shutdown()
+        if self.replica:
+            self.replica.close()
+        self.pool.close_all()
+        HASHER.shutdown()
+        METRICS.write()
+        self.destroy()
+
+# ------------------ Status Bar ------------------
+class StatusBar(ttk.Frame):
+    def __init__(self, parent, executor):
+        super().__init__(parent)
+        self.executor = executor
+        self.label = ttk.Label(self, text="Ready")
+        self.label.pack(side="left", padx=5, pady=2)
+        self.cancel_btn = ttk.Button(self, text="Cancel", command=executor.cancel_all)
+        self.progress = ttk.Progressbar(self, mode="indeterminate", length=120)
+        executor.busy_listeners.append(self.set_busy)
+
+    def set_busy(self, label):
+        if label:
+            self.label.config(text=label)
+            if not self.progress.winfo_ismapped():
+                self.cancel_btn.pack(side="right", padx=5, pady=2)
+                self.progress.pack(side="right", padx=5, pady=2)
+                self.progress.start(10)
+        else:
+            self.label.config(text="Ready")
+            self.progress.stop()
+            self.progress.pack_forget()
+            self.cancel_btn.pack_forget()
+
+# ------------------ Start (Welcome) Page ------------------
+class StartPage(ttk.Frame):
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        title = ttk.Label(self, text="Welcome to the Car Rental System", font=("Arial", 20))
+        title.pack(pady=20)
+        ttk.Button(self, text="Login", width=20,
+                   command=lambda: controller.show_frame("LoginPage")).pack(pady=10)
+        ttk.Button(self, text="Sign Up", width=20,
+                   command=lambda: controller.show_frame("SignupPage")).pack(pady=10)
+
+# ------------------ Login Page ------------------
+class LoginPage(ttk.Frame):
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        
+        title = ttk.Label(self, text="Login", font=("Arial", 20))
+        title.grid(row=0, column=0, columnspan=2, pady=20)
+        
+        ttk.Label(self, text="Username:").grid(row=1, column=0, sticky="e", padx=5, pady=5)
+        self.username_entry = ttk.Entry(self)
+        self.username_entry.grid(row=1, column=1, padx=5, pady=5)
+        
+        ttk.Label(self, text="Password:").grid(row=2, column=0, sticky="e", padx=5, pady=5)
+        self.password_entry = ttk.Entry(self, show="*")
+        self.password_entry.grid(row=2, column=1, padx=5, pady=5)
+        
+        ttk.Button(self, text="Login", command=self.login).grid(row=3, column=0, columnspan=2, pady=10)
+        ttk.Button(self, text="Back",
+                   command=lambda: controller.show_frame("StartPage")).grid(row=4, column=0, columnspan=2, pady=10)
+    
+    def login(self):
+        username = self.username_entry.get()
+        password = self.password_entry.get()
+        if len(username) < 3 or len(password) < 5:
+            messagebox.showwarning("Validation Error", "Username must be at least 3 characters and password at least 5 characters.")
+            return
+        self.controller.db.submit(lambda conn: self.controller.ops.authenticate(conn, username, password),
+                                  on_success=self.on_login, label="Logging in...")
+
+    def on_login(self, result):
+        status, userID, role = result
+        if status == "ok":
+            # Switch to admin or user panel
+            if role == 'admin':
+                self.controller.get_frame("AdminPanel").set_admin_details(userID)
+                self.controller.show_frame("AdminPanel")
+            else:
+                self.controller.get_frame("UserPanel").set_user_details(userID)
+                self.controller.show_frame("UserPanel")
+        elif status == "bad_password":
+            messagebox.showerror("Login Failed", "Incorrect password.")
+        else:
+            messagebox.showerror("Login Failed", "User does not exist. Please sign up first.")
+
+# ------------------ Sign Up Page ------------------
+class SignupPage(ttk.Frame):
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        
+        title = ttk.Label(self, text="Sign Up", font=("Arial", 20))
+        title.grid(row=0, column=0, columnspan=2, pady=20)
+        
+        ttk.Label(self, text="Username:").grid(row=1, column=0, sticky="e", padx=5, pady=5)
+        self.username_entry = ttk.Entry(self)
+        self.username_entry.grid(row=1, column=1, padx=5, pady=5)
+        
+        ttk.Label(self, text="Email:").grid(row=2, column=0, sticky="e", padx=5, pady=5)
+        self.email_entry = ttk.Entry(self)
+        self.email_entry.grid(row=2, column=1, padx=5, pady=5)
+        
+        ttk.Label(self, text="Password:").grid(row=3, column=0, sticky="e", padx=5, pady=5)
+        self.password_entry = ttk.Entry(self, show="*")
+        self.password_entry.grid(row=3, column=1, padx=5, pady=5)
+        
+        ttk.Button(self, text="Sign Up", command=self.signup).grid(row=4, column=0, columnspan=2, pady=10)
+        ttk.Button(self, text="Back",
+                   command=lambda: controller.show_frame("StartPage")).grid(row=5, column=0, columnspan=2, pady=10)
+    
+    def signup(self):
+        username = self.username_entry.get()
+        email = self.email_entry.get()
+        password = self.password_entry.get()
+        
+        if len(username) < 3 or len(password) < 5:
+            messagebox.showwarning("Validation Error", "Username must be at least 3 characters and password at least 5 characters.")
+            return
+
+        self.controller.db.submit(lambda conn: self.controller.ops.create_user(conn, username, email, password),
+                                  on_success=self.on_signup,
+                                  on_error=lambda err: messagebox.showerror("Error", str(err)),
+                                  label="Creating account...")
+
+    def on_signup(self, _):
+        messagebox.showinfo("Success", "Account created successfully. Please login.")
+        self.controller.show_frame("LoginPage")
+
+# ------------------ Admin Panel Page ------------------
+class AdminPanel(ttk.Frame):
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.admin_id = None
+        
+        title = ttk.Label(self, text="Admin Panel", font=("Arial", 20))
+        title.pack(pady=10)
+        
+        # Inventory Treeview, filled page by page as the user scrolls, searched and sorted by the database
+        search_text = search_bar(self)
+        self.tree, scrollbar = scrolled_tree(self, tuple(INVENTORY_COLUMNS))
+        self.inventory = InventoryViewModel(self.tree, scrollbar, controller.db, controller.ops.fetch_inventory_page,
+                                            fetch_version=controller.ops.fetch_inventory_version,
+                                            label="Loading inventory...", sort_key=operations.sort_key)
+        make_searchable(self.inventory, search_text)
+        
+        # Button frame for admin actions
+        btn_frame = ttk.Frame(self)
+        btn_frame.pack(pady=10)
+        ttk.Button(btn_frame, text="Add Car", command=self.add_car).grid(row=0, column=0, padx=5)
+        ttk.Button(btn_frame, text="Remove Car", command=self.remove_car).grid(row=0, column=1, padx=5)
+        ttk.Button(btn_frame, text="Edit Cost", command=self.edit_cost).grid(row=0, column=2, padx=5)
+        ttk.Button(btn_frame, text="Import Fleet", command=self.import_fleet).grid(row=0, column=3, padx=5)
+        ttk.Button(btn_frame, text="Refresh", command=self.load_inventory).grid(row=0, column=4, padx=5)
+        ttk.Button(btn_frame, text="Reports", command=self.view_reports).grid(row=0, column=5, padx=5)
+        ttk.Button(btn_frame, text="Logout",
+                   command=lambda: self.controller.show_frame("StartPage")).grid(row=0, column=6, padx=5)
+    
+    def set_admin_details(self, admin_id):
+        self.admin_id = admin_id
+        self.load_inventory()
+    
+    def load_inventory(self):
+        self.inventory.reload()
+    
+    def add_car(self):
+        add_win = tk.Toplevel(self)
+        add_win.title("Add Car")
+        labels = ["Name", "Model", "Year", "License Plate", "Price/Day", "Horsepower", "Seating", "Fuel Efficiency"]
+        entries = {}
+        for i, text in enumerate(labels):
+            ttk.Label(add_win, text=f"{text}:").grid(row=i, column=0, sticky="e", padx=5, pady=5)
+            entry = ttk.Entry(add_win)
+            entry.grid(row=i, column=1, padx=5, pady=5)
+            entries[text] = entry
+
+        def confirm_add():
+            try:
+                carName = entries["Name"].get()
+                model = entries["Model"].get()
+                year = int(entries["Year"].get())
+                plate = entries["License Plate"].get()
+                price = float(entries["Price/Day"].get())
+                hp = entries["Horsepower"].get()
+                seat = int(entries["Seating"].get())
+                fuel = entries["Fuel Efficiency"].get()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+                return
+
+            def on_added(result):
+                self.controller.written()
+                self.inventory.apply_insert(*result)
+                self.controller.specs_cache.invalidate(result[1][0])
+                messagebox.showinfo("Success", "Car added successfully.")
+                add_win.destroy()
+
+            self.controller.db.submit(
+                lambda conn: self.controller.ops.add_car(conn, carName, model, year, plate, price, hp, seat, fuel),
+                on_success=on_added, label="Adding car...")
+
+        ttk.Button(add_win, text="Add", command=confirm_add).grid(row=len(labels), column=0, columnspan=2, pady=10)
+    
+    def import_fleet(self):
+        path = filedialog.askopenfilename(
+            title="Import Fleet",
+            filetypes=[("Fleet files", "*.csv *.json *.jsonl"), ("All files", "*.*")])
+        if not path:
+            return
+
+        def on_imported(report):
+            self.controller.written()
+            messagebox.showinfo("Import Fleet", report.summary())
+            self.load_inventory()
+
+        self.controller.db.submit(lambda conn: self.controller.importer.import_file(conn, path),
+                                  on_success=on_imported, label="Importing fleet...")
+
+    def remove_car(self):
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showwarning("No Selection", "Select a car to remove.")
+            return
+        inventoryID = self.tree.item(selected[0])['values'][0]
+
+        def on_removed(version):
+            self.controller.written()
+            self.inventory.apply_delete(version, inventoryID)
+            self.controller.specs_cache.invalidate(inventoryID)
+            messagebox.showinfo("Removed", "Car removed from inventory.")
+
+        self.controller.db.submit(lambda conn: self.controller.ops.remove_car(conn, inventoryID),
+                                  on_success=on_removed, label="Removing car...")
+    
+    def edit_cost(self):
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showwarning("No Selection", "Select a car to edit.")
+            return
+        inventoryID = self.tree.item(selected[0])['values'][0]
+        current_cost = self.tree.item(selected[0])['values'][5]
+        cost_win = tk.Toplevel(self)
+        cost_win.title("Edit Cost")
+        ttk.Label(cost_win, text="New Price Per Day:").grid(row=0, column=0, padx=5, pady=5)
+        cost_entry = ttk.Entry(cost_win)
+        cost_entry.insert(0, str(current_cost))
+        cost_entry.grid(row=0, column=1, padx=5, pady=5)
+
+        def confirm_edit():
+            try:
+                new_cost = float(cost_entry.get())
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+                return
+
+            def on_updated(result):
+                self.controller.written()
+                self.inventory.apply_update(*result)
+                messagebox.showinfo("Updated", "Rental cost updated.")
+                cost_win.destroy()
+
+            self.controller.db.submit(lambda conn: self.controller.ops.update_price(conn, inventoryID, new_cost),
+                                      on_success=on_updated, label="Updating cost...")
+                
+        ttk.Button(cost_win, text="Update", command=confirm_edit).grid(row=1, column=0, columnspan=2, pady=10)
+
+    def view_reports(self):
+        # Reads only the revenue aggregates (see reporting.py), so it stays fast however long the history
+        report_win = tk.Toplevel(self)
+        report_win.title("Revenue and Utilization")
+        report_win.geometry("760x640")
+        ttk.Label(report_win, text="Last 12 months (select a month to see its top cars)").pack(pady=(10, 0))
+        months, _ = scrolled_tree(report_win, ("Month", "Rentals", "Rental Revenue", "Insurance Revenue",
+                                               "Booked Days", "Utilization"))
+        ttk.Label(report_win, text="By insurance type, last 12 months").pack()
+        insurance, _ = scrolled_tree(report_win, ("Insurance", "Rentals", "Rental Revenue", "Insurance Revenue"))
+        ttk.Label(report_win, text="Top cars").pack()
+        cars, _ = scrolled_tree(report_win, ("Inventory ID", "Car Name", "Model", "License", "Rentals", "Revenue",
+                                             "Booked Days"))
+
+        def on_loaded(report):
+            monthly, by_insurance = report
+            fill_tree(months, [(str(month)[:7], rentals, f"{rental:,.2f}", f"{cover:,.2f}", days, f"{used:.1%}")
+                               for month, rentals, rental, cover, days, used in monthly])
+            fill_tree(insurance, [(kind, rentals, f"{rental:,.2f}", f"{cover:,.2f}")
+                                  for kind, rentals, rental, cover in by_insurance])
+
+        def on_month_selected(event):
+            selected = months.selection()
+            if not selected:
+                return
+            month = datetime.strptime(months.item(selected[0])['values'][0], "%Y-%m").date()
+
+            def on_cars(rows):
+                if cars.winfo_exists():
+                    cars.delete(*cars.get_children())
+                    fill_tree(cars, [(*row[:5], f"{row[5]:,.2f}", row[6]) for row in rows])
+
+            self.controller.db.submit(lambda conn: self.controller.ops.fetch_top_cars(conn, month),
+                                      on_success=on_cars, label="Loading top cars...")
+
+        months.bind("<<TreeviewSelect>>", on_month_selected)
+        self.controller.db.submit(lambda conn: self.controller.ops.fetch_revenue_report(conn),
+                                  on_success=on_loaded, label="Loading reports...")
+
+# ------------------ User Panel Page ------------------
+class UserPanel(ttk.Frame):
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.user_id = None
+        self.reservations = controller.reservations
+        self.window = None
+        
+        title = ttk.Label(self, text="User Panel", font=("Arial", 20))
+        title.pack(pady=10)
+
+        # Optional date range: show cars with no booking in that period
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(pady=5)
+        ttk.Label(filter_frame, text="Free From (YYYY-MM-DD):").grid(row=0, column=0, padx=5)
+        self.from_entry = ttk.Entry(filter_frame, width=12)
+        self.from_entry.grid(row=0, column=1, padx=5)
+        ttk.Label(filter_frame, text="To:").grid(row=0, column=2, padx=5)
+        self.to_entry = ttk.Entry(filter_frame, width=12)
+        self.to_entry.grid(row=0, column=3, padx=5)
+        ttk.Button(filter_frame, text="Filter", command=self.apply_date_filter).grid(row=0, column=4, padx=5)
+        ttk.Button(filter_frame, text="Clear", command=self.clear_date_filter).grid(row=0, column=5, padx=5)
+        # Insurance tier the Quote column prices with
+        ttk.Label(filter_frame, text="Quote With:").grid(row=0, column=6, padx=5)
+        self.tier = tk.StringVar(value="basic")
+        self.tier_box = ttk.Combobox(filter_frame, textvariable=self.tier, width=10, state="readonly")
+        self.tier_box.grid(row=0, column=7, padx=5)
+        self.tier_box.bind("<<ComboboxSelected>>", self.requote)
+        
+        # Available cars Treeview, filled page by page as the user scrolls, searched and sorted by the database;
+        # the Quote column is priced locally for the filter's period (or one day from today)
+        search_text = search_bar(self)
+        self.tree, scrollbar = scrolled_tree(self, tuple(INVENTORY_COLUMNS) + ("Quote",))
+        self.pager = PagedTree(self.tree, scrollbar, controller.db, self.reservations.fetch_available_page,
+                               label="Loading available cars...", sort_key=operations.sort_key)
+        make_searchable(self.pager, search_text)
+        self.pager.page_listeners.append(self.prefetch_specs)
+        self.pager.page_listeners.append(self.quote_rows)
+        
+        btn_frame = ttk.Frame(self)
+        btn_frame.pack(pady=10)
+        ttk.Button(btn_frame, text="View Car Specs", command=self.view_specs).grid(row=0, column=0, padx=5)
+        ttk.Button(btn_frame, text="Rent Car", command=self.rent_car).grid(row=0, column=1, padx=5)
+        ttk.Button(btn_frame, text="Return Car", command=self.return_car).grid(row=0, column=2, padx=5)
+        ttk.Button(btn_frame, text="Transaction Log", command=self.view_transactions).grid(row=0, column=3, padx=5)
+        ttk.Button(btn_frame, text="Refresh", command=self.load_available).grid(row=0, column=4, padx=5)
+        ttk.Button(btn_frame, text="Logout",
+                   command=lambda: self.controller.show_frame("StartPage")).grid(row=0, column=5, padx=5)
+    
+    def set_user_details(self, user_id):
+        self.user_id = user_id
+        if self.controller.rates:
+            self.tier_box["values"] = list(self.controller.rates.insurance)
+        self.load_available()
+    
+    def load_available(self):
+        if self.window:
+            start, end = self.window
+            self.pager.fetch_page = lambda conn, after, before, limit, **query: \
+                self.reservations.fetch_free_page(conn, start, end, after, before, limit, **query)
+        else:
+            self.pager.fetch_page = self.reservations.fetch_available_page
+        self.pager.reload()
+
+    def apply_date_filter(self):
+        try:
+            start = datetime.strptime(self.from_entry.get(), "%Y-%m-%d").date()
+            end = datetime.strptime(self.to_entry.get(), "%Y-%m-%d").date()
+        except ValueError:
+            messagebox.showerror("Invalid Date", "Dates must be in YYYY-MM-DD format.")
+            return
+        if end <= start:
+            messagebox.showerror("Invalid Date", "End date must be after start date.")
+            return
+        self.window = (start, end)
+        self.load_available()
+
+    def clear_date_filter(self):
+        self.from_entry.delete(0, 'end')
+        self.to_entry.delete(0, 'end')
+        self.window = None
+        self.load_available()
+    
+    def view_specs(self):
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showwarning("Select a Car", "Please select a car first.")
+            return
+        inventoryID = self.tree.item(selected[0])['values'][0]
+        hit, specs = self.controller.specs_cache.lookup(inventoryID)
+        if hit:
+            self.show_specs(specs)
+            return
+
+        def on_loaded(specs):
+            self.controller.specs_cache.put(inventoryID, specs)
+            self.show_specs(specs)
+
+        self.controller.db.submit(lambda conn: self.controller.browse.fetch_specs(conn, inventoryID),
+                                  on_success=on_loaded, label="Loading specs...")
+
+    def prefetch_specs(self, rows):
+        self.controller.specs_cache.prefetch(self.controller.db, self.controller.browse.fetch_specs_batch,
+                                             [row[0] for row in rows])
+
+    def quote_window(self):
+        if self.window:
+            return self.window
+        today = date.today()
+        return today, today + timedelta(days=1)
+
+    def quote_rows(self, rows):
+        rates, tier = self.controller.rates, self.tier.get()
+        if not rows or rates is None or tier not in rates.insurance:
+            return
+        totals = pricing.quote_batch(rates, [row[5] for row in rows], [self.quote_window()], [tier]).total(tier)
+        for row, cents in zip(rows, totals[:, 0]):
+            self.tree.set(row[0], "Quote", f"{cents / 100:.2f}")
+
+    def requote(self, event=None):
+        self.quote_rows([self.tree.item(iid)['values'] for iid in self.tree.get_children()])
+
+    def show_specs(self, result):
+        if result:
+            horsepower, seating, fuel = result
+            messagebox.showinfo("Car Specs", f"Horsepower: {horsepower}\nSeating Capacity: {seating}\nFuel Efficiency: {fuel}")
+        else:
+            messagebox.showinfo("Car Specs", "No specs found for this car.")
+    
+    def rent_car(self):
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showwarning("Select a Car", "Please select a car to rent.")
+            return
+        inventoryID, pricePerDay = (self.tree.item(selected[0])['values'][i] for i in (0, 5))
+        
+        rent_win = tk.Toplevel(self)
+        rent_win.title("Rent Car")
+        ttk.Label(rent_win, text="Start Date (YYYY-MM-DD):").grid(row=0, column=0, padx=5, pady=5)
+        ttk.Label(rent_win, text="End Date (YYYY-MM-DD):").grid(row=1, column=0, padx=5, pady=5)
+        tiers = list((self.controller.rates or pricing.RATES).insurance)
+        ttk.Label(rent_win, text=f"Insurance Type ({', '.join(tiers)}):").grid(row=2, column=0, padx=5, pady=5)
+        start_entry = ttk.Entry(rent_win)
+        end_entry = ttk.Entry(rent_win)
+        insurance_entry = ttk.Entry(rent_win)
+        start_entry.grid(row=0, column=1, padx=5, pady=5)
+        end_entry.grid(row=1, column=1, padx=5, pady=5)
+        insurance_entry.grid(row=2, column=1, padx=5, pady=5)
+        insurance_entry.insert(0, self.tier.get())
+        if self.window:
+            start_entry.insert(0, self.window[0].isoformat())
+            end_entry.insert(0, self.window[1].isoformat())
+
+        def confirm_rent():
+            try:
+                rentDate = datetime.strptime(start_entry.get(), "%Y-%m-%d").date()
+                returnDate = datetime.strptime(end_entry.get(), "%Y-%m-%d").date()
+                insuranceType = insurance_entry.get().lower()
+                if insuranceType not in tiers:
+                    messagebox.showerror("Invalid Insurance", f"Choose: {', '.join(tiers)}")
+                    return
+                days = (returnDate - rentDate).days
+                if days <= 0:
+                    messagebox.showerror("Invalid Date", "Return date must be after rent date.")
+                    return
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+                return
+
+            def on_rented(_):
+                self.controller.written()
+                messagebox.showinfo("Success", "Car rented successfully!")
+                rent_win.destroy()
+                self.load_available()
+
+            def on_failed(err):
+                if isinstance(err, operations.BookingConflict):
+                    messagebox.showerror("Not Available", str(err))
+                else:
+                    show_db_error(err)
+
+            user_id = self.user_id
+            self.controller.db.submit(
+                lambda conn: self.controller.ops.rent_car(conn, user_id, inventoryID, rentDate, returnDate, insuranceType,
+                                                          pricePerDay),
+                on_success=on_rented, on_error=on_failed, label="Renting car...")
+        
+        ttk.Button(rent_win, text="Confirm", command=confirm_rent).grid(row=3, column=0, columnspan=2, pady=10)
+    
+    def return_car(self):
+        return_win = tk.Toplevel(self)
+        return_win.title("Return Car")
+        tree = ttk.Treeview(return_win, columns=("Rental ID", "Car", "Model", "Year", "Total Cost"), show='headings')
+        for col in tree['columns']:
+            tree.heading(col, text=col)
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        user_id = self.user_id
+        self.controller.db.submit(lambda conn: self.controller.ops.fetch_active_rentals(conn, user_id),
+                                  on_success=lambda rows: fill_tree(tree, rows), label="Loading rentals...")
+        
+        def confirm_return():
+            selected = tree.selection()
+            if not selected:
+                messagebox.showwarning("Select Rental", "Please select a rental to return.")
+                return
+            rentalID = tree.item(selected[0])['values'][0]
+
+            def on_returned(_):
+                self.controller.written()
+                messagebox.showinfo("Returned", "Car returned and transaction logged.")
+                return_win.destroy()
+
+            self.controller.db.submit(lambda conn: self.controller.ops.return_car(conn, rentalID, user_id),
+                                      on_success=on_returned,
+                                      on_error=lambda err: messagebox.showerror("Error", str(err)),
+                                      label="Returning car...")
+        
+        ttk.Button(return_win, text="Confirm Return", command=confirm_return).pack(pady=10)
+    
+    def view_transactions(self):
+        trans_win = tk.Toplevel(self)
+        trans_win.title("Transaction Log")
+        tree = ttk.Treeview(trans_win, columns=("Transaction ID", "Date", "Car", "Model", "Year", "Total Paid"), show='headings')
+        for col in tree['columns']:
+            tree.heading(col, text=col)
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        user_id = self.user_id
+        # Rows appear chunk by chunk as they are read, recent and archived alike
+        self.controller.db.stream(lambda conn: self.controller.ops.iter_transactions(conn, user_id),
+                                  on_chunk=lambda rows: fill_tree(tree, rows), label="Loading transactions...")
+
+# ------------------ Run the Application ------------------
+if __name__ == "__main__":
+    app = CarRentalApp()
+    app.mainloop()
@@ -0,0 +1,100 @@
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+# ------------------ Rental Archival ------------------
+# rentedCars and transactions only grow, and every open-booking check, return
+# and Transaction Log reads them. This job moves rentals closed more than
+# ARCHIVE_AFTER_DAYS ago, with their transactions, into rentedCarsArchive and
+# transactionsArchive (migrations/007), oldest first, ARCHIVE_BATCH_SIZE at a
+# time. Each batch is one transaction: copy both, then delete both, so a
+# rental is always in exactly one place. Only closed rentals move, and nothing
+# changes a closed rental, so the job can run alongside the desks (e.g. nightly
+# from cron); the Transaction Log and the aggregate check read both places.
+
+DEFAULT_AFTER_DAYS = 365
+DEFAULT_BATCH_SIZE = 1000
+
+# Oldest closed rentals first; the row locks keep two runs from moving the same ones
+OLD_TRANSACTIONS_QUERY = """
+    SELECT rentalID FROM transactions WHERE transactionDate < %s
+    ORDER BY transactionDate, transactionID LIMIT %s FOR UPDATE
+"""
+
+COPY_RENTALS_QUERY = """
+    INSERT INTO rentedCarsArchive
+        (rentalID, renterID, inventoryID, rentDate, returnDate, insuranceType, insuranceCost, rentalCost)
+    SELECT rentalID, renterID, inventoryID, rentDate, returnDate, insuranceType, insuranceCost, rentalCost
+    FROM rentedCars WHERE rentalID IN ({marks})
+"""
+
+COPY_TRANSACTIONS_QUERY = """
+    INSERT INTO transactionsArchive (transactionID, rentalID, transactionDate)
+    SELECT transactionID, rentalID, transactionDate FROM transactions WHERE rentalID IN ({marks})
+"""
+
+
+def archive_batch(conn, cutoff, batch_size=DEFAULT_BATCH_SIZE):
+    """Move up to batch_size rentals closed before cutoff to the archive; returns how many moved."""
+    cur = conn.cursor()
+    try:
+        cur.execute(OLD_TRANSACTIONS_QUERY, (cutoff, batch_size))
+        ids = [row[0] for row in cur.fetchall()]
+        if not ids:
+            conn.rollback()
+            return 0
+        marks = ", ".join(["%s"] * len(ids))
+        cur.execute(COPY_RENTALS_QUERY.format(marks=marks), ids)
+        cur.execute(COPY_TRANSACTIONS_QUERY.format(marks=marks), ids)
+        # Transactions reference their rental, so they go first
+        cur.execute(f"DELETE FROM transactions WHERE rentalID IN ({marks})", ids)
+        cur.execute(f"DELETE FROM rentedCars WHERE rentalID IN ({marks})", ids)
+        conn.commit()
+        return len(ids)
+    finally:
+        cur.close()
+
+
+def archive(pool, after_days=DEFAULT_AFTER_DAYS, batch_size=DEFAULT_BATCH_SIZE, log=print):
+    """Archive every rental closed more than after_days ago, one batch per pooled transaction."""
+    cutoff = datetime.now() - timedelta(days=after_days)
+    moved, start = 0, time.perf_counter()
+    while True:
+        count = pool.run(lambda conn: archive_batch(conn, cutoff, batch_size))
+        if not count:
+            break
+        moved += count
+        log(f"Archived {moved} rentals closed before {cutoff:%Y-%m-%d}")
+    log(f"Archived {moved} rentals in {time.perf_counter() - start:.1f}s")
+    return moved
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Move old closed rentals and their transactions to the archive tables")
+    parser.add_argument("--after-days", type=int, default=int(os.getenv("ARCHIVE_AFTER_DAYS", DEFAULT_AFTER_DAYS)),
+                        help="archive rentals closed more than this many days ago")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("ARCHIVE_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+                        help="rentals moved per transaction")
+    parser.add_argument("--sqlite", metavar="PATH", help="use an embedded SQLite database instead of MySQL")
+    args = parser.parse_args()
+    # Desks' booking indexes (reservations.py) must see a rental close before it moves
+    if args.after_days < 1:
+        parser.error("--after-days must be at least 1")
+
+    if args.sqlite:
+        from sqlite_backend import SQLitePool
+        pool = SQLitePool(args.sqlite)
+    else:
+        from db_pool import ConnectionPool
+        pool = ConnectionPool.from_env()
+    try:
+        archive(pool, args.after_days, args.batch_size)
+    finally:
+        pool.close_all()
+
+if __name__ == "__main__":
+    main()
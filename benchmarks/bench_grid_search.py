@@ -0,0 +1,116 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import operations
+import seed
+from reservations import ReservationIndex
+
+# ------------------ Grid Search and Sort Benchmark ------------------
+# Latency of the inventory grids' server-side queries on a large fleet
+# (100k cars by default): the first page and a page either side of a random
+# row, for every sort order in both directions, and prefix searches typed as
+# a user would (make, model, plate) combined with each sort. Covers the admin
+# grid, the isAvailable-flag page, and the User panel's own path: the
+# reservation index's free-today and date-filtered pages. Exits 1 if any
+# query's p95 exceeds --target ms. Targets the MySQL server from .env, or an
+# embedded SQLite database with --sqlite PATH (seeded on first use).
+
+SEARCHES = ["To", "Toyota", "Civ", "Model 3", "S-00004", "S-0000123", "zzz"]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def timed(pool, work, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pool.run(work)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def grids():
+    """(name, fetch(conn, **paging)) for every grid the app pages through."""
+    index = ReservationIndex()
+    start = date.today() + timedelta(days=7)
+    return [
+        ("inventory", operations.fetch_inventory_page),
+        ("available", operations.fetch_available_page),
+        ("free today", index.fetch_available_page),
+        ("free 3 days", lambda conn, **q: index.fetch_free_page(conn, start, start + timedelta(days=3), **q)),
+    ]
+
+
+def scenarios(pool, rng, grid, fetch):
+    sample = pool.run(lambda conn: operations.fetch_all(
+        conn, operations.INVENTORY_QUERY + " ORDER BY ci.inventoryID LIMIT 1000"))
+    for sort in operations.SORT_KEYS:
+        for descending in (False, True):
+            order = f"{sort} {'desc' if descending else 'asc'}"
+            query = {"sort": sort, "descending": descending}
+            yield f"{grid} {order} first", lambda conn, q=query: fetch(conn, **q)
+            # A cursor in the middle of the order, as after scrolling down a few pages
+            key = operations.sort_key(rng.choice(sample), sort)
+            yield f"{grid} {order} next", lambda conn, q=query, k=key: fetch(conn, after=k, **q)
+            yield f"{grid} {order} previous", lambda conn, q=query, k=key: fetch(conn, before=k, **q)
+    for search in SEARCHES:
+        for sort in ("id", "name", "price"):
+            query = {"search": search, "sort": sort}
+            yield f"{grid} search {search!r} by {sort}", lambda conn, q=query: fetch(conn, **q)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server-side search and sort latency on a large fleet")
+    parser.add_argument("--cars", type=int, default=100000, help="fleet size to seed an empty database with")
+    parser.add_argument("--rentals", type=int, default=50000, help="rentals to seed an empty database with")
+    parser.add_argument("-n", "--repeat", type=int, default=20, help="runs per query")
+    parser.add_argument("--target", type=float, default=100, help="p95 limit in ms")
+    parser.add_argument("--sqlite", metavar="PATH", help="use an embedded SQLite database instead of MySQL")
+    parser.add_argument("--random-seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from sqlite_backend import SQLitePool
+        pool = SQLitePool(args.sqlite)
+    else:
+        from dotenv import load_dotenv
+        from db_pool import ConnectionPool
+        load_dotenv()
+        pool = ConnectionPool.from_env()
+
+    cars = pool.run(lambda conn: operations.fetch_one(conn, "SELECT COUNT(*) FROM carInventory")[0])
+    if cars == 0:
+        pool.run(lambda conn: seed.seed(conn, 100, args.cars, args.rentals, args.random_seed))
+        cars = args.cars
+    print(f"{cars} cars, {args.repeat} runs per query, target p95 < {args.target:.0f} ms")
+
+    rng = random.Random(args.random_seed)
+    slow = []
+    print(f"{'query':<44}{'rows':>6}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+    for grid, fetch in grids():
+        for name, work in scenarios(pool, rng, grid, fetch):
+            rows = len(pool.run(work))
+            times = timed(pool, work, args.repeat)
+            p95 = percentile(times, 95)
+            print(f"{name:<44}{rows:>6}{statistics.median(times):>9.1f}{p95:>9.1f}{max(times):>9.1f}")
+            if p95 > args.target:
+                slow.append(name)
+    pool.close_all()
+
+    if slow:
+        print(f"{len(slow)} queries over {args.target:.0f} ms at p95: {', '.join(slow)}")
+        sys.exit(1)
+    print("All queries within target")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import operations
+from instrumentation import METRICS
+from sqlite_backend import SQLitePool
+
+# ------------------ Instrumentation Overhead Benchmark ------------------
+# Runs a cheap indexed lookup (view specs) on an embedded SQLite database with
+# instrumentation off and on, to show what the wrapper costs per statement.
+
+def run(pool, n):
+    start = time.perf_counter()
+    for i in range(n):
+        pool.run(lambda conn: operations.fetch_specs(conn, i % 100 + 1))
+    return (time.perf_counter() - start) / n * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-statement overhead of query instrumentation")
+    parser.add_argument("-n", "--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    pool = SQLitePool()
+    pool.run(lambda conn: [operations.add_car(conn, "Car", "Model", 2024, f"B-{i}", 50, "200", 5, "30")
+                           for i in range(100)])
+    run(pool, 1000)  # warm up
+
+    METRICS.enabled = False
+    off = run(pool, args.iterations)
+    METRICS.enabled = True
+    METRICS.slow_query_ms = float("inf")
+    on = run(pool, args.iterations)
+    METRICS.enabled = False
+    pool.close_all()
+
+    print(f"disabled: {off:8.2f} us/op")
+    print(f"enabled:  {on:8.2f} us/op  (+{on - off:.2f} us per statement)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import operations
+from db_executor import DBExecutor
+from inventory_model import InventoryViewModel
+
+# ------------------ Mutation-to-Screen Latency Benchmark ------------------
+# Times an "Edit Cost" from the moment it is submitted to the DBExecutor until
+# the Treeview shows the new price, through the admin grid's real
+# InventoryViewModel, for four strategies:
+#   full   - re-query the whole inventory and rebuild the grid (original behaviour)
+#   page   - reload the grid's first page (what the view model falls back to)
+#   diff   - apply the changed row returned by the mutation (apply_update)
+#   stale  - as diff, after another desk's edit, so the version check forces a reload
+# The executor's after() loop runs on a stub root that the benchmark pumps
+# directly, so timings include the worker hand-off but not the poll interval.
+# Needs a display for Tk, and the DB_* settings from .env or --sqlite PATH.
+
+COLUMNS = ("Inventory ID", "Car Name", "Model", "Year", "License", "Price/Day")
+
+
+class StubRoot:
+    """Stands in for Tk's after() scheduling: pump() runs whatever is due right away."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+        return len(self.callbacks)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def pump(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def wait(executor, root):
+    # Pump the result loop until every job, including a reload a callback queued, has reached the screen
+    while executor.busy:
+        root.pump()
+        time.sleep(0.0001)
+
+
+def rebuild(tree, rows):
+    tree.delete(*tree.get_children())
+    for row in rows:
+        tree.insert('', 'end', iid=row[0], values=row)
+
+def main():
+    parser = argparse.ArgumentParser(description="Mutation-to-screen latency of full reload vs row diffs")
+    parser.add_argument("-n", "--iterations", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=int(os.getenv("GRID_PAGE_SIZE", "200")))
+    parser.add_argument("--sqlite", metavar="PATH", help="use an embedded SQLite database instead of MySQL")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from sqlite_backend import SQLitePool
+        pool = SQLitePool(args.sqlite)
+    else:
+        from dotenv import load_dotenv
+        from db_pool import ConnectionPool
+        load_dotenv()
+        pool = ConnectionPool.from_env()
+    root = tk.Tk()
+    root.withdraw()
+    tree = ttk.Treeview(root, columns=COLUMNS, show='headings')
+    scrollbar = ttk.Scrollbar(root, orient="vertical", command=tree.yview)
+    stub = StubRoot()
+    executor = DBExecutor(stub, pool, workers=1, on_error=lambda err: sys.exit(f"Database error: {err}"))
+    model = InventoryViewModel(tree, scrollbar, executor, operations.fetch_inventory_page,
+                               page_size=args.page_size, sort_key=operations.sort_key)
+
+    first_page = pool.run(lambda conn: operations.fetch_inventory_page(conn, limit=args.page_size))
+    if len(first_page) < 2:
+        sys.exit("carInventory needs at least two cars; seed some first")
+    inventoryID, original_price = first_page[0][0], first_page[0][5]
+    # Edited by "another desk" before each stale run
+    otherID, other_price = first_page[-1][0], first_page[-1][5]
+
+    def full(price):
+        def work(conn):
+            operations.update_price(conn, inventoryID, price)
+            return operations.fetch_all(conn, operations.INVENTORY_QUERY)
+        executor.submit(work, on_success=lambda rows: rebuild(tree, rows))
+
+    def page(price):
+        executor.submit(lambda conn: operations.update_price(conn, inventoryID, price),
+                        on_success=lambda result: model.reload())
+
+    def diff(price):
+        executor.submit(lambda conn: operations.update_price(conn, inventoryID, price),
+                        on_success=lambda result: model.apply_update(*result))
+
+    def other_desk(i):
+        pool.run(lambda conn: operations.update_price(conn, otherID, float(other_price) + 1 + i % 2))
+
+    print(f"{'mode':<8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    try:
+        for name, strategy, before in (("full", full, None), ("page", page, None),
+                                       ("diff", diff, None), ("stale", diff, other_desk)):
+            model.reload()
+            wait(executor, stub)
+            timings = []
+            for i in range(args.iterations):
+                if before:
+                    before(i)
+                start = time.perf_counter()
+                strategy(float(original_price) + 1 + i % 2)
+                wait(executor, stub)
+                root.update_idletasks()
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{name:<8}{statistics.mean(timings):>10.2f}{statistics.median(timings):>10.2f}{p95:>10.2f}")
+    finally:
+        executor.shutdown()
+        pool.run(lambda conn: operations.update_price(conn, inventoryID, original_price))
+        pool.run(lambda conn: operations.update_price(conn, otherID, other_price))
+        pool.close_all()
+        root.destroy()
+
+if __name__ == "__main__":
+    main()
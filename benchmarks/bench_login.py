@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hashing import PasswordHasher, hash_password
+
+# ------------------ Login Throughput Benchmark ------------------
+# Password checks per second (the bcrypt part of a login) for a range of work
+# factors and hasher process counts, with enough concurrent callers to keep
+# every worker process busy. workers=0 is the old behaviour: bcrypt in the
+# calling thread. Use it to pick BCRYPT_ROUNDS and HASH_WORKERS for a machine.
+
+def logins_per_second(hasher, hashed, n, callers):
+    hasher.verify("password", hashed)  # start the worker processes outside the timing
+    with ThreadPoolExecutor(callers) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(lambda _: hasher.verify("password", hashed), range(n)))
+        elapsed = time.perf_counter() - start
+    assert all(ok for ok, _ in results)
+    return n / elapsed
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="bcrypt logins per second by work factor and process count")
+    parser.add_argument("-n", "--logins", type=int, default=40, help="password checks per measurement")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 12])
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({0, 1, max(1, cores // 2), cores}))
+    args = parser.parse_args()
+
+    print(f"{cores} CPU cores")
+    print(f"{'rounds':>8}{'workers':>10}{'logins/s':>12}{'ms/login':>12}")
+    for rounds in args.rounds:
+        hashed = hash_password("password", rounds)
+        for workers in args.workers:
+            hasher = PasswordHasher(rounds, workers)
+            try:
+                rate = logins_per_second(hasher, hashed, args.logins, max(1, workers) * 2)
+            finally:
+                hasher.shutdown()
+            print(f"{rounds:>8}{workers:>10}{rate:>12.1f}{1000 / rate:>12.1f}")
+
+if __name__ == "__main__":
+    main()
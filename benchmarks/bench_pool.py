@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector
+from dotenv import load_dotenv
+
+import operations
+from db_pool import ConnectionPool
+
+# ------------------ Connection Pool Benchmark ------------------
+# Compares the cost of one operation when every call opens its own
+# connection against borrowing a connection from ConnectionPool.
+# Uses the same DB_* settings as the app (.env).
+
+def run_unpooled(pool, work, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        conn = mysql.connector.connect(**pool.config)
+        try:
+            work(conn)
+        finally:
+            conn.close()
+    return time.perf_counter() - start
+
+def run_pooled(pool, work, n):
+    pool.run(work)  # warm up one connection
+    start = time.perf_counter()
+    for _ in range(n):
+        pool.run(work)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-operation cost with and without the connection pool")
+    parser.add_argument("-n", "--iterations", type=int, default=500)
+    parser.add_argument("--query", choices=["ping", "available"], default="ping")
+    args = parser.parse_args()
+
+    load_dotenv()
+    pool = ConnectionPool.from_env()
+    if args.query == "ping":
+        work = lambda conn: operations.fetch_one(conn, "SELECT 1")
+    else:
+        work = operations.fetch_available_page
+
+    unpooled = run_unpooled(pool, work, args.iterations)
+    pooled = run_pooled(pool, work, args.iterations)
+    pool.close_all()
+
+    print(f"{'mode':<10}{'total s':>10}{'ms/op':>10}{'ops/s':>10}")
+    for name, total in (("unpooled", unpooled), ("pooled", pooled)):
+        print(f"{name:<10}{total:>10.3f}{total / args.iterations * 1000:>10.3f}{args.iterations / total:>10.0f}")
+    print(f"speedup: {unpooled / pooled:.1f}x")
+
+if __name__ == "__main__":
+    main()
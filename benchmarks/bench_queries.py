@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import operations
+import seed
+
+# ------------------ End-to-End Query Benchmark ------------------
+# Runs the same operations the GUI runs for each screen action (login, the
+# admin and user grids, specs, rent, return and the transaction log) headless,
+# with no Tk, and reports p50/p95/p99 latency and throughput per action.
+# Targets the MySQL server from .env, or an embedded SQLite stand-in with
+# --sqlite PATH (seeded on first use). Save results with --save and compare a
+# later run with --compare to catch regressions between releases.
+
+PERCENTILES = (50, 95, 99)
+
+
+class Context:
+    def __init__(self, conn, rng):
+        self.rng = rng
+        self.user_min, self.user_max = operations.fetch_one(conn, "SELECT MIN(userID), MAX(userID) FROM users")
+        self.inv_min, self.inv_max = operations.fetch_one(
+            conn, "SELECT MIN(inventoryID), MAX(inventoryID) FROM carInventory")
+        self.open_rentals = []
+        # Book far in the future so benchmark rentals rarely collide with seeded history
+        self.next_start = date.today() + timedelta(days=3650)
+
+    def user(self):
+        return self.rng.randint(self.user_min, self.user_max)
+
+    def car(self):
+        return self.rng.randint(self.inv_min, self.inv_max)
+
+    def user_name(self, conn):
+        return operations.fetch_one(conn, "SELECT userName FROM users WHERE userID >= %s LIMIT 1", (self.user(),))[0]
+
+
+def bench_login(conn, ctx):
+    operations.authenticate(conn, ctx.user_name(conn), "password")
+
+def bench_load_inventory(conn, ctx):
+    operations.fetch_inventory_page(conn, after=ctx.car())
+
+def bench_load_available(conn, ctx):
+    operations.fetch_available_page(conn, after=ctx.car())
+
+def bench_view_specs(conn, ctx):
+    operations.fetch_specs(conn, ctx.car())
+
+def bench_confirm_rent(conn, ctx):
+    start = ctx.next_start + timedelta(days=ctx.rng.randint(0, 3650))
+    try:
+        rentalID = operations.rent_car(conn, ctx.user(), ctx.car(), start, start + timedelta(days=3), "basic")
+        ctx.open_rentals.append(rentalID)
+    except operations.BookingConflict:
+        pass
+
+def bench_confirm_return(conn, ctx):
+    if ctx.open_rentals:
+        operations.return_car(conn, ctx.open_rentals.pop())
+
+def bench_view_transactions(conn, ctx):
+    operations.fetch_transactions(conn, ctx.user())
+
+def bench_view_reports(conn, ctx):
+    monthly, _ = operations.fetch_revenue_report(conn)
+    if monthly:
+        operations.fetch_top_cars(conn, monthly[0][0])
+
+# (name, function, iterations multiplier); login is bcrypt-bound, so it runs fewer times
+SCENARIOS = [
+    ("login", bench_login, 0.1),
+    ("load_inventory", bench_load_inventory, 1),
+    ("load_available", bench_load_available, 1),
+    ("view_specs", bench_view_specs, 1),
+    ("confirm_rent", bench_confirm_rent, 1),
+    ("confirm_return", bench_confirm_return, 1),
+    ("view_transactions", bench_view_transactions, 1),
+    ("view_reports", bench_view_reports, 1),
+]
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(pool, ctx, function, iterations, warmup=5):
+    for _ in range(warmup):
+        pool.run(lambda conn: function(conn, ctx))
+    timings = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        pool.run(lambda conn: function(conn, ctx))
+        timings.append((time.perf_counter() - t0) * 1000)
+    total = time.perf_counter() - start
+    timings.sort()
+    result = {f"p{pct}": percentile(timings, pct) for pct in PERCENTILES}
+    result["mean"] = sum(timings) / len(timings)
+    result["ops_per_s"] = iterations / total
+    result["iterations"] = iterations
+    return result
+
+
+def run(pool, iterations, only=None, random_seed=1, log=print):
+    ctx = pool.run(lambda conn: Context(conn, random.Random(random_seed)))
+    results = {}
+    log(f"{'scenario':<20}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>10}")
+    for name, function, factor in SCENARIOS:
+        if only and name not in only:
+            continue
+        result = run_scenario(pool, ctx, function, max(1, int(iterations * factor)))
+        results[name] = result
+        log(f"{name:<20}{result['p50']:>10.2f}{result['p95']:>10.2f}{result['p99']:>10.2f}{result['ops_per_s']:>10.0f}")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        if name in baseline and result["p95"] > baseline[name]["p95"] * tolerance:
+            regressions.append(f"{name}: p95 {baseline[name]['p95']:.2f} ms -> {result['p95']:.2f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency and throughput of every app query path, headless")
+    parser.add_argument("-n", "--iterations", type=int, default=500)
+    parser.add_argument("--only", nargs="+", choices=[s[0] for s in SCENARIOS])
+    parser.add_argument("--sqlite", metavar="PATH", help="run against an embedded SQLite database")
+    parser.add_argument("--seed-users", type=int, default=10000, help="when seeding an empty SQLite database")
+    parser.add_argument("--seed-cars", type=int, default=20000)
+    parser.add_argument("--seed-rentals", type=int, default=200000)
+    parser.add_argument("--save", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="fail if p95 regressed against saved results")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed p95 ratio against --compare")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from sqlite_backend import SQLitePool
+        pool = SQLitePool(args.sqlite)
+        if pool.run(lambda conn: operations.fetch_one(conn, "SELECT COUNT(*) FROM cars")[0]) == 0:
+            pool.run(lambda conn: seed.seed(conn, args.seed_users, args.seed_cars, args.seed_rentals))
+    else:
+        from dotenv import load_dotenv
+        from db_pool import ConnectionPool
+        load_dotenv()
+        pool = ConnectionPool.from_env()
+
+    results = run(pool, args.iterations, args.only)
+    pool.close_all()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import pricing
+
+# ------------------ Batch Quoting Benchmark ------------------
+# Prices a large fleet (100k cars by default) for many requested rental
+# windows (50) and every insurance tier in one pricing.quote_batch pass, with
+# weekend and seasonal multipliers from rates.example.json (or --rates), and
+# compares it with quoting the same cars one at a time. Spot-checks that the
+# batch quotes equal the per-car ones to the cent, and exits 1 if the batch
+# takes longer than --target ms.
+
+EXAMPLE_RATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rates.example.json")
+
+
+def random_windows(rng, count):
+    today = date.today()
+    windows = []
+    for _ in range(count):
+        start = today + timedelta(days=rng.randint(0, 365))
+        windows.append((start, start + timedelta(days=rng.randint(1, 30))))
+    return windows
+
+
+def best_of(work, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = work()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized batch quoting vs one car at a time")
+    parser.add_argument("--cars", type=int, default=100000)
+    parser.add_argument("--windows", type=int, default=50)
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="runs; the best is reported")
+    parser.add_argument("--sample", type=int, default=200, help="cars quoted one at a time for comparison")
+    parser.add_argument("--target", type=float, default=500, help="batch time limit in ms")
+    parser.add_argument("--rates", default=EXAMPLE_RATES, help="rate table JSON file")
+    parser.add_argument("--random-seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rates = pricing.RateTable.load(args.rates)
+    rng = random.Random(args.random_seed)
+    prices = np.array([rng.randint(2500, 25000) for _ in range(args.cars)], dtype=np.int64)  # cents per day
+    windows = random_windows(rng, args.windows)
+    tiers = list(rates.insurance)
+    print(f"{args.cars} cars x {args.windows} windows x {len(tiers)} tiers "
+          f"= {args.cars * args.windows * len(tiers)} quotes")
+
+    batch_ms, quotes = best_of(lambda: pricing.quote_batch(rates, prices, windows, tiers), args.repeat)
+    totals_ms, totals = best_of(quotes.totals, args.repeat)
+    print(f"{'batch quote (rental + insurance)':<36}{batch_ms:>9.1f} ms")
+    print(f"{'all totals (cars x windows x tiers)':<36}{totals_ms:>9.1f} ms")
+
+    sample = rng.sample(range(args.cars), min(args.sample, args.cars))
+    start = time.perf_counter()
+    single = {(car, w, t): sum(rates.quote(prices[car] / 100, *windows[w], tier))
+              for car in sample for w in range(len(windows)) for t, tier in enumerate(tiers)}
+    single_ms = (time.perf_counter() - start) * 1000 * args.cars / len(sample)
+    print(f"{'one car at a time (extrapolated)':<36}{single_ms:>9.1f} ms")
+
+    mismatches = sum(1 for (car, w, t), cost in single.items() if int(cost * 100) != totals[car, w, t])
+    if mismatches:
+        print(f"{mismatches} batch quotes differ from the per-car ones")
+        sys.exit(1)
+    if batch_ms + totals_ms > args.target:
+        print(f"Batch quoting took {batch_ms + totals_ms:.0f} ms, over the {args.target:.0f} ms target")
+        sys.exit(1)
+    print(f"Batch quotes match the per-car ones; {single_ms / (batch_ms + totals_ms):.0f}x faster")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import operations
+import seed
+
+# ------------------ Rent Contention Stress Test ------------------
+# Many desks rent (and some return) the same handful of cars at once, for
+# overlapping windows, then the test checks that no car ended up with two
+# open bookings overlapping each other. Reports bookings, rejected
+# conflicts, throughput, latency and the round trips (statements plus
+# commit or rollback) each rent and return takes. Exits 1 on any double
+# booking.
+# Targets the MySQL server from .env, or an embedded SQLite file with
+# --sqlite PATH (one connection per thread, seeded on first use).
+
+DOUBLE_BOOKINGS_QUERY = """
+    SELECT COUNT(*)
+    FROM rentedCars a
+    JOIN rentedCars b ON b.inventoryID = a.inventoryID AND b.rentalID > a.rentalID
+    WHERE a.rentalID > %s AND b.rentalID > %s
+      AND a.rentDate < b.returnDate AND b.rentDate < a.returnDate
+      AND NOT EXISTS (SELECT 1 FROM transactions t WHERE t.rentalID = a.rentalID)
+      AND NOT EXISTS (SELECT 1 FROM transactions t WHERE t.rentalID = b.rentalID)
+"""
+
+
+class CountingCursor:
+    def __init__(self, cur, counts):
+        self._cur = cur
+        self._counts = counts
+
+    def execute(self, *args, **kwargs):
+        self._counts[0] += 1
+        return self._cur.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        # The driver sends a batch insert as one multi-row statement
+        self._counts[0] += 1
+        return self._cur.executemany(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+class CountingConnection:
+    """Wraps a connection and counts the round trips sent through it into counts[0]."""
+
+    def __init__(self, conn, counts):
+        self._conn = conn
+        self._counts = counts
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self._conn.cursor(*args, **kwargs), self._counts)
+
+    def commit(self):
+        self._counts[0] += 1
+        self._conn.commit()
+
+    def rollback(self):
+        self._counts[0] += 1
+        self._conn.rollback()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def counted(work, trips):
+    # Runs work(conn) on a counting wrapper and appends the round trips it took
+    def run(conn):
+        counts = [0]
+        try:
+            return work(CountingConnection(conn, counts))
+        finally:
+            trips.append(counts[0])
+    return run
+
+
+def average(values):
+    return sum(values) / len(values) if values else 0
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def desk(pool, cars, renter_ids, attempts, return_ratio, random_seed, stats, lock):
+    rng = random.Random(random_seed)
+    # A narrow window far in the future, so bookings collide constantly
+    first_day = date.today() + timedelta(days=3650)
+    booked, timings, conflicts = [], [], 0
+    rent_trips, conflict_trips, return_trips = [], [], []
+    for _ in range(attempts):
+        if booked and rng.random() < return_ratio:
+            rentalID = booked.pop(rng.randrange(len(booked)))
+            pool.run(counted(lambda conn: operations.return_car(conn, rentalID), return_trips))
+            continue
+        start = first_day + timedelta(days=rng.randint(0, 60))
+        end = start + timedelta(days=rng.randint(1, 7))
+        inventoryID = rng.choice(cars)
+        t0 = time.perf_counter()
+        trips = []
+        try:
+            booked.append(pool.run(counted(lambda conn: operations.rent_car(
+                conn, rng.choice(renter_ids), inventoryID, start, end, "basic"), trips)))
+            rent_trips.extend(trips[-1:])
+        except operations.BookingConflict:
+            conflicts += 1
+            conflict_trips.extend(trips[-1:])
+        timings.append((time.perf_counter() - t0) * 1000)
+    with lock:
+        stats["timings"].extend(timings)
+        stats["bookings"] += len(booked)
+        stats["conflicts"] += conflicts
+        stats["rent_trips"].extend(rent_trips)
+        stats["conflict_trips"].extend(conflict_trips)
+        stats["return_trips"].extend(return_trips)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Many desks renting the same cars at once")
+    parser.add_argument("--desks", type=int, default=32, help="concurrent renters")
+    parser.add_argument("--cars", type=int, default=5, help="cars everyone competes for")
+    parser.add_argument("-n", "--attempts", type=int, default=100, help="rent attempts per desk")
+    parser.add_argument("--return-ratio", type=float, default=0.2)
+    parser.add_argument("--sqlite", metavar="PATH", help="run against an embedded SQLite database file")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from sqlite_backend import SQLitePool
+        pool = SQLitePool(args.sqlite, per_thread=True)
+        if pool.run(lambda conn: operations.fetch_one(conn, "SELECT COUNT(*) FROM cars")[0]) == 0:
+            pool.run(lambda conn: seed.seed(conn, 1000, 1000, 10000))
+    else:
+        from dotenv import load_dotenv
+        from db_pool import ConnectionPool
+        load_dotenv()
+        pool = ConnectionPool.from_env()
+        pool.size = max(pool.size, args.desks)
+
+    cars = [row[0] for row in pool.run(lambda conn: operations.fetch_inventory_page(conn, limit=args.cars))]
+    renter_ids = [row[0] for row in pool.run(lambda conn: operations.fetch_all(
+        conn, "SELECT userID FROM users ORDER BY userID LIMIT 100"))]
+    if not cars or not renter_ids:
+        sys.exit("Database needs cars and users; run seed.py first")
+    first_rental = pool.run(lambda conn: operations.fetch_one(
+        conn, "SELECT COALESCE(MAX(rentalID), 0) FROM rentedCars")[0])
+
+    stats = {"timings": [], "bookings": 0, "conflicts": 0, "rent_trips": [], "conflict_trips": [],
+             "return_trips": []}
+    lock = threading.Lock()
+    threads = [threading.Thread(target=desk, args=(pool, cars, renter_ids, args.attempts, args.return_ratio,
+                                                   i, stats, lock))
+               for i in range(args.desks)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    double_bookings = pool.run(lambda conn: operations.fetch_one(
+        conn, DOUBLE_BOOKINGS_QUERY, (first_rental, first_rental))[0])
+    pool.close_all()
+
+    timings = sorted(stats["timings"])
+    print(f"{args.desks} desks x {args.attempts} attempts on {len(cars)} cars in {elapsed:.2f}s")
+    print(f"Rent attempts: {len(timings)} ({len(timings) / elapsed:.0f}/s), "
+          f"open bookings: {stats['bookings']}, rejected as overlapping: {stats['conflicts']}")
+    print(f"Rent latency ms: p50 {percentile(timings, 50):.2f}  p95 {percentile(timings, 95):.2f}  "
+          f"p99 {percentile(timings, 99):.2f}")
+    print(f"Round trips (statements + commit/rollback): rent {average(stats['rent_trips']):.1f}, "
+          f"rejected rent {average(stats['conflict_trips']):.1f}, return {average(stats['return_trips']):.1f}")
+    print(f"Double bookings: {double_bookings}")
+    if double_bookings:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import operations
+import seed
+from replica import LOOKBACK, Replica
+
+# ------------------ Read Replica Benchmark ------------------
+# Read latency of the User panel's browse and spec reads served by the local
+# SQLite replica versus the primary: grid pages in a few sort orders, a
+# search, a single car's specs and a page's specs prefetch. Also times the
+# replica's first (full) sync and an incremental sync after --changes price
+# edits, and checks that every read returns the same rows from both. Targets
+# the MySQL server from .env, or an embedded SQLite primary with --sqlite PATH
+# (seeded on first use); the replica goes to --replica PATH or a temp file.
+# Rows changed within --lookback seconds of the first sync are copied again by
+# the incremental one, so on a just-seeded database pass --lookback 0 to time
+# the edits alone.
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def timed(run, work, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(work)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def scenarios(sample, rng):
+    row = rng.choice(sample)
+    ids = [r[0] for r in sample[:200]]
+    yield "available first page", lambda c: operations.fetch_available_page(c)
+    yield "available next page", lambda c: operations.fetch_available_page(c, after=operations.sort_key(row, "id"))
+    yield "available by price desc", lambda c: operations.fetch_available_page(c, sort="price", descending=True)
+    yield "available by name, next", lambda c: operations.fetch_available_page(
+        c, after=operations.sort_key(row, "name"), sort="name")
+    yield "search 'To' by name", lambda c: operations.fetch_available_page(c, search="To", sort="name")
+    yield "view specs", lambda c: operations.fetch_specs(c, row[0])
+    yield "specs prefetch (200 cars)", lambda c: operations.fetch_specs_batch(c, ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Browse read latency from the local replica vs the primary")
+    parser.add_argument("--cars", type=int, default=100000, help="fleet size to seed an empty database with")
+    parser.add_argument("-n", "--repeat", type=int, default=50, help="runs per read")
+    parser.add_argument("--changes", type=int, default=500, help="price edits before the incremental sync")
+    parser.add_argument("--sqlite", metavar="PATH", help="use an embedded SQLite primary instead of MySQL")
+    parser.add_argument("--replica", metavar="PATH", help="replica file (default: a new temp file)")
+    parser.add_argument("--lookback", type=float, default=LOOKBACK.total_seconds(),
+                        help="seconds each sync reaches back before the previous one")
+    parser.add_argument("--random-seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from sqlite_backend import SQLitePool
+        primary = SQLitePool(args.sqlite)
+    else:
+        from dotenv import load_dotenv
+        from db_pool import ConnectionPool
+        load_dotenv()
+        primary = ConnectionPool.from_env()
+
+    cars = primary.run(lambda conn: operations.fetch_one(conn, "SELECT COUNT(*) FROM carInventory")[0])
+    if cars == 0:
+        primary.run(lambda conn: seed.seed(conn, 10, args.cars, 0, args.random_seed))
+        cars = args.cars
+    path = args.replica or os.path.join(tempfile.mkdtemp(), "replica.db")
+    replica = Replica(path, primary, lookback=timedelta(seconds=args.lookback))
+
+    start = time.perf_counter()
+    copied = primary.run(replica.sync)
+    print(f"{cars} cars; first sync copied {copied} rows in {time.perf_counter() - start:.2f}s")
+    rng = random.Random(args.random_seed)
+    sample = primary.run(lambda conn: operations.fetch_inventory_page(conn, limit=1000))
+    for row in rng.sample(sample, min(args.changes, len(sample))):
+        primary.run(lambda conn: operations.update_price(conn, row[0], round(rng.uniform(20, 200), 2)))
+    start = time.perf_counter()
+    copied = primary.run(replica.sync)
+    print(f"incremental sync after {args.changes} price edits: {copied} rows in "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    mismatches = []
+    print(f"{'read':<28}{'primary p50':>12}{'p95':>8}{'replica p50':>13}{'p95':>8}{'speedup':>9}")
+    for name, work in scenarios(sample, rng):
+        if primary.run(work) != replica.local.run(work):
+            mismatches.append(name)
+        remote = timed(primary.run, work, args.repeat)
+        local = timed(replica.local.run, work, args.repeat)
+        print(f"{name:<28}{statistics.median(remote):>12.2f}{percentile(remote, 95):>8.2f}"
+              f"{statistics.median(local):>13.2f}{percentile(local, 95):>8.2f}"
+              f"{statistics.median(remote) / statistics.median(local):>8.1f}x")
+    replica.close()
+    primary.close_all()
+
+    if mismatches:
+        print(f"Replica and primary disagree on: {', '.join(mismatches)}")
+        sys.exit(1)
+    print("Replica reads match the primary")
+
+if __name__ == "__main__":
+    main()
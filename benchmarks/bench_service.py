@@ -0,0 +1,221 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import operations
+import seed
+from service import RentalService
+from sqlite_backend import SQLitePool
+
+# ------------------ Service Load Test ------------------
+# Starts service.py in-process on an embedded SQLite stand-in (a seeded temp
+# file, deleted afterwards, unless --sqlite names one to keep) and drives it
+# with hundreds of concurrent simulated desk clients, each on its own
+# keep-alive connection, running a weighted mix of screen actions.
+# Reports throughput, error counts and p50/p95/p99 latency per action, plus
+# the service's cache hit rates.
+
+# (action, weight); a desk logs in once per session of a few hundred actions, and
+# each login costs a deliberately slow bcrypt check
+MIX = [("login", 0.2), ("load_available", 35), ("load_inventory", 10), ("view_specs", 25),
+       ("confirm_rent", 8), ("view_active", 8), ("view_transactions", 12)]
+PERCENTILES = (50, 95, 99)
+
+
+class Client:
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+        self.token = None
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(body).encode() if body is not None else b""
+        auth = f"Authorization: Bearer {self.token}\r\n" if self.token else ""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n{auth}"
+                          f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        payload = json.loads(await self.reader.readexactly(length))
+        return status, payload
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class Desk:
+    """One simulated rental desk: a user browsing, renting and checking history."""
+
+    def __init__(self, client, rng, ids):
+        self.client, self.rng, self.ids = client, rng, ids
+        # One seeded user per desk; the service only shows and books a user's own rentals
+        self.user = rng.randint(ids[0], ids[1])
+
+    async def login(self):
+        status, payload = await self.client.request("POST", "/login", {"username": f"s{self.user - self.ids[0]}",
+                                                                       "password": "password"})
+        self.client.token = payload.get("token")
+        return status, payload
+
+    async def run_action(self, action):
+        rng, (_, _, inv_min, inv_max) = self.rng, self.ids
+        user = self.user
+        # A few popular cars get most of the lookups, as in seed.py
+        car = inv_min + seed.skewed_index(rng, inv_max - inv_min + 1)
+        # Most desks look at the first page of a grid; some scroll further
+        after = "" if rng.random() < 0.7 else f"&after={rng.randint(inv_min, inv_max)}"
+        if action == "login":
+            return await self.login()
+        if action == "load_available":
+            return await self.client.request("GET", f"/available?limit=200{after}")
+        if action == "load_inventory":
+            return await self.client.request("GET", f"/inventory?limit=200{after}")
+        if action == "view_specs":
+            return await self.client.request("GET", f"/specs/{car}")
+        if action == "confirm_rent":
+            start = date.today() + timedelta(days=3650 + rng.randint(0, 3650))
+            status, payload = await self.client.request("POST", "/rentals", {
+                "renterID": user, "inventoryID": car, "rentDate": start.isoformat(),
+                "returnDate": (start + timedelta(days=3)).isoformat(), "insuranceType": "basic"})
+            # A booking conflict is a normal outcome under load, not a failure
+            return (200 if status == 409 else status), payload
+        if action == "view_active":
+            return await self.client.request("GET", f"/rentals/active?renterID={user}")
+        return await self.client.request("GET", f"/transactions?renterID={user}")
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def drive(host, port, ids, clients, duration, random_seed):
+    actions, weights = zip(*MIX)
+    timings = {action: [] for action in actions}
+    errors = {action: 0 for action in actions}
+    deadline = time.perf_counter() + duration
+
+    async def desk_loop(number):
+        rng = random.Random(random_seed * 100003 + number)
+        desk = Desk(Client(host, port), rng, ids)
+        try:
+            await desk.login()
+            while time.perf_counter() < deadline:
+                action = rng.choices(actions, weights)[0]
+                start = time.perf_counter()
+                try:
+                    status, _ = await desk.run_action(action)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    status = 0
+                    desk.client.close()
+                    token, desk.client = desk.client.token, Client(host, port)
+                    desk.client.token = token
+                timings[action].append((time.perf_counter() - start) * 1000)
+                if status >= 400 or status == 0:
+                    errors[action] += 1
+        finally:
+            desk.client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(desk_loop(i) for i in range(clients)))
+    return timings, errors, time.perf_counter() - start
+
+
+def start_service(service):
+    # The service gets its own thread and event loop, like a separate process would
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(service.serve("127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    return loop, thread, server
+
+
+def stop_service(loop, thread, server):
+    async def shutdown():
+        server.close()
+        await server.wait_closed()
+        # Let handlers notice their clients have gone, then stop
+        await asyncio.sleep(0.2)
+        for task in asyncio.all_tasks() - {asyncio.current_task()}:
+            task.cancel()
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def run(args, path):
+    pool = SQLitePool(path)
+    if pool.run(lambda conn: operations.fetch_one(conn, "SELECT COUNT(*) FROM cars")[0]) == 0:
+        pool.run(lambda conn: seed.seed(conn, args.seed_users, args.seed_cars, args.seed_rentals))
+    ids = pool.run(lambda conn: operations.fetch_one(
+        conn, "SELECT MIN(userID), MAX(userID) FROM users") + operations.fetch_one(
+        conn, "SELECT MIN(inventoryID), MAX(inventoryID) FROM carInventory"))
+
+    service = RentalService(pool, workers=args.workers, cache_ttl=args.cache_ttl)
+    loop, thread, server = start_service(service)
+    port = server.sockets[0].getsockname()[1]
+    print(f"{args.clients} clients for {args.duration:.0f}s against 127.0.0.1:{port}")
+    timings, errors, elapsed = asyncio.run(drive("127.0.0.1", port, ids, args.clients, args.duration,
+                                                 args.random_seed))
+    stop_service(loop, thread, server)
+
+    total = sum(len(values) for values in timings.values())
+    print(f"{'action':<20}{'requests':>10}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for action, values in timings.items():
+        if not values:
+            continue
+        values.sort()
+        p50, p95, p99 = (percentile(values, pct) for pct in PERCENTILES)
+        print(f"{action:<20}{len(values):>10}{errors[action]:>8}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+    print(f"Throughput: {total / elapsed:.0f} requests/s")
+    for name, cache in (("pages", service.pages), ("free_pages", service.free_pages), ("specs", service.specs)):
+        lookups = cache.hits + cache.misses
+        print(f"Cache {name}: {cache.hits / lookups if lookups else 0:.0%} hit rate over {lookups} lookups")
+    service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test service.py with many concurrent simulated desks")
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument("--sqlite", metavar="PATH", help="database to use and keep (seeded if empty)")
+    parser.add_argument("--seed-users", type=int, default=5000)
+    parser.add_argument("--seed-cars", type=int, default=10000)
+    parser.add_argument("--seed-rentals", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=8, help="service database worker threads")
+    parser.add_argument("--cache-ttl", type=float, default=2.0)
+    parser.add_argument("--random-seed", type=int, default=1)
+    args = parser.parse_args()
+
+    path = args.sqlite or os.path.join(tempfile.gettempdir(), f"bench_service_{os.getpid()}.db")
+    try:
+        run(args, path)
+    finally:
+        if not args.sqlite:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ------------------ Startup Benchmark ------------------
+# Cold-start cost of the desktop app, each run in a fresh interpreter: time to
+# import app.py, and time until the start page is drawn and the window accepts
+# input. Also lists which heavy modules were loaded by the import alone; none
+# of them should be, since the pool, MySQL driver and bcrypt are now loaded on
+# first use. Without a display only the import is measured.
+
+HEAVY_MODULES = ("mysql.connector", "bcrypt", "service_client", "db_pool")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+result = {"import_ms": (time.perf_counter() - start) * 1000,
+          "loaded": [name for name in %r if name in sys.modules]}
+try:
+    window = app.CarRentalApp()
+except app.tk.TclError:
+    pass  # no display
+else:
+    window.update()
+    result["interactive_ms"] = (time.perf_counter() - start) * 1000
+    window.on_close()
+print(json.dumps(result))
+""" % (HEAVY_MODULES,)
+
+
+def run_once():
+    output = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start time of the desktop app")
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    print(f"{args.runs} cold starts")
+    for key, title in (("import_ms", "import app"), ("interactive_ms", "start page interactive")):
+        times = [run[key] for run in runs if key in run]
+        if times:
+            print(f"{title:>24}: median {statistics.median(times):7.1f} ms, max {max(times):7.1f} ms")
+        else:
+            print(f"{title:>24}: not measured (no display)")
+    loaded = sorted({name for run in runs for name in run["loaded"]})
+    print(f"{'loaded by import':>24}: {', '.join(loaded) or 'none'}")
+
+if __name__ == "__main__":
+    main()
@@ -67,5 +67,4 @@ CREATE TABLE transactions
     FOREIGN KEY (rentalID) REFERENCES rentedCars(rentalID) ON DELETE CASCADE
 );
 
-
-
+-- Later schema changes live in migrations/; apply them with: python migrate.py
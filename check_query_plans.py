@@ -0,0 +1,216 @@
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import archive
+import operations
+import fleet_import
+import replica
+from reservations import ReservationIndex
+
+# ------------------ Query Plan Regression Harness ------------------
+# Runs every database operation the app performs against a recording
+# connection to capture the exact SQL and parameters it sends, then runs
+# EXPLAIN (and, for reads, timing) for each statement against the real,
+# seeded database. Exits non-zero if any plan falls back to a full table
+# scan (EXPLAIN type = ALL), so an index or query change that loses an
+# access path is caught before release.
+
+# Tables small enough that a scan is expected and harmless
+ALLOWED_FULL_SCANS = {"inventoryVersion", "schemaMigrations"}
+
+
+class RecordingCursor:
+    def __init__(self, log, rows):
+        self.log = log
+        self.rows = rows
+        self.lastrowid = 0
+        self.rowcount = 1
+
+    def execute(self, query, params=()):
+        self.log.append((" ".join(query.split()), tuple(params)))
+
+    def executemany(self, query, seq_params):
+        for params in seq_params:
+            self.log.append((" ".join(query.split()), tuple(params)))
+            break
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else (0,)
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def fetchmany(self, size=1):
+        return []
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.log = []
+        # What fetchone() and fetchall() answer, for operations that need a real-looking row
+        self.rows = []
+
+    def returning(self, rows):
+        self.rows = rows
+        return self
+
+    def cursor(self, **kwargs):
+        return RecordingCursor(self.log, self.rows)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def sample_ids(conn):
+    row = operations.fetch_one(conn, """
+        SELECT (SELECT MIN(inventoryID) FROM carInventory), (SELECT MAX(inventoryID) FROM carInventory),
+               (SELECT renterID FROM rentedCars ORDER BY rentalID DESC LIMIT 1),
+               (SELECT MAX(rentalID) FROM rentedCars),
+               (SELECT COALESCE(MAX(transactionID), 0) FROM transactions),
+               (SELECT userName FROM users ORDER BY userID LIMIT 1),
+               (SELECT carLicensePlate FROM cars ORDER BY carID LIMIT 1)
+    """)
+    if row is None or None in row:
+        sys.exit("Database needs cars, users and rentals; run seed.py first")
+    first, last, renterID, rentalID, transactionID, userName, plate = row
+    return SimpleNamespace(inventoryID=(first + last) // 2, renterID=renterID, rentalID=rentalID,
+                           transactionID=transactionID, userName=userName, plate=plate)
+
+
+def synced_index(s):
+    index = ReservationIndex()
+    index.last_rentalID = max(s.rentalID - 100, 0)
+    index.last_transactionID = max(s.transactionID - 100, 0)
+    return index
+
+
+# (name, operation(conn, samples)) for every screen action in the app
+SCENARIOS = [
+    ("login", lambda c, s: operations.authenticate(c, s.userName, "password")),
+    ("password hash upgrade", lambda c, s: operations.store_password_hash(c, s.renterID, "$2b$12$" + "x" * 53)),
+    ("inventory first page", lambda c, s: operations.fetch_inventory_page(c)),
+    ("inventory next page", lambda c, s: operations.fetch_inventory_page(c, after=s.inventoryID)),
+    ("inventory previous page", lambda c, s: operations.fetch_inventory_page(c, before=s.inventoryID)),
+    ("available next page", lambda c, s: operations.fetch_available_page(c, after=s.inventoryID)),
+    ("inventory sorted by name, next page", lambda c, s: operations.fetch_inventory_page(
+        c, after=("Toyota", s.plate), sort="name")),
+    ("inventory sorted by price, previous page", lambda c, s: operations.fetch_inventory_page(
+        c, before=(50, s.inventoryID), sort="price", descending=True)),
+    ("available sorted by price", lambda c, s: operations.fetch_available_page(c, sort="price")),
+    ("inventory search", lambda c, s: operations.fetch_inventory_page(c, search=s.plate[:4], sort="name")),
+    ("inventory version", lambda c, s: operations.fetch_inventory_version(c)),
+    ("add car", lambda c, s: operations.add_car(c, "Car", "Model", 2024, "PLAN-0001", 50, "200", 5, "30")),
+    ("remove car", lambda c, s: operations.remove_car(c, s.inventoryID)),
+    ("edit cost", lambda c, s: operations.update_price(c, s.inventoryID, 99)),
+    ("view specs", lambda c, s: operations.fetch_specs(c, s.inventoryID)),
+    ("specs prefetch for a page", lambda c, s: operations.fetch_specs_batch(
+        c, range(s.inventoryID, s.inventoryID + 200))),
+    ("rent car", lambda c, s: operations.rent_car(c, s.renterID, s.inventoryID, date.today(),
+                                                  date.today() + timedelta(days=3), "basic")),
+    ("return list", lambda c, s: operations.fetch_active_rentals(c, s.renterID)),
+    ("return car", lambda c, s: operations.return_car(
+        c.returning([(s.inventoryID, "basic", date.today(), date.today())]), s.rentalID, s.renterID)),
+    ("transaction log", lambda c, s: operations.fetch_transactions(c, s.renterID)),
+    ("revenue report", lambda c, s: operations.fetch_revenue_report(c)),
+    ("top cars", lambda c, s: operations.fetch_top_cars(c, operations.months_ago(0))),
+    ("booking sync", lambda c, s: synced_index(s).refresh(c)),
+    ("free cars by date, searched and sorted", lambda c, s: synced_index(s).fetch_free_page(
+        c, date.today(), date.today() + timedelta(days=3), search=s.plate[:4], sort="name")),
+    ("archive batch", lambda c, s: archive.archive_batch(c.returning([(s.rentalID,)]),
+                                                         date.today() - timedelta(days=365))),
+    ("replica sync", lambda c, s: [list(operations.stream(c, query, (date.today(),))) for query in (
+        replica.CHANGED_SPECS_QUERY, replica.CHANGED_INVENTORY_QUERY, replica.CHANGED_CARS_QUERY,
+        replica.DELETED_QUERY)]),
+    ("fleet import plate check", lambda c, s: fleet_import.existing_plates(c, [s.plate, "PLAN-0001"])),
+    ("fleet import ID lookups", lambda c, s: fleet_import.insert_batch(
+        c.returning([("PLAN-0001", s.inventoryID)]), [("Car", "Model", 2024, "PLAN-0001", 50, "200", 5, "30")])),
+]
+
+
+def capture(scenario, samples):
+    recorder = RecordingConnection()
+    try:
+        scenario(recorder, samples)
+    except Exception:
+        # Fake results can trip later steps; everything sent up to then is captured
+        pass
+    return recorder.log
+
+
+def explain(conn, query, params):
+    cur = conn.cursor(dictionary=True)
+    try:
+        cur.execute("EXPLAIN " + query, params)
+        return cur.fetchall()
+    finally:
+        cur.close()
+
+
+def time_query(conn, query, params, repeat):
+    cur = conn.cursor()
+    try:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            cur.execute(query, params)
+            cur.fetchall()
+        return (time.perf_counter() - start) / repeat * 1000
+    finally:
+        cur.close()
+
+
+def check(conn, repeat=20, verbose=False, log=print):
+    samples = sample_ids(conn)
+    failures = []
+    for name, scenario in SCENARIOS:
+        for query, params in capture(scenario, samples):
+            # Plain inserts have no plan; INSERT ... SELECT reads like any query
+            if query.upper().startswith("INSERT") and " SELECT " not in query.upper():
+                continue
+            plan = explain(conn, query, params)
+            # <union1,2>, <derived2> and the like are temporary tables, not stored ones
+            scans = [row["table"] for row in plan
+                     if row.get("type") == "ALL" and row.get("table") not in ALLOWED_FULL_SCANS
+                     and not (row.get("table") or "").startswith("<")]
+            is_read = query.upper().startswith("SELECT")
+            elapsed = time_query(conn, query, params, repeat) if is_read else None
+            status = "FULL SCAN " + ", ".join(scans) if scans else "ok"
+            timing = f"{elapsed:8.2f} ms" if elapsed is not None else "       -   "
+            log(f"{status:<24}{timing}  {name}: {query[:90]}")
+            if verbose:
+                for row in plan:
+                    log(f"    {row.get('table')}: type={row.get('type')} key={row.get('key')} "
+                        f"rows={row.get('rows')} {row.get('Extra') or ''}")
+            if scans:
+                failures.append((name, query, scans))
+    return failures
+
+
+def main():
+    from dotenv import load_dotenv
+    from db_pool import ConnectionPool
+
+    parser = argparse.ArgumentParser(description="EXPLAIN and time every query the app runs; fail on full scans")
+    parser.add_argument("--repeat", type=int, default=20, help="executions per read query for timing")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print the full plan of each statement")
+    args = parser.parse_args()
+
+    load_dotenv()
+    pool = ConnectionPool.from_env()
+    failures = pool.run(lambda conn: check(conn, args.repeat, args.verbose))
+    pool.close_all()
+    if failures:
+        print(f"\n{len(failures)} statement(s) fall back to a full table scan.")
+        sys.exit(1)
+    print("\nAll query plans use an index.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import queue
+import threading
+import time
+
+from instrumentation import METRICS
+
+# ------------------ Background DB Executor ------------------
+# Database work runs on worker threads so the Tk mainloop never blocks.
+# Results are handed back to the GUI thread by an after() polling loop,
+# because Tk widgets must only be touched from the thread running mainloop.
+# Streamed jobs hand back each chunk of rows as it is read, then finish.
+
+class Job:
+    def __init__(self, work, on_success, on_error, label, on_chunk=None):
+        self.work = work
+        self.on_success = on_success
+        self.on_error = on_error
+        self.label = label
+        self.on_chunk = on_chunk
+        self.cancelled = False
+        self.submitted = time.perf_counter()
+
+
+class DBExecutor:
+    def __init__(self, root, pool, workers=2, on_error=None, poll_ms=50):
+        self.root = root
+        self.pool = pool
+        self.default_error = on_error
+        self.poll_ms = poll_ms
+        self.busy_listeners = []
+
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Each job borrows its own connection from the pool for the duration of the job
+        self._workers = []
+        for i in range(workers):
+            worker = threading.Thread(target=self._run, name=f"db-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, work, on_success=None, on_error=None, label="Working...", on_chunk=None):
+        """Queue work(conn) for a worker thread; callbacks run on the Tk thread."""
+        job = Job(work, on_success, on_error or self.default_error, label, on_chunk)
+        with self._lock:
+            self._pending.append(job)
+        self._jobs.put(job)
+        self._notify_busy()
+        return job
+
+    def stream(self, work, on_chunk, on_success=None, on_error=None, label="Working..."):
+        """Queue work(conn) that yields chunks of rows; on_chunk gets each one on the Tk thread as it
+        arrives, and on_success(None) follows the last."""
+        return self.submit(work, on_success, on_error, label, on_chunk)
+
+    def cancel_all(self):
+        """Drop queued jobs and discard the result of the one running now."""
+        with self._lock:
+            for job in self._pending:
+                job.cancelled = True
+            self._pending = []
+        self._notify_busy()
+
+    @property
+    def busy(self):
+        with self._lock:
+            return bool(self._pending)
+
+    def shutdown(self):
+        self._closed = True
+        self.cancel_all()
+        for _ in self._workers:
+            self._jobs.put(None)
+        try:
+            self.root.after_cancel(self._poll_id)
+        except Exception:
+            pass
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            if job.cancelled:
+                continue
+            try:
+                work = job.work if job.on_chunk is None else lambda conn: self._drain(job, conn)
+                result = self.pool.run(work)
+                self._results.put((job, result, None, True))
+            except Exception as err:
+                self._results.put((job, None, err, True))
+
+    def _drain(self, job, conn):
+        chunks = job.work(conn)
+        try:
+            for chunk in chunks:
+                if job.cancelled:
+                    break
+                self._results.put((job, chunk, None, False))
+        finally:
+            # Closing the generator lets it clean up its cursor before the connection goes back
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    job, result, err, done = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                if not done:
+                    if not job.cancelled:
+                        self._dispatch(job.on_chunk, result)
+                    continue
+                with self._lock:
+                    if job in self._pending:
+                        self._pending.remove(job)
+                if not job.cancelled:
+                    if err is not None:
+                        if job.on_error:
+                            self._dispatch(job.on_error, err)
+                    elif job.on_success:
+                        self._dispatch(job.on_success, result)
+                    if METRICS.enabled:
+                        # Click-to-screen latency: queue wait, database work and the UI update
+                        METRICS.observe("screen", job.label, (time.perf_counter() - job.submitted) * 1000)
+                self._notify_busy()
+        finally:
+            # Reschedule even if a callback or listener raised, or no later result would reach the UI
+            if not self._closed:
+                self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _dispatch(self, callback, value):
+        try:
+            callback(value)
+        except Exception as err:
+            if self.default_error is None or callback is self.default_error:
+                raise
+            self.default_error(err)
+
+    def _notify_busy(self):
+        with self._lock:
+            label = self._pending[0].label if self._pending else None
+        for listener in self.busy_listeners:
+            listener(label)
+
+
+class LazyPool:
+    """Creates the real pool on first use, i.e. on a worker thread rather than at startup."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._factory()
+            return self._pool
+
+    def run(self, work):
+        return self.pool.run(work)
+
+    def close_all(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close_all()
@@ -0,0 +1,170 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import errorcode
+
+from instrumentation import METRICS
+
+# Client errors that mean the connection is gone and the operation can be retried
+RECONNECT_ERRORS = {
+    errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.CR_SERVER_LOST,
+    errorcode.CR_CONN_HOST_ERROR,
+    errorcode.CR_CONNECTION_ERROR,
+    errorcode.CR_SERVER_LOST_EXTENDED,
+}
+
+# Server errors after which the whole transaction was (or is) rolled back and can be rerun
+RETRY_ERRORS = RECONNECT_ERRORS | {
+    errorcode.ER_LOCK_DEADLOCK,
+    errorcode.ER_LOCK_WAIT_TIMEOUT,
+}
+
+# ------------------ Connection Pool ------------------
+class PoolExhausted(mysql.connector.Error):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, host, user, password, database, size=5, retries=3, retry_delay=0.5,
+                 health_check_interval=30, acquire_timeout=10):
+        self.config = dict(host=host, user=user, password=password, database=database)
+        self.size = size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            host=os.getenv("DB_HOST"),
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            database=os.getenv("DB_NAME"),
+            size=int(os.getenv("DB_POOL_SIZE", "5")),
+            retries=int(os.getenv("DB_CONNECT_RETRIES", "3")),
+            retry_delay=float(os.getenv("DB_RETRY_DELAY", "0.5")),
+            health_check_interval=float(os.getenv("DB_HEALTHCHECK_INTERVAL", "30")),
+            acquire_timeout=float(os.getenv("DB_ACQUIRE_TIMEOUT", "10")),
+        )
+
+    def _connect(self):
+        # Retry with exponential backoff so a server restart doesn't kill the app
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            try:
+                return mysql.connector.connect(**self.config)
+            except mysql.connector.Error:
+                if attempt == self.retries:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
+    def _is_healthy(self, conn):
+        try:
+            conn.ping(reconnect=True, attempts=self.retries, delay=self.retry_delay)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def acquire(self):
+        try:
+            conn, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            try:
+                conn, last_used = self._idle.get(timeout=self.acquire_timeout)
+            except queue.Empty:
+                raise PoolExhausted(msg=f"No database connection free after {self.acquire_timeout}s")
+
+        # Only ping connections that sat idle long enough to hit wait_timeout
+        if time.monotonic() - last_used > self.health_check_interval and not self._is_healthy(conn):
+            self._discard(conn)
+            return self.acquire()
+        return conn
+
+    def release(self, conn):
+        try:
+            # End any open (read) transaction so the next user sees fresh data
+            if conn.in_transaction:
+                conn.rollback()
+        except mysql.connector.Error:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield METRICS.wrap(conn)
+        except mysql.connector.Error as err:
+            if getattr(err, "errno", None) in RECONNECT_ERRORS:
+                self._discard(conn)
+            else:
+                self.release(conn)
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            cur = conn.cursor()
+            try:
+                yield cur
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+    def run(self, work):
+        """Call work(conn) on a pooled connection, retrying if the connection drops or a lock deadlocks."""
+        for attempt in range(self.retries + 1):
+            try:
+                with self.connection() as conn:
+                    return work(conn)
+            except mysql.connector.Error as err:
+                if getattr(err, "errno", None) not in RETRY_ERRORS or attempt == self.retries:
+                    raise
+                time.sleep(self.retry_delay)
+
+    def close_all(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
@@ -0,0 +1,218 @@
+import argparse
+import csv
+import json
+import math
+import os
+import time
+from itertools import islice
+
+import operations
+
+# ------------------ Bulk Fleet Import ------------------
+# Streams cars from a CSV, JSON Lines or JSON file and inserts them in batches:
+# one multi-row INSERT per table (cars, carInventory, carSpecs) per batch,
+# committed as one transaction. Bad rows are reported and skipped; they never
+# abort the rest of the import.
+#
+# Expected fields (CSV header or JSON keys), matching the database columns:
+#   carName, carModel, carModelYear, carLicensePlate, pricePerDay,
+#   horsepower, seatingCapacity, fuelEfficiency
+
+FIELDS = ("carName", "carModel", "carModelYear", "carLicensePlate", "pricePerDay",
+          "horsepower", "seatingCapacity", "fuelEfficiency")
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class ImportReport:
+    def __init__(self):
+        self.inserted = 0
+        self.errors = []  # (row number, message)
+        self.elapsed = 0.0
+
+    def add_error(self, line, message):
+        self.errors.append((line, message))
+
+    def summary(self, max_errors=10):
+        rate = self.inserted / self.elapsed if self.elapsed else 0
+        lines = [f"Imported {self.inserted} cars in {self.elapsed:.2f}s ({rate:.0f} cars/s).",
+                 f"{len(self.errors)} rows rejected."]
+        for line, message in self.errors[:max_errors]:
+            lines.append(f"  row {line}: {message}")
+        if len(self.errors) > max_errors:
+            lines.append(f"  ... and {len(self.errors) - max_errors} more")
+        return "\n".join(lines)
+
+
+def read_records(path, on_error=None):
+    """Yield (row number, dict) pairs without loading the whole file where possible.
+
+    A JSON Lines line that does not parse goes to on_error(row number, message) and is skipped.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, newline='', encoding='utf-8') as f:
+        if ext == ".csv":
+            for number, record in enumerate(csv.DictReader(f), start=2):
+                yield number, record
+        elif ext in (".jsonl", ".ndjson"):
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as err:
+                    if on_error is None:
+                        raise
+                    on_error(number, f"invalid JSON: {err}")
+                    continue
+                yield number, record
+        elif ext == ".json":
+            # A plain JSON array has to be parsed in one go; use .jsonl for very large files
+            for number, record in enumerate(json.load(f), start=1):
+                yield number, record
+        else:
+            raise ValueError(f"Unsupported file type: {ext} (use .csv, .json or .jsonl)")
+
+
+def validate(record):
+    missing = [field for field in FIELDS[:5] if not str(record.get(field) or "").strip()]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    carName = str(record["carName"]).strip()
+    model = str(record["carModel"]).strip()
+    plate = str(record["carLicensePlate"]).strip()
+    if len(carName) > 100 or len(model) > 100:
+        raise ValueError("carName and carModel must be at most 100 characters")
+    if len(plate) > 20:
+        raise ValueError("carLicensePlate must be at most 20 characters")
+    try:
+        year = int(record["carModelYear"])
+        price = float(record["pricePerDay"])
+        seat = int(record["seatingCapacity"]) if str(record.get("seatingCapacity") or "").strip() else None
+    except (ValueError, OverflowError) as err:
+        # int() already refuses nan and inf years and seat counts
+        raise ValueError(f"invalid number: {err}")
+    if not math.isfinite(price):
+        raise ValueError("pricePerDay must be a finite number")
+    if price < 0:
+        raise ValueError("pricePerDay must not be negative")
+    hp = str(record.get("horsepower") or "").strip() or None
+    fuel = str(record.get("fuelEfficiency") or "").strip() or None
+    return carName, model, year, plate, price, hp, seat, fuel
+
+
+def insert_batch(conn, cars):
+    # cars: list of validated tuples with unique, not-yet-used license plates
+    cur = conn.cursor()
+    try:
+        cur.executemany("INSERT INTO cars (carName, carModel, carModelYear, carLicensePlate, changedAt) "
+                        "VALUES (%s, %s, %s, %s, NOW())", [car[:4] for car in cars])
+        # Auto-increment IDs of a multi-row insert are not guaranteed to be consecutive,
+        # so map them back through the unique license plate
+        plates = [car[3] for car in cars]
+        marks = ", ".join(["%s"] * len(plates))
+        cur.execute(f"SELECT carLicensePlate, carID FROM cars WHERE carLicensePlate IN ({marks})", plates)
+        car_ids = dict(cur.fetchall())
+
+        cur.executemany("INSERT INTO carInventory (carID, pricePerDay, isAvailable, changedAt) VALUES (%s, %s, 1, NOW())",
+                        [(car_ids[car[3]], car[4]) for car in cars])
+        ids = list(car_ids.values())
+        cur.execute(f"SELECT carID, inventoryID FROM carInventory WHERE carID IN ({marks})", ids)
+        inventory_ids = dict(cur.fetchall())
+
+        cur.executemany("INSERT INTO carSpecs (inventoryID, horsepower, seatingCapacity, fuelEfficiency, changedAt) "
+                        "VALUES (%s, %s, %s, %s, NOW())",
+                        [(inventory_ids[car_ids[car[3]]], car[5], car[6], car[7]) for car in cars])
+        operations.bump_inventory_version(cur)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def existing_plates(conn, plates):
+    if not plates:
+        return set()
+    marks = ", ".join(["%s"] * len(plates))
+    return {row[0] for row in operations.fetch_all(
+        conn, f"SELECT carLicensePlate FROM cars WHERE carLicensePlate IN ({marks})", tuple(plates))}
+
+
+def import_records(conn, records, batch_size=DEFAULT_BATCH_SIZE, progress=None, report=None):
+    # Rows the database rejects: MySQL's or the SQLite stand-in's errors, whichever conn uses
+    rejected = operations.driver_error(conn)
+    report = ImportReport() if report is None else report
+    start = time.perf_counter()
+    seen_plates = set()
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            break
+        batch = []
+        for line, record in chunk:
+            try:
+                car = validate(record)
+            except (ValueError, TypeError, AttributeError) as err:
+                report.add_error(line, str(err))
+                continue
+            if car[3] in seen_plates:
+                report.add_error(line, f"duplicate license plate {car[3]} in file")
+                continue
+            seen_plates.add(car[3])
+            batch.append((line, car))
+
+        taken = existing_plates(conn, [car[3] for _, car in batch])
+        for line, car in batch:
+            if car[3] in taken:
+                report.add_error(line, f"license plate {car[3]} already exists")
+        batch = [(line, car) for line, car in batch if car[3] not in taken]
+        if not batch:
+            continue
+
+        try:
+            insert_batch(conn, [car for _, car in batch])
+            report.inserted += len(batch)
+        except rejected:
+            # Fall back to one car per transaction to find the rows the server rejects
+            for line, car in batch:
+                try:
+                    insert_batch(conn, [car])
+                    report.inserted += 1
+                except rejected as err:
+                    report.add_error(line, str(err))
+        if progress:
+            progress(report)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def import_file(conn, path, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    report = ImportReport()
+    return import_records(conn, read_records(path, report.add_error), batch_size, progress, report)
+
+
+# ------------------ Command Line ------------------
+def main():
+    from dotenv import load_dotenv
+    from db_pool import ConnectionPool
+
+    parser = argparse.ArgumentParser(description="Bulk import cars from a CSV, JSON or JSON Lines file")
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-errors", type=int, default=50, help="rejected rows to print")
+    args = parser.parse_args()
+
+    load_dotenv()
+    pool = ConnectionPool.from_env()
+    report = pool.run(lambda conn: import_file(
+        conn, args.path, args.batch_size,
+        progress=lambda r: print(f"\r{r.inserted} imported, {len(r.errors)} rejected", end="", flush=True)))
+    pool.close_all()
+    print()
+    print(report.summary(args.max_errors))
+
+if __name__ == "__main__":
+    main()
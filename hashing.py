@@ -0,0 +1,90 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# ------------------ Password Hashing ------------------
+# bcrypt is slow on purpose, so hashing and checking run in a pool of worker
+# processes: many logins proceed in parallel on all cores, and neither the Tk
+# thread nor the service's event loop ever waits on one. The work factor is
+# configurable; a stored hash made with a different cost is re-hashed at the
+# configured cost the next time its owner logs in.
+#
+# Settings (.env): BCRYPT_ROUNDS (default 12, bcrypt's own default; each +1
+# doubles the cost), HASH_WORKERS (processes, default one per CPU; 0 hashes in
+# the calling thread). Until configure_from_env() is called, hashing runs in
+# the calling thread at the default cost, which suits scripts and tools.
+
+DEFAULT_ROUNDS = 12
+
+
+def hash_rounds(hashed):
+    """Work factor of a stored hash, e.g. 12 for '$2b$12$...'."""
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def hash_password(password, rounds=DEFAULT_ROUNDS):
+    import bcrypt  # loaded on first use (normally in a worker process), not at app startup
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def verify_password(password, hashed, rounds=DEFAULT_ROUNDS):
+    """Return (matches, upgraded hash or None); re-hashes in the same call if the cost is outdated."""
+    import bcrypt
+    if not bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8')):
+        return False, None
+    if hash_rounds(hashed) != rounds:
+        return True, hash_password(password, rounds)
+    return True, None
+
+
+class PasswordHasher:
+    def __init__(self, rounds=DEFAULT_ROUNDS, workers=0):
+        self.rounds = rounds
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def configure_from_env(self):
+        self.shutdown()
+        self.rounds = int(os.getenv("BCRYPT_ROUNDS", str(DEFAULT_ROUNDS)))
+        self.workers = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+
+    @property
+    def executor(self):
+        # Started on first use; spawn rather than fork, since the app already runs Tk and DB threads
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _call(self, function, *args):
+        executor = self.executor
+        if executor is None:
+            return function(*args)
+        return executor.submit(function, *args).result()
+
+    def hash(self, password):
+        return self._call(hash_password, password, self.rounds)
+
+    def verify(self, password, hashed):
+        return self._call(verify_password, password, hashed, self.rounds)
+
+    def warm_up(self):
+        """Start the worker processes now (without waiting), so the first login doesn't pay for it."""
+        executor = self.executor
+        if executor is not None:
+            executor.submit(hash_rounds, "")
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Process-wide hasher; configure_from_env() turns on the worker processes
+HASHER = PasswordHasher()
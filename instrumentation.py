@@ -0,0 +1,256 @@
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# ------------------ Query and Screen Instrumentation ------------------
+# Times every database statement (execute plus fetch, with row count and the
+# operation that issued it) and every screen action, keeps in-process
+# histograms, logs statements slower than a threshold, and exports a snapshot
+# as JSON or Prometheus text. Disabled by default: connections are then handed
+# out unwrapped, so the only cost is one flag check per database job.
+#
+# Settings (.env): METRICS_ENABLED=1, SLOW_QUERY_MS (default 200),
+# SLOW_QUERY_LOG (default slow_queries.log), METRICS_EXPORT (file written on
+# exit; .prom for Prometheus text, anything else for JSON).
+
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_HELPERS = {"fetch_all", "fetch_one", "stream"}
+_THIS_FILE = os.path.abspath(__file__)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.rows = 0
+        self.max = 0.0
+
+    def observe(self, ms, rows=0):
+        i = 0
+        while i < len(BUCKETS_MS) and ms > BUCKETS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += ms
+        self.rows += rows
+        self.max = max(self.max, ms)
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max
+        return 0.0
+
+    def to_dict(self):
+        return {"count": self.count, "sum_ms": round(self.sum, 3), "max_ms": round(self.max, 3),
+                "rows": self.rows, "p50_ms": self.quantile(0.5), "p95_ms": self.quantile(0.95),
+                "p99_ms": self.quantile(0.99),
+                "buckets": dict(zip([str(b) for b in BUCKETS_MS] + ["+Inf"], self.counts))}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def fingerprint(query):
+    """Short, low-cardinality label for a statement, e.g. 'SELECT carSpecs'."""
+    words = query.split(None, 1)
+    verb = words[0].upper() if words else "?"
+    match = re.search(r"\b(?:FROM|INTO|UPDATE)\s+`?(\w+)", query, re.I)
+    return f"{verb} {match.group(1)}" if match else verb
+
+
+def call_site():
+    frame = sys._getframe(2)
+    while frame and (frame.f_code.co_filename == _THIS_FILE or frame.f_code.co_name in _HELPERS):
+        frame = frame.f_back
+    if frame is None:
+        return "?", "?"
+    module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+    return f"{module}.{frame.f_code.co_name}", f"{module}.py:{frame.f_lineno}"
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.slow_query_ms = 200.0
+        self.export_path = None
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.slow_log = logging.getLogger("carrental.slow_queries")
+
+    def configure_from_env(self):
+        self.enabled = os.getenv("METRICS_ENABLED", "0").lower() in ("1", "true", "yes")
+        self.slow_query_ms = float(os.getenv("SLOW_QUERY_MS", "200"))
+        self.export_path = os.getenv("METRICS_EXPORT") or None
+        if self.enabled and not self.slow_log.handlers:
+            handler = logging.FileHandler(os.getenv("SLOW_QUERY_LOG", "slow_queries.log"))
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.slow_log.addHandler(handler)
+            self.slow_log.setLevel(logging.INFO)
+            self.slow_log.propagate = False
+
+    def observe(self, kind, name, ms, rows=0, **labels):
+        key = (kind, name) + tuple(sorted(labels.items()))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(ms, rows)
+
+    @contextmanager
+    def timer(self, kind, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(kind, name, (time.perf_counter() - start) * 1000)
+
+    def record_query(self, site, location, query, ms, rows):
+        statement = fingerprint(query)
+        self.observe("query", site, ms, rows, statement=statement)
+        if ms >= self.slow_query_ms:
+            self.slow_log.info("%.1f ms rows=%d site=%s %s", ms, rows, location, " ".join(query.split()))
+
+    def wrap(self, conn):
+        return InstrumentedConnection(conn, self) if self.enabled else conn
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    # ------------------ Export ------------------
+    def snapshot(self):
+        with self._lock:
+            items = sorted(self._histograms.items())
+            result = {}
+            for (kind, name, *labels), histogram in items:
+                entry = histogram.to_dict()
+                entry["name"] = name
+                entry.update(dict(labels))
+                result.setdefault(kind, []).append(entry)
+            return result
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        lines, rows = [], []
+        with self._lock:
+            items = sorted(self._histograms.items())
+        declared = set()
+        for (kind, name, *labels), histogram in items:
+            metric = f"carrental_{kind}_duration_ms"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} histogram")
+                declared.add(metric)
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in [("name", name)] + list(labels))
+            cumulative = 0
+            for bound, count in zip([str(b) for b in BUCKETS_MS] + ["+Inf"], histogram.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f"{metric}_sum{{{label_text}}} {histogram.sum:.3f}")
+            lines.append(f"{metric}_count{{{label_text}}} {histogram.count}")
+            if kind == "query":
+                rows.append(f"carrental_query_rows_total{{{label_text}}} {histogram.rows}")
+        # A metric family's samples must follow its TYPE line together, so the row counts come last
+        if rows:
+            lines.append("# TYPE carrental_query_rows_total counter")
+            lines.extend(rows)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path=None):
+        path = path or self.export_path
+        if not path:
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus() if path.endswith(".prom") else self.to_json())
+
+
+# Process-wide registry; configure_from_env() turns it on
+METRICS = Metrics()
+
+
+class InstrumentedCursor:
+    def __init__(self, cursor, metrics):
+        self._cur = cursor
+        self._metrics = metrics
+        self._pending = None
+
+    def _finish(self):
+        if self._pending:
+            site, location, query, start, rows = self._pending
+            self._pending = None
+            self._metrics.record_query(site, location, query, (time.perf_counter() - start) * 1000, rows)
+
+    def execute(self, query, params=()):
+        self._finish()
+        site, location = call_site()
+        start = time.perf_counter()
+        self._cur.execute(query, params)
+        self._pending = [site, location, query, start, self._affected(query)]
+
+    def executemany(self, query, seq_params):
+        self._finish()
+        site, location = call_site()
+        start = time.perf_counter()
+        self._cur.executemany(query, seq_params)
+        self._pending = [site, location, query, start, self._affected(query)]
+
+    def _affected(self, query):
+        # Reads are counted as rows are fetched; writes report affected rows up front
+        if query.lstrip()[:6].upper() == "SELECT":
+            return 0
+        return max(self._cur.rowcount, 0)
+
+    def _count(self, rows):
+        if self._pending:
+            self._pending[4] += rows
+
+    def fetchone(self):
+        row = self._cur.fetchone()
+        self._count(1 if row is not None else 0)
+        return row
+
+    def fetchmany(self, size=1):
+        rows = self._cur.fetchmany(size)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cur.fetchall()
+        self._count(len(rows))
+        return rows
+
+    def close(self):
+        self._finish()
+        self._cur.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+class InstrumentedConnection:
+    def __init__(self, conn, metrics):
+        self._conn = conn
+        self._metrics = metrics
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._metrics)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
@@ -0,0 +1,65 @@
+import operations
+from paging import PagedTree
+
+# ------------------ Inventory View Model ------------------
+# Applies the result of a single admin mutation (insert, delete or update of
+# one inventory row) straight to the Treeview instead of reloading the grid.
+# Every admin mutation bumps inventoryVersion.version in its own transaction;
+# if the version we get back is not exactly one past the version on screen,
+# another client changed the inventory and we fall back to a full refresh.
+# Rows are placed by the grid's current sort order; while a search is active
+# the grid is refreshed instead, since only the database knows what matches.
+
+class InventoryViewModel(PagedTree):
+    def __init__(self, *args, fetch_version=operations.fetch_inventory_version, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fetch_version = fetch_version
+        self.version = None
+
+    def fetch_first(self, conn, query):
+        # Read the version before the rows, so a change made in between is detected later
+        version = self.fetch_version(conn)
+        return version, super().fetch_first(conn, query)
+
+    def show_first_page(self, result):
+        self.version, rows = result
+        super().show_first_page(rows)
+
+    def _in_sync(self, version):
+        if self.version is not None and version == self.version + 1:
+            self.version = version
+            return True
+        self.reload()
+        return False
+
+    def _place(self, row):
+        if self.search:
+            # Whether the row matches is the database's call (collation, prefixes); ask it
+            self.reload()
+            return
+        items = self.tree.get_children()
+        keys = [self.key_of(item) for item in items]
+        key = self.row_key(row)
+        # Only show the row if it falls inside the window of rows currently loaded
+        if items and ((self.has_before and self.precedes(key, keys[0]))
+                      or (self.has_after and self.precedes(keys[-1], key))):
+            return
+        self.insert_row(sum(1 for other in keys if self.precedes(other, key)), row)
+
+    def apply_insert(self, version, row):
+        if self._in_sync(version):
+            self._place(row)
+
+    def apply_update(self, version, row):
+        if not self._in_sync(version) or not self.tree.exists(row[0]):
+            return
+        if self.row_key(row) == self.key_of(str(row[0])):
+            self.insert_row("end", row)
+        else:
+            # The change moves the row in the current sort order
+            self.delete_rows(row[0])
+            self._place(row)
+
+    def apply_delete(self, version, inventoryID):
+        if self._in_sync(version) and self.tree.exists(inventoryID):
+            self.delete_rows(inventoryID)
@@ -0,0 +1,96 @@
+import argparse
+import os
+import re
+
+# ------------------ Schema Migrations ------------------
+# Applies migrations/NNN_name.sql files in order on top of the base schema in
+# carRentalManagementSystemDataBase.sql. Applied versions are recorded in the
+# schemaMigrations table, so running this again only applies new files.
+# MySQL commits DDL implicitly, so each file is recorded once all of its
+# statements have run; keep migrations small and re-runnable where possible.
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+CREATE_MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schemaMigrations
+    (
+        version INT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        appliedAt DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def available_migrations(directory=MIGRATIONS_DIR):
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = re.match(r"(\d+)_(.+)\.sql$", filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    return migrations
+
+
+def split_statements(sql):
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def applied_versions(conn):
+    cur = conn.cursor()
+    try:
+        cur.execute(CREATE_MIGRATIONS_TABLE)
+        cur.execute("SELECT version FROM schemaMigrations")
+        return {row[0] for row in cur.fetchall()}
+    finally:
+        cur.close()
+
+
+def pending_migrations(conn, directory=MIGRATIONS_DIR):
+    applied = applied_versions(conn)
+    return [migration for migration in available_migrations(directory) if migration[0] not in applied]
+
+
+def migrate(conn, directory=MIGRATIONS_DIR, log=print):
+    applied = []
+    for version, name, path in pending_migrations(conn, directory):
+        with open(path, encoding="utf-8") as f:
+            statements = split_statements(f.read())
+        cur = conn.cursor()
+        try:
+            for statement in statements:
+                cur.execute(statement)
+            cur.execute("INSERT INTO schemaMigrations (version, name) VALUES (%s, %s)", (version, name))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+        log(f"Applied {version:03d}_{name}")
+        applied.append(version)
+    return applied
+
+
+def main():
+    from dotenv import load_dotenv
+    from db_pool import ConnectionPool
+
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--status", action="store_true", help="list pending migrations without applying them")
+    args = parser.parse_args()
+
+    load_dotenv()
+    pool = ConnectionPool.from_env()
+    if args.status:
+        pending = pool.run(pending_migrations)
+        for version, name, _ in pending:
+            print(f"pending {version:03d}_{name}")
+        if not pending:
+            print("Schema is up to date.")
+    else:
+        if not pool.run(migrate):
+            print("Schema is up to date.")
+    pool.close_all()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+-- Bumped by every admin change to the inventory so clients can tell
+-- whether their grid is still current
+CREATE TABLE IF NOT EXISTS inventoryVersion
+(
+    versionID TINYINT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT IGNORE INTO inventoryVersion (versionID, version) VALUES (1, 0);
@@ -0,0 +1,14 @@
+-- Covering indexes for the filters and sorts the app runs
+
+-- Available-cars grid: WHERE isAvailable = 1 AND inventoryID > ? ORDER BY inventoryID
+CREATE INDEX idx_carInventory_available ON carInventory (isAvailable, inventoryID, carID, pricePerDay);
+
+-- Return Car and Transaction Log: WHERE renterID = ?
+CREATE INDEX idx_rentedCars_renter ON rentedCars (renterID, rentDate, inventoryID, rentalCost, insuranceCost);
+
+-- Booking overlap check: WHERE inventoryID = ? AND rentDate < ? AND returnDate > ?
+CREATE INDEX idx_rentedCars_inventory_dates ON rentedCars (inventoryID, rentDate, returnDate);
+
+-- Transaction Log join and ORDER BY transactionDate
+CREATE INDEX idx_transactions_rental_date ON transactions (rentalID, transactionDate);
+CREATE INDEX idx_transactions_date ON transactions (transactionDate);
@@ -0,0 +1,4 @@
+-- Per-car row version, bumped by every rent, return and price change. Rent and
+-- return lock the car's row by bumping it, so the booking check that follows
+-- in the same statement or transaction sees every earlier booking of that car
+ALTER TABLE carInventory ADD COLUMN version INT NOT NULL DEFAULT 0;
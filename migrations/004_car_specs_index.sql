@@ -0,0 +1,3 @@
+-- View Specs and the grids' specs prefetch: WHERE inventoryID = ? / IN (...).
+-- Covering, so a lookup reads only the index (carSpecs has no primary key)
+CREATE INDEX idx_carSpecs_inventory ON carSpecs (inventoryID, horsepower, seatingCapacity, fuelEfficiency);
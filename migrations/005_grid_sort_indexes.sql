@@ -0,0 +1,14 @@
+-- Indexes for the grids' server-side sort orders and search (operations.SORT_KEYS / SEARCH_COLUMNS).
+-- Each leads with the sort column and ends with the key's unique tie-breaker, so a keyset page
+-- is one range scan in index order; the name, model and plate ones also serve prefix searches
+-- (carLicensePlate is already indexed by its UNIQUE constraint).
+CREATE INDEX idx_cars_name ON cars (carName, carLicensePlate);
+CREATE INDEX idx_cars_model ON cars (carModel, carLicensePlate);
+CREATE INDEX idx_cars_year ON cars (carModelYear, carLicensePlate);
+
+-- Sort by price, in the full and available-only grids
+CREATE INDEX idx_carInventory_price ON carInventory (pricePerDay, inventoryID);
+CREATE INDEX idx_carInventory_available_price ON carInventory (isAvailable, pricePerDay, inventoryID);
+
+-- Joining cars read in one of the orders above to their inventory rows
+CREATE INDEX idx_carInventory_car ON carInventory (carID, inventoryID, pricePerDay, isAvailable);
@@ -0,0 +1,31 @@
+-- Revenue and utilization aggregates for the admin reports, kept up to date by rent_car,
+-- return_car and remove_car in the same transaction as the rows they summarize.
+-- Revenue counts in the month a rental starts; booked days are split over the months they fall in.
+-- Backfill existing rentals after applying this with: python reporting.py --rebuild
+
+CREATE TABLE carRevenueMonthly
+(
+    inventoryID INT NOT NULL,
+    month DATE NOT NULL,
+    insuranceType ENUM('basic', 'standard', 'premium') NOT NULL,
+    rentals INT NOT NULL DEFAULT 0,
+    rentalRevenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+    insuranceRevenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+    bookedDays INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (inventoryID, month, insuranceType),
+    FOREIGN KEY (inventoryID) REFERENCES carInventory(inventoryID) ON DELETE CASCADE
+);
+
+-- Top cars for a month: WHERE month = ? GROUP BY inventoryID
+CREATE INDEX idx_carRevenueMonthly_month ON carRevenueMonthly (month, inventoryID, rentals, rentalRevenue, insuranceRevenue, bookedDays);
+
+CREATE TABLE fleetRevenueMonthly
+(
+    month DATE NOT NULL,
+    insuranceType ENUM('basic', 'standard', 'premium') NOT NULL,
+    rentals INT NOT NULL DEFAULT 0,
+    rentalRevenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    insuranceRevenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    bookedDays INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, insuranceType)
+);
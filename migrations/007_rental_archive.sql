@@ -0,0 +1,36 @@
+-- Cold storage for closed rentals: archive.py moves rentals closed more than ARCHIVE_AFTER_DAYS ago,
+-- with their transactions, out of rentedCars and transactions in batches, keeping their IDs.
+-- The Transaction Log and the revenue aggregate rebuild/check read both; everything else only
+-- deals with open rentals and reads the hot tables alone.
+-- (MySQL 8 keeps AUTO_INCREMENT counters across restarts, so archived IDs are never handed out again.)
+
+CREATE TABLE rentedCarsArchive
+(
+    rentalID INT PRIMARY KEY,
+    renterID INT NOT NULL,
+    inventoryID INT NOT NULL,
+    rentDate DATE NOT NULL,
+    returnDate DATE NOT NULL,
+    insuranceType ENUM('basic', 'standard', 'premium') NOT NULL,
+    insuranceCost DECIMAL(10,2) NOT NULL,
+    rentalCost DECIMAL(10,2) NOT NULL,
+    FOREIGN KEY (renterID) REFERENCES users(userID) ON DELETE CASCADE,
+    FOREIGN KEY (inventoryID) REFERENCES carInventory(inventoryID) ON DELETE CASCADE
+);
+
+CREATE TABLE transactionsArchive
+(
+    transactionID INT PRIMARY KEY,
+    rentalID INT NOT NULL,
+    transactionDate DATETIME,
+    FOREIGN KEY (rentalID) REFERENCES rentedCarsArchive(rentalID) ON DELETE CASCADE
+);
+
+-- Transaction Log: WHERE renterID = ?
+CREATE INDEX idx_rentedCarsArchive_renter ON rentedCarsArchive (renterID, inventoryID, rentalCost, insuranceCost);
+
+-- Aggregate rebuild/check: WHERE inventoryID BETWEEN ? AND ?
+CREATE INDEX idx_rentedCarsArchive_inventory ON rentedCarsArchive (inventoryID, rentDate, returnDate);
+
+-- Transaction Log join
+CREATE INDEX idx_transactionsArchive_rental_date ON transactionsArchive (rentalID, transactionDate);
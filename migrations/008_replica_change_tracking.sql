@@ -0,0 +1,19 @@
+-- Change tracking for local read replicas (replica.py). Every insert or update of a car, its
+-- inventory row or its specs sets changedAt = NOW(), and remove_car leaves a tombstone, so a
+-- replica pulls only the rows changed since its last sync. Existing rows keep the default and
+-- are copied by a replica's first, full sync.
+ALTER TABLE cars ADD COLUMN changedAt DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00';
+ALTER TABLE carInventory ADD COLUMN changedAt DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00';
+ALTER TABLE carSpecs ADD COLUMN changedAt DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00';
+
+CREATE INDEX idx_cars_changed ON cars (changedAt);
+CREATE INDEX idx_carInventory_changed ON carInventory (changedAt);
+CREATE INDEX idx_carSpecs_changed ON carSpecs (changedAt);
+
+CREATE TABLE carInventoryDeletes
+(
+    inventoryID INT PRIMARY KEY,
+    deletedAt DATETIME NOT NULL
+);
+
+CREATE INDEX idx_carInventoryDeletes_deleted ON carInventoryDeletes (deletedAt);
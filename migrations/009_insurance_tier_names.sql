@@ -0,0 +1,7 @@
+-- Insurance tiers come from the rate table (RATES_FILE, see pricing.py), not a fixed list, so
+-- the columns that store a tier take any name up to pricing.TIER_NAME_LENGTH characters.
+-- Existing 'basic', 'standard' and 'premium' values carry over unchanged.
+ALTER TABLE rentedCars MODIFY COLUMN insuranceType VARCHAR(20) NOT NULL;
+ALTER TABLE rentedCarsArchive MODIFY COLUMN insuranceType VARCHAR(20) NOT NULL;
+ALTER TABLE carRevenueMonthly MODIFY COLUMN insuranceType VARCHAR(20) NOT NULL;
+ALTER TABLE fleetRevenueMonthly MODIFY COLUMN insuranceType VARCHAR(20) NOT NULL;
@@ -0,0 +1,470 @@
+import os
+from calendar import monthrange
+from datetime import date
+from decimal import Decimal
+
+import reporting
+from hashing import HASHER
+from pricing import RATES
+
+# ------------------ Utility Functions ------------------
+# bcrypt runs in the hasher's worker processes (see hashing.py)
+def hash_password(password):
+    return HASHER.hash(password)
+
+class BookingConflict(Exception):
+    pass
+
+# ------------------ Database Operations ------------------
+# Each operation takes an open connection and runs on a DB worker thread,
+# never on the Tk event thread. Write operations commit before returning.
+
+INVENTORY_QUERY = """
+    SELECT ci.inventoryID, c.carName, c.carModel, c.carModelYear, c.carLicensePlate, ci.pricePerDay
+    FROM carInventory ci
+    JOIN cars c ON ci.carID = c.carID
+"""
+
+# Grid sort orders: (column, index in an INVENTORY_QUERY row) pairs, most significant first.
+# Each ends in a unique column, so a key identifies one row and works as a keyset cursor;
+# migrations/005 indexes every one of them.
+SORT_KEYS = {
+    "id": (("ci.inventoryID", 0),),
+    "name": (("c.carName", 1), ("c.carLicensePlate", 4)),
+    "model": (("c.carModel", 2), ("c.carLicensePlate", 4)),
+    "year": (("c.carModelYear", 3), ("c.carLicensePlate", 4)),
+    "plate": (("c.carLicensePlate", 4),),
+    "price": (("ci.pricePerDay", 5), ("ci.inventoryID", 0)),
+}
+
+# Columns the grids' search box matches by prefix
+SEARCH_COLUMNS = ("c.carName", "c.carModel", "c.carLicensePlate")
+
+ACTIVE_RENTALS_QUERY = """
+    SELECT r.rentalID, c.carName, c.carModel, c.carModelYear, (r.rentalCost + r.insuranceCost)
+    FROM rentedCars r
+    JOIN carInventory ci ON r.inventoryID = ci.inventoryID
+    JOIN cars c ON ci.carID = c.carID
+    WHERE r.renterID = %s AND r.rentDate <= CURDATE()
+      AND NOT EXISTS (SELECT 1 FROM transactions t WHERE t.rentalID = r.rentalID)
+"""
+
+# Claims a car for [rentDate, returnDate) in one statement: row-locks the car, then
+# matches only if it has no open booking overlapping that window (an overdue car is
+# still out), and, given the price the renter was quoted, only if the car still costs that.
+# Clears isAvailable if the booking starts today or earlier; the car lists don't rely on
+# that flag, they work out who is free today from the bookings (reservations.py).
+CLAIM_CAR_QUERY = """
+    UPDATE carInventory
+    SET isAvailable = CASE WHEN %s <= CURDATE() THEN 0 ELSE isAvailable END, version = version + 1,
+        changedAt = NOW()
+    WHERE inventoryID = %s AND (%s IS NULL OR pricePerDay = %s)
+      AND NOT EXISTS (
+          SELECT 1 FROM rentedCars r
+          WHERE r.inventoryID = carInventory.inventoryID AND r.rentDate < %s
+            AND GREATEST(r.returnDate, CURDATE()) > %s
+            AND NOT EXISTS (SELECT 1 FROM transactions t WHERE t.rentalID = r.rentalID))
+"""
+
+# The booking itself, priced by pricing.py from the price the car has under the lock above
+INSERT_BOOKING_QUERY = """
+    INSERT INTO rentedCars (renterID, inventoryID, rentDate, returnDate, insuranceType, insuranceCost, rentalCost)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+# Row-locks and frees the rental's car; serializes with bookings and other returns of it.
+# Given a renterID, matches only that renter's rental, and only once it has started.
+RELEASE_CAR_QUERY = """
+    UPDATE carInventory SET isAvailable = 1, version = version + 1, changedAt = NOW()
+    WHERE inventoryID = (
+        SELECT inventoryID FROM rentedCars
+        WHERE rentalID = %s AND (%s IS NULL OR (renterID = %s AND rentDate <= CURDATE())))
+"""
+
+# Closes the rental unless a transaction already did
+CLOSE_RENTAL_QUERY = """
+    INSERT INTO transactions (rentalID)
+    SELECT r.rentalID FROM rentedCars r
+    WHERE r.rentalID = %s AND NOT EXISTS (SELECT 1 FROM transactions t WHERE t.rentalID = r.rentalID)
+"""
+
+# Recent transactions and archived ones (see archive.py), newest first
+TRANSACTIONS_QUERY = """
+    SELECT t.transactionID, t.transactionDate, c.carName, c.carModel, c.carModelYear,
+           (r.rentalCost + r.insuranceCost) AS totalPaid
+    FROM transactions t
+    JOIN rentedCars r ON t.rentalID = r.rentalID
+    JOIN carInventory ci ON r.inventoryID = ci.inventoryID
+    JOIN cars c ON ci.carID = c.carID
+    WHERE r.renterID = %s
+    UNION ALL
+    SELECT t.transactionID, t.transactionDate, c.carName, c.carModel, c.carModelYear,
+           (r.rentalCost + r.insuranceCost) AS totalPaid
+    FROM transactionsArchive t
+    JOIN rentedCarsArchive r ON t.rentalID = r.rentalID
+    JOIN carInventory ci ON r.inventoryID = ci.inventoryID
+    JOIN cars c ON ci.carID = c.carID
+    WHERE r.renterID = %s
+    ORDER BY transactionDate DESC, transactionID DESC
+"""
+
+# Rows per chunk when a history view streams its rows
+HISTORY_CHUNK = 200
+
+# Admin reports: read only the aggregates in reporting.py, never the rental tables
+FLEET_REPORT_QUERY = """
+    SELECT month, SUM(rentals), SUM(rentalRevenue), SUM(insuranceRevenue), SUM(bookedDays)
+    FROM fleetRevenueMonthly
+    WHERE month >= %s AND month <= %s
+    GROUP BY month
+    ORDER BY month DESC
+"""
+
+INSURANCE_REPORT_QUERY = """
+    SELECT insuranceType, SUM(rentals), SUM(rentalRevenue), SUM(insuranceRevenue)
+    FROM fleetRevenueMonthly
+    WHERE month >= %s AND month <= %s
+    GROUP BY insuranceType
+    ORDER BY insuranceType
+"""
+
+TOP_CARS_QUERY = """
+    SELECT r.inventoryID, c.carName, c.carModel, c.carLicensePlate, SUM(r.rentals),
+           SUM(r.rentalRevenue + r.insuranceRevenue) AS revenue, SUM(r.bookedDays)
+    FROM carRevenueMonthly r
+    JOIN carInventory ci ON r.inventoryID = ci.inventoryID
+    JOIN cars c ON ci.carID = c.carID
+    WHERE r.month = %s
+    GROUP BY r.inventoryID, c.carName, c.carModel, c.carLicensePlate
+    ORDER BY revenue DESC
+    LIMIT %s
+"""
+
+def fetch_all(conn, query, params=()):
+    cur = conn.cursor()
+    try:
+        cur.execute(query, params)
+        return cur.fetchall()
+    finally:
+        cur.close()
+
+def stream(conn, query, params=(), size=HISTORY_CHUNK):
+    """Yield the result in lists of up to size rows, read with fetchmany so only one chunk is held at a time."""
+    cur = conn.cursor()
+    try:
+        cur.execute(query, params)
+        while True:
+            rows = cur.fetchmany(size)
+            if not rows:
+                return
+            yield rows
+    except GeneratorExit:
+        # Stopped early: read out the rest, or the connection refuses its next query
+        while cur.fetchmany(size):
+            pass
+        raise
+    finally:
+        cur.close()
+
+def fetch_one(conn, query, params=()):
+    cur = conn.cursor()
+    try:
+        cur.execute(query, params)
+        return cur.fetchone()
+    finally:
+        cur.close()
+
+def ping(conn):
+    fetch_one(conn, "SELECT 1")
+
+def driver_error(conn, name="Error"):
+    """Exception class `name` of conn's driver: its Connection.<name> (DB-API extension), else MySQL's."""
+    error = getattr(conn, name, None)
+    if error is None:
+        import mysql.connector  # not at module level, so the app can start without loading it
+        error = getattr(mysql.connector, name)
+    return error
+
+def fetch_rates():
+    # This desk's own RATES_FILE; desks that book directly must all load the same one
+    return RATES.table
+
+def fetch_login(conn, username):
+    return fetch_one(conn, "SELECT userID, password, role FROM users WHERE userName = %s", (username,))
+
+def verify_login(result, password):
+    """Turn a fetch_login row into (status, userID, role, upgraded hash or None).
+
+    bcrypt runs here, off the connection. A hash made with an outdated work
+    factor comes back re-hashed at the configured one, to be stored.
+    """
+    if not result:
+        return "no_user", None, None, None
+    userID, hashed_pw, role = result
+    ok, upgraded = HASHER.verify(password, hashed_pw)
+    if not ok:
+        return "bad_password", None, None, None
+    return "ok", userID, role, upgraded
+
+def store_password_hash(conn, userID, hashed):
+    cur = conn.cursor()
+    try:
+        cur.execute("UPDATE users SET password = %s WHERE userID = %s", (hashed, userID))
+        conn.commit()
+    finally:
+        cur.close()
+
+def authenticate(conn, username, password):
+    """Return (status, userID, role) where status is 'ok', 'no_user' or 'bad_password'."""
+    status, userID, role, upgraded = verify_login(fetch_login(conn, username), password)
+    if upgraded:
+        store_password_hash(conn, userID, upgraded)
+    return status, userID, role
+
+def signup_role(username, password):
+    # Give admin role if username/password match admin settings
+    admin_username = os.getenv("DB_ADMIN_USERNAME")
+    admin_password = os.getenv("DB_ADMIN_PASSWORD")
+    if admin_username and username.startswith(admin_username) and password == admin_password:
+        return 'admin'
+    return 'user'
+
+def create_user(conn, username, email, password):
+    insert_user(conn, username, email, hash_password(password), signup_role(username, password))
+
+def insert_user(conn, username, email, hashed, role):
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "INSERT INTO users (userName, email, password, role) VALUES (%s, %s, %s, %s)",
+            (username, email, hashed, role)
+        )
+        conn.commit()
+    finally:
+        cur.close()
+
+def sort_key(row, sort="id"):
+    """Keyset cursor of an inventory row under the given sort: its SORT_KEYS values."""
+    return tuple(row[index] for _, index in SORT_KEYS[sort])
+
+def keyset_condition(columns, key, op):
+    # (a, b) > (x, y) spelled out as a > x OR (a = x AND b > y), which both MySQL and SQLite turn into a range scan
+    if not isinstance(key, (tuple, list)):
+        key = (key,)
+    column, rest = columns[0], columns[1:]
+    if not rest:
+        return f"{column} {op} %s", [key[0]]
+    inner, params = keyset_condition(rest, key[1:], op)
+    return f"({column} {op} %s OR ({column} = %s AND {inner}))", [key[0], key[0]] + params
+
+def search_condition(search):
+    # Prefix match, so each column's index can serve it; ! escapes LIKE wildcards typed by the user
+    pattern = search.replace("!", "!!").replace("%", "!%").replace("_", "!_") + "%"
+    return " OR ".join(f"{column} LIKE %s ESCAPE '!'" for column in SEARCH_COLUMNS), [pattern] * len(SEARCH_COLUMNS)
+
+def fetch_inventory_page(conn, after=None, before=None, limit=200, available_only=False,
+                         search=None, sort="id", descending=False):
+    """One page of inventory rows in sort order; after/before are sort_key() cursors.
+
+    Keyset pagination on the sort key: each page is an index range scan, not
+    an OFFSET, and a search narrows the rows with indexed prefix matches.
+    """
+    columns = [column for column, _ in SORT_KEYS[sort]]
+    conditions, params = [], []
+    if available_only:
+        conditions.append("ci.isAvailable = 1")
+    if search:
+        condition, search_params = search_condition(search)
+        conditions.append(f"({condition})")
+        params.extend(search_params)
+    if after is not None:
+        condition, key_params = keyset_condition(columns, after, "<" if descending else ">")
+        conditions.append(condition)
+        params.extend(key_params)
+    if before is not None:
+        condition, key_params = keyset_condition(columns, before, ">" if descending else "<")
+        conditions.append(condition)
+        params.extend(key_params)
+    query = INVENTORY_QUERY
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    # Paging backwards reads the index in the opposite direction, then flips the page
+    direction = "DESC" if descending != (before is not None) else "ASC"
+    query += " ORDER BY " + ", ".join(f"{column} {direction}" for column in columns) + " LIMIT %s"
+    params.append(limit)
+    rows = fetch_all(conn, query, tuple(params))
+    if before is not None:
+        rows.reverse()
+    return rows
+
+def fetch_available_page(conn, after=None, before=None, limit=200, search=None, sort="id", descending=False):
+    return fetch_inventory_page(conn, after, before, limit, available_only=True,
+                                search=search, sort=sort, descending=descending)
+
+def fetch_inventory_version(conn):
+    return fetch_one(conn, "SELECT version FROM inventoryVersion WHERE versionID = 1")[0]
+
+def bump_inventory_version(cur):
+    # The UPDATE row-locks the counter until commit, so versions are handed out in order
+    cur.execute("UPDATE inventoryVersion SET version = version + 1 WHERE versionID = 1")
+    cur.execute("SELECT version FROM inventoryVersion WHERE versionID = 1")
+    return cur.fetchone()[0]
+
+def fetch_inventory_row(cur, inventoryID):
+    cur.execute(INVENTORY_QUERY + " WHERE ci.inventoryID = %s", (inventoryID,))
+    return cur.fetchone()
+
+def add_car(conn, carName, model, year, plate, price, hp, seat, fuel):
+    cur = conn.cursor()
+    try:
+        cur.execute("INSERT INTO cars (carName, carModel, carModelYear, carLicensePlate, changedAt) "
+                    "VALUES (%s, %s, %s, %s, NOW())", (carName, model, year, plate))
+        carID = cur.lastrowid
+        cur.execute("INSERT INTO carInventory (carID, pricePerDay, isAvailable, changedAt) VALUES (%s, %s, 1, NOW())",
+                    (carID, price))
+        inventoryID = cur.lastrowid
+        cur.execute("INSERT INTO carSpecs (inventoryID, horsepower, seatingCapacity, fuelEfficiency, changedAt) "
+                    "VALUES (%s, %s, %s, %s, NOW())", (inventoryID, hp, seat, fuel))
+        version = bump_inventory_version(cur)
+        row = fetch_inventory_row(cur, inventoryID)
+        conn.commit()
+        return version, row
+    finally:
+        cur.close()
+
+def remove_car(conn, inventoryID):
+    cur = conn.cursor()
+    try:
+        # Lock the car first, so no booking or return changes its totals while they leave the fleet's
+        cur.execute("SELECT inventoryID FROM carInventory WHERE inventoryID = %s FOR UPDATE", (inventoryID,))
+        cur.fetchall()
+        reporting.forget_car(cur, inventoryID)
+        cur.execute("DELETE FROM carInventory WHERE inventoryID = %s", (inventoryID,))
+        # Tombstone for read replicas (see replica.py)
+        cur.execute("INSERT INTO carInventoryDeletes (inventoryID, deletedAt) VALUES (%s, NOW())", (inventoryID,))
+        version = bump_inventory_version(cur)
+        conn.commit()
+        return version
+    finally:
+        cur.close()
+
+def update_price(conn, inventoryID, new_cost):
+    cur = conn.cursor()
+    try:
+        cur.execute("UPDATE carInventory SET pricePerDay = %s, version = version + 1, changedAt = NOW() "
+                    "WHERE inventoryID = %s", (new_cost, inventoryID))
+        version = bump_inventory_version(cur)
+        row = fetch_inventory_row(cur, inventoryID)
+        conn.commit()
+        return version, row
+    finally:
+        cur.close()
+
+def fetch_specs(conn, inventoryID):
+    return fetch_one(conn, "SELECT horsepower, seatingCapacity, fuelEfficiency FROM carSpecs WHERE inventoryID = %s",
+                     (inventoryID,))
+
+def fetch_specs_batch(conn, inventoryIDs):
+    """Specs for many cars in one round trip, as {inventoryID: (horsepower, seating, fuel)}."""
+    ids = list(inventoryIDs)
+    if not ids:
+        return {}
+    marks = ", ".join(["%s"] * len(ids))
+    rows = fetch_all(conn, "SELECT inventoryID, horsepower, seatingCapacity, fuelEfficiency FROM carSpecs "
+                           f"WHERE inventoryID IN ({marks})", tuple(ids))
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+# Rent and return are each one short transaction, but not one round trip: rent is the claim
+# (and a price read if no quote was given), the insert, two aggregate upserts and the commit;
+# return is the release, the close, a read of the rental, its returnDate update, two upserts
+# and the commit. Each write depends on the row count of the one before, which a single
+# multi-statement call can only express inside a stored procedure, and the SQLite stand-in
+# has none. bench_rent_contention.py reports the round trips each one takes.
+def rent_car(conn, renterID, inventoryID, rentDate, returnDate, insuranceType, pricePerDay=None):
+    """Book a car; pricePerDay is the price the renter was quoted, and the booking fails if it has changed.
+
+    Without it the car is charged at its current price, read under the claim's row lock.
+    """
+    # The first statement locks the car's row and checks for an overlapping booking,
+    # so two desks can never book the same car for the same days
+    quoted = None if pricePerDay is None else Decimal(str(pricePerDay))
+    cur = conn.cursor()
+    try:
+        cur.execute(CLAIM_CAR_QUERY, (rentDate, inventoryID, quoted, quoted, returnDate, rentDate))
+        if cur.rowcount != 1:
+            conn.rollback()
+            if quoted is not None:
+                current = fetch_one(conn, "SELECT pricePerDay FROM carInventory WHERE inventoryID = %s",
+                                    (inventoryID,))
+                if current and Decimal(str(current[0])) != quoted:
+                    raise BookingConflict("The price of this car has changed; refresh to see the new one.")
+            raise BookingConflict("This car is already booked for part of that period.")
+        if quoted is None:
+            cur.execute("SELECT pricePerDay FROM carInventory WHERE inventoryID = %s", (inventoryID,))
+            quoted = cur.fetchone()[0]
+        rentalCost, insuranceCost = RATES.quote(quoted, rentDate, returnDate, insuranceType)
+        cur.execute(INSERT_BOOKING_QUERY, (renterID, inventoryID, rentDate, returnDate, insuranceType,
+                                           insuranceCost, rentalCost))
+        rentalID = cur.lastrowid
+        reporting.record_rental(cur, inventoryID, insuranceType, rentDate, returnDate, rentalCost, insuranceCost)
+        conn.commit()
+        return rentalID
+    finally:
+        cur.close()
+
+def fetch_active_rentals(conn, renterID):
+    return fetch_all(conn, ACTIVE_RENTALS_QUERY, (renterID,))
+
+def return_car(conn, rentalID, renterID=None):
+    """Close a rental; with renterID, only if it is that renter's and has started (the desk's own returns)."""
+    cur = conn.cursor()
+    try:
+        cur.execute(RELEASE_CAR_QUERY, (rentalID, renterID, renterID))
+        if cur.rowcount != 1:
+            conn.rollback()
+            raise BookingConflict("This rental no longer exists." if renterID is None
+                                  else "No rental of yours with that ID is out.")
+        cur.execute(CLOSE_RENTAL_QUERY, (rentalID,))
+        if cur.rowcount != 1:
+            conn.rollback()
+            raise BookingConflict("This car has already been returned.")
+        cur.execute("SELECT inventoryID, insuranceType, rentDate, returnDate FROM rentedCars WHERE rentalID = %s",
+                    (rentalID,))
+        inventoryID, insuranceType, rentDate, planned = cur.fetchone()
+        returned = date.today()
+        cur.execute("UPDATE rentedCars SET returnDate = %s WHERE rentalID = %s", (returned, rentalID))
+        reporting.record_return(cur, inventoryID, insuranceType, rentDate, planned, returned)
+        conn.commit()
+    finally:
+        cur.close()
+
+def fetch_transactions(conn, renterID):
+    return fetch_all(conn, TRANSACTIONS_QUERY, (renterID, renterID))
+
+def iter_transactions(conn, renterID, size=HISTORY_CHUNK):
+    # A generator of its own, so instrumentation credits the query to this function
+    yield from stream(conn, TRANSACTIONS_QUERY, (renterID, renterID), size)
+
+def months_ago(months):
+    """First day of the month `months` months before this one."""
+    index = date.today().year * 12 + date.today().month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+def fetch_revenue_report(conn, months=12):
+    """Fleet revenue for this month and the months before it: (monthly rows, per insurance type rows).
+
+    Monthly rows are (month, rentals, rental revenue, insurance revenue,
+    booked days, utilization), utilization being booked days over the
+    current fleet's car-days in that month.
+    """
+    start, end = months_ago(months - 1), months_ago(0)
+    fleet_size = fetch_one(conn, "SELECT COUNT(*) FROM carInventory")[0]
+    monthly = [(month, rentals, rentalRevenue, insuranceRevenue, days,
+                days / (fleet_size * monthrange(month.year, month.month)[1]) if fleet_size else 0)
+               for month, rentals, rentalRevenue, insuranceRevenue, days in fetch_all(conn, FLEET_REPORT_QUERY,
+                                                                                      (start, end))]
+    return monthly, fetch_all(conn, INSURANCE_REPORT_QUERY, (start, end))
+
+def fetch_top_cars(conn, month, limit=20):
+    """Highest-earning cars in a month: (inventoryID, name, model, plate, rentals, revenue, booked days)."""
+    return fetch_all(conn, TOP_CARS_QUERY, (month, limit))
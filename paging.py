@@ -0,0 +1,197 @@
+import os
+
+# ------------------ Paged Treeview ------------------
+# Keeps a bounded window of rows in a Treeview and fetches keyset pages
+# (WHERE key > last ORDER BY key LIMIT n) as the user scrolls toward either
+# edge. Rows scrolled far out of view are dropped so memory stays flat no
+# matter how large the underlying table is.
+#
+# Sorting and searching happen in the database too: clicking a sortable
+# heading or typing in a search box reloads the grid from the first page of
+# the new order. Typing is debounced, so a burst of keys runs one query.
+#
+# Settings (.env): GRID_PAGE_SIZE, GRID_PREFETCH_ROWS, GRID_MAX_ROWS,
+# GRID_SEARCH_DELAY_MS (pause in typing before searching, default 300).
+
+
+class PagedTree:
+    def __init__(self, tree, scrollbar, executor, fetch_page, label="Loading...",
+                 page_size=None, prefetch=None, max_rows=None, sort_key=None, search_delay_ms=None):
+        # fetch_page(conn, after, before, limit) returns rows in key order. With a sort_key(row, sort)
+        # function the grid is sortable and searchable, and fetch_page also takes search, sort and
+        # descending keywords, with after/before given as sort_key() values.
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.executor = executor
+        self.fetch_page = fetch_page
+        self.label = label
+        self.page_size = page_size or int(os.getenv("GRID_PAGE_SIZE", "200"))
+        self.prefetch = prefetch or int(os.getenv("GRID_PREFETCH_ROWS", "50"))
+        max_rows = max_rows or int(os.getenv("GRID_MAX_ROWS", "1000"))
+        self.max_rows = max(max_rows, 2 * self.page_size)
+        self.sort_key = sort_key
+        self.search_delay_ms = search_delay_ms or int(os.getenv("GRID_SEARCH_DELAY_MS", "300"))
+
+        self.search = ""
+        self.sort = "id"
+        self.descending = False
+        self.headings = {}  # column -> sort name, for the sortable headings
+        self.has_before = False
+        self.has_after = False
+        # Called with every page of rows put on screen, e.g. to prefetch details for them
+        self.page_listeners = []
+        self._job = None
+        self._generation = 0
+        self._search_id = None
+        self._keys = {}  # item -> key of its row, as fetched (the Treeview stringifies values)
+        tree.configure(yscrollcommand=self._on_scroll)
+
+    @property
+    def query(self):
+        if self.sort_key is None:
+            return {}
+        return {"search": self.search or None, "sort": self.sort, "descending": self.descending}
+
+    def row_key(self, row):
+        return row[0] if self.sort_key is None else self.sort_key(row, self.sort)
+
+    def key_of(self, item):
+        return self._keys[item]
+
+    def precedes(self, key, other):
+        return key > other if self.descending else key < other
+
+    def insert_row(self, index, row):
+        # Rows are keyed by their first column so they can be found again by ID
+        if self.tree.exists(row[0]):
+            self.tree.item(row[0], values=row)
+        else:
+            self.tree.insert('', index, iid=row[0], values=row)
+        self._keys[str(row[0])] = self.row_key(row)
+
+    def delete_rows(self, *items):
+        self.tree.delete(*items)
+        for item in items:
+            self._keys.pop(str(item), None)
+
+    def fetch_first(self, conn, query):
+        return self.fetch_page(conn, None, None, self.page_size, **query)
+
+    def show_first_page(self, rows):
+        self.delete_rows(*self.tree.get_children())
+        for row in rows:
+            self.insert_row('end', row)
+        self.has_before = False
+        self.has_after = len(rows) == self.page_size
+        self.tree.yview_moveto(0)
+        self._notify_page(rows)
+
+    def _notify_page(self, rows):
+        for listener in self.page_listeners:
+            listener(rows)
+
+    @property
+    def loading(self):
+        # A cancelled job never calls back, so it no longer blocks the next fetch
+        return self._job is not None and not self._job.cancelled
+
+    def sortable(self, headings):
+        """Make the given column headings ({column: sort name}) sort the grid when clicked."""
+        self.headings = headings
+        for column, sort in headings.items():
+            self.tree.heading(column, command=lambda sort=sort: self.sort_by(sort))
+
+    def sort_by(self, sort):
+        # Clicking the sorted column again flips the direction
+        self.descending = not self.descending if sort == self.sort else False
+        self.sort = sort
+        for column, name in self.headings.items():
+            arrow = (" \u25bc" if self.descending else " \u25b2") if name == sort else ""
+            self.tree.heading(column, text=column + arrow)
+        self.reload()
+
+    def search_later(self, text):
+        """Search for text once the user pauses typing; call on every keystroke."""
+        if self._search_id is not None:
+            self.tree.after_cancel(self._search_id)
+        self._search_id = self.tree.after(self.search_delay_ms, lambda: self._apply_search(text.strip()))
+
+    def _apply_search(self, text):
+        self._search_id = None
+        if text != self.search:
+            self.search = text
+            self.reload()
+
+    def reload(self):
+        self._generation += 1
+        generation = self._generation
+        query = self.query
+        self._job = self.executor.submit(lambda conn: self.fetch_first(conn, query),
+                                         on_success=lambda result: self._on_first_page(generation, result),
+                                         on_error=lambda err: self._on_failed(generation, err),
+                                         label=self.label)
+
+    def _on_first_page(self, generation, result):
+        if generation != self._generation:
+            return
+        self._job = None
+        self.show_first_page(result)
+
+    def _on_failed(self, generation, err):
+        if generation == self._generation:
+            self._job = None
+        if self.executor.default_error:
+            self.executor.default_error(err)
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.loading:
+            return
+        items = self.tree.get_children()
+        if not items:
+            return
+        first, last = float(first), float(last)
+        if self.has_after and (1.0 - last) * len(items) <= self.prefetch:
+            self._fetch(after=self.key_of(items[-1]))
+        elif self.has_before and first * len(items) <= self.prefetch:
+            self._fetch(before=self.key_of(items[0]))
+
+    def _fetch(self, after=None, before=None):
+        generation = self._generation
+        query = self.query
+        self._job = self.executor.submit(lambda conn: self.fetch_page(conn, after, before, self.page_size, **query),
+                                         on_success=lambda rows: self._on_page(generation, rows, before is not None),
+                                         on_error=lambda err: self._on_failed(generation, err),
+                                         label=self.label)
+
+    def _on_page(self, generation, rows, backward):
+        if generation != self._generation:
+            return
+        self._job = None
+        items = self.tree.get_children()
+        top = int(float(self.tree.yview()[0]) * len(items)) if items else 0
+
+        if backward:
+            self.has_before = len(rows) == self.page_size
+            for row in reversed(rows):
+                self.insert_row(0, row)
+            top += len(rows)
+            excess = len(items) + len(rows) - self.max_rows
+            if excess > 0:
+                self.delete_rows(*self.tree.get_children()[-excess:])
+                self.has_after = True
+        else:
+            self.has_after = len(rows) == self.page_size
+            for row in rows:
+                self.insert_row('end', row)
+            excess = len(items) + len(rows) - self.max_rows
+            if excess > 0:
+                self.delete_rows(*self.tree.get_children()[:excess])
+                self.has_before = True
+                top -= excess
+
+        # Keep the rows the user was looking at in place after inserting or trimming
+        total = len(self.tree.get_children())
+        if total:
+            self.tree.yview_moveto(max(top, 0) / total)
+        self._notify_page(rows)
@@ -0,0 +1,169 @@
+import json
+import os
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+# ------------------ Pricing and Quotes ------------------
+# A rental costs pricePerDay times the sum of each day's multiplier, plus a
+# flat per-day rate for the insurance tier. A day's multiplier is the weekend
+# multiplier on weekend days times the multiplier of any season it falls in.
+# The rates live in a JSON file (RATES_FILE in .env, see rates.example.json);
+# without one, every multiplier is 1, which is plain pricePerDay x days.
+#
+# Multipliers are held in basis points (1.25 -> 12500) and prices in cents,
+# so a window's multiplier is an exact integer sum and a batch quote rounds
+# exactly as a booking does. quote_batch prices many cars across many
+# windows and tiers in one NumPy pass: a window's multiplier does not depend
+# on the car, so every quote is an outer product of price and multiplier.
+# NumPy is imported on first batch quote, not at startup.
+
+BP = 10000
+# Longest tier name the insuranceType columns hold (migration 009)
+TIER_NAME_LENGTH = 20
+DEFAULT_INSURANCE = {"basic": 10, "standard": 20, "premium": 30}
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def to_bp(multiplier):
+    return int((Decimal(str(multiplier)) * BP).to_integral_value(ROUND_HALF_UP))
+
+def to_cents(amount):
+    return int((Decimal(str(amount)) * 100).to_integral_value(ROUND_HALF_UP))
+
+def month_day(text):
+    # "06-15" -> (6, 15)
+    month, day = text.split("-")
+    return int(month), int(day)
+
+
+class RateTable:
+    def __init__(self, insurance=None, weekend_days=("sat", "sun"), weekend_multiplier=1, seasons=()):
+        # Tier names are matched lowercase, as the rent dialog reads them
+        self.insurance = {}
+        for tier, rate in (insurance or DEFAULT_INSURANCE).items():
+            tier = tier.strip().lower()
+            if len(tier) > TIER_NAME_LENGTH:
+                raise ValueError(f"Insurance tier name {tier!r} is longer than {TIER_NAME_LENGTH} characters")
+            if tier in self.insurance:
+                raise ValueError(f"Insurance tier {tier!r} is defined twice")
+            self.insurance[tier] = Decimal(str(rate))
+        self.weekend_days = [day.lower()[:3] for day in weekend_days]
+        self.weekend_multiplier = Decimal(str(weekend_multiplier))
+        # Seasons are month-day ranges, inclusive; one may wrap the new year (e.g. 12-20 to 01-05)
+        self.seasons = [dict(season, multiplier=Decimal(str(season["multiplier"]))) for season in seasons]
+        self._weekend = {WEEKDAYS.index(day) for day in self.weekend_days}
+        self._weekend_bp = to_bp(weekend_multiplier)
+        self._seasons = [(month_day(season["from"]), month_day(season["to"]), to_bp(season["multiplier"]))
+                         for season in self.seasons]
+        self._days = {}  # date -> multiplier in basis points
+
+    @classmethod
+    def from_dict(cls, data):
+        weekend = data.get("weekend", {})
+        return cls(data.get("insurance"), weekend.get("days", ("sat", "sun")), weekend.get("multiplier", 1),
+                   data.get("seasons", ()))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_env(cls):
+        path = os.getenv("RATES_FILE")
+        return cls.load(path) if path else cls()
+
+    def to_dict(self):
+        return {"insurance": {tier: str(rate) for tier, rate in self.insurance.items()},
+                "weekend": {"days": self.weekend_days, "multiplier": str(self.weekend_multiplier)},
+                "seasons": [dict(season, multiplier=str(season["multiplier"])) for season in self.seasons]}
+
+    def day_multiplier(self, day):
+        """The day's multiplier in basis points."""
+        bp = self._days.get(day)
+        if bp is None:
+            bp = self._weekend_bp if day.weekday() in self._weekend else BP
+            key = (day.month, day.day)
+            for start, end, season_bp in self._seasons:
+                if (start <= key <= end) if start <= end else (key >= start or key <= end):
+                    bp = (bp * season_bp + BP // 2) // BP
+            self._days[day] = bp
+        return bp
+
+    def multiplier_days(self, start, end):
+        """Sum of the day multipliers over [start, end), in basis points; pricePerDay times this / BP is the rent."""
+        return sum(self.day_multiplier(start + timedelta(days=i)) for i in range((end - start).days))
+
+    def insurance_cost(self, tier, days):
+        return self.insurance[tier] * days
+
+    def quote(self, pricePerDay, start, end, tier):
+        """(rental cost, insurance cost) of one car for [start, end), as Decimals."""
+        cents = (to_cents(pricePerDay) * self.multiplier_days(start, end) + BP // 2) // BP
+        return Decimal(cents) / 100, self.insurance_cost(tier, (end - start).days)
+
+
+class Quotes:
+    """Batch quote result, in cents: rental[car, window] and insurance[window, tier]."""
+
+    def __init__(self, rental, insurance, tiers):
+        self.rental = rental
+        self.insurance = insurance
+        self.tiers = list(tiers)
+
+    def total(self, tier):
+        """Total cost of every car for every window with the given tier, shape (cars, windows)."""
+        return self.rental + self.insurance[:, self.tiers.index(tier)]
+
+    def totals(self):
+        """Total cost for every car, window and tier, shape (cars, windows, tiers)."""
+        return self.rental[:, :, None] + self.insurance[None, :, :]
+
+
+def quote_batch(rates, prices, windows, tiers=None):
+    """Quote every car in `prices` (per-day prices; an integer NumPy array is taken as cents) for every
+    (start, end) window in `windows` and every insurance tier, in one vectorized pass."""
+    import numpy as np
+
+    tiers = list(tiers or rates.insurance)
+    if isinstance(prices, np.ndarray) and prices.dtype.kind in "iu":
+        cents = prices.astype(np.int64)
+    else:
+        cents = np.array([to_cents(price) for price in prices], dtype=np.int64)
+    if not windows:
+        return Quotes(np.zeros((len(cents), 0), np.int64), np.zeros((0, len(tiers)), np.int64), tiers)
+
+    # Multiplier of every day the windows touch, then each window's sum as a difference of prefix sums
+    first = min(start for start, _ in windows)
+    last = max(end for _, end in windows)
+    span = max((last - first).days, 0)
+    days = np.array([rates.day_multiplier(first + timedelta(days=i)) for i in range(span)], dtype=np.int64)
+    prefix = np.concatenate(([0], np.cumsum(days)))
+    starts = np.array([(start - first).days for start, _ in windows])
+    ends = np.array([max((end - first).days, (start - first).days) for start, end in windows])
+    window_bp = prefix[ends] - prefix[starts]
+
+    rental = (cents[:, None] * window_bp[None, :] + BP // 2) // BP
+    tier_cents = np.array([to_cents(rates.insurance[tier]) for tier in tiers], dtype=np.int64)
+    insurance = (ends - starts)[:, None] * tier_cents[None, :]
+    return Quotes(rental, insurance, tiers)
+
+
+def warm_up():
+    """Import NumPy ahead of the first batch quote; call it off the UI thread."""
+    import numpy
+
+
+# Process-wide rate table; configure_from_env() loads RATES_FILE
+class _Rates:
+    def __init__(self):
+        self.table = RateTable()
+
+    def configure_from_env(self):
+        self.table = RateTable.from_env()
+
+    def __getattr__(self, name):
+        return getattr(self.table, name)
+
+
+RATES = _Rates()
@@ -0,0 +1,220 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import operations
+
+# ------------------ Local Read Replica ------------------
+# An optional embedded SQLite copy of cars, carInventory and carSpecs that
+# serves the User panel's browse and spec reads without a round trip to the
+# server. Writes still go to the primary. A background thread syncs it every
+# REPLICA_SYNC_INTERVAL seconds, pulling only the rows whose changedAt is at or
+# after its watermark, plus tombstones for removed cars (migrations/008).
+#
+# The watermark is the primary's clock when the last sync started. changedAt
+# is the time the writing statement ran, which can be a little before its
+# transaction commits, so every sync reaches back `lookback` before it; rows
+# already copied are upserted again, which is harmless. Children are read
+# before parents (specs, inventory rows, cars), so every row copied has its
+# parents in the same sync or an earlier one.
+#
+# Reads go to the replica only while its last sync started less than
+# REPLICA_MAX_STALENESS seconds ago. Older data, or a replica this desk has
+# written through since (see written()), sends them to the primary instead.
+
+EPOCH = datetime(1970, 1, 1)
+# Longer than a write can wait on row locks (innodb_lock_wait_timeout, 50 s) before it commits
+LOOKBACK = timedelta(seconds=60)
+SYNC_CHUNK = 1000
+REPLICA_TABLES = ("cars", "carInventory", "carSpecs")
+
+CHANGED_SPECS_QUERY = """
+    SELECT inventoryID, horsepower, seatingCapacity, fuelEfficiency, changedAt FROM carSpecs WHERE changedAt >= %s
+"""
+
+CHANGED_INVENTORY_QUERY = """
+    SELECT inventoryID, carID, pricePerDay, isAvailable, version, changedAt FROM carInventory WHERE changedAt >= %s
+"""
+
+CHANGED_CARS_QUERY = """
+    SELECT carID, carName, carModel, carModelYear, carLicensePlate, changedAt FROM cars WHERE changedAt >= %s
+"""
+
+DELETED_QUERY = "SELECT inventoryID, deletedAt FROM carInventoryDeletes WHERE deletedAt >= %s"
+
+UPSERT_CARS_QUERY = """
+    INSERT INTO cars (carID, carName, carModel, carModelYear, carLicensePlate, changedAt) VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE carName = VALUES(carName), carModel = VALUES(carModel),
+        carModelYear = VALUES(carModelYear), carLicensePlate = VALUES(carLicensePlate), changedAt = VALUES(changedAt)
+"""
+
+UPSERT_INVENTORY_QUERY = """
+    INSERT INTO carInventory (inventoryID, carID, pricePerDay, isAvailable, version, changedAt)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE carID = VALUES(carID), pricePerDay = VALUES(pricePerDay),
+        isAvailable = VALUES(isAvailable), version = VALUES(version), changedAt = VALUES(changedAt)
+"""
+
+INSERT_SPECS_QUERY = """
+    INSERT INTO carSpecs (inventoryID, horsepower, seatingCapacity, fuelEfficiency, changedAt) VALUES (%s, %s, %s, %s, %s)
+"""
+
+CREATE_STATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS replicaState (stateID INT PRIMARY KEY, watermark DATETIME NOT NULL)
+"""
+
+
+def in_list(ids):
+    return ", ".join(["%s"] * len(ids))
+
+def primary_now(conn):
+    now = operations.fetch_one(conn, "SELECT NOW()")[0]
+    # The SQLite stand-in hands back the function's result as text
+    return datetime.fromisoformat(now) if isinstance(now, str) else now
+
+
+class Replica:
+    def __init__(self, path, primary, sync_interval=5, max_staleness=30, lookback=LOOKBACK):
+        self.path = path
+        self.primary = primary
+        self.sync_interval = sync_interval
+        self.max_staleness = max_staleness
+        self.lookback = lookback
+        self.local = None
+        self.watermark = None    # primary's clock when the last successful sync started
+        self.synced_at = None    # monotonic start time of the last successful sync
+        self.written_at = None   # monotonic time of this desk's last write through the primary
+        self.last_error = None
+        self._sync_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+
+    @classmethod
+    def from_env(cls, primary):
+        """The replica configured in .env, or None if REPLICA_PATH is not set."""
+        path = os.getenv("REPLICA_PATH")
+        if not path:
+            return None
+        return cls(path, primary,
+                   sync_interval=float(os.getenv("REPLICA_SYNC_INTERVAL", "5")),
+                   max_staleness=float(os.getenv("REPLICA_MAX_STALENESS", "30")))
+
+    # ------------------ Sync ------------------
+    def open(self):
+        # Its own connection per thread, so browsing reads while a sync writes
+        from sqlite_backend import SQLitePool
+        self.local = SQLitePool(self.path, per_thread=True)
+        self.watermark = self.local.run(self._load_watermark)
+
+    def _load_watermark(self, local):
+        cur = local.cursor()
+        try:
+            cur.execute(CREATE_STATE_TABLE)
+            cur.execute("SELECT watermark FROM replicaState WHERE stateID = 1")
+            row = cur.fetchone()
+            local.commit()
+            return row[0] if row else None
+        finally:
+            cur.close()
+
+    def sync(self, conn):
+        """Copy what changed on the primary (conn) since the last sync; returns the number of rows applied."""
+        started = time.monotonic()
+        with self._sync_lock:
+            if self.local is None:
+                self.open()
+            now = primary_now(conn)
+            since = self.watermark - self.lookback if self.watermark else EPOCH
+            applied = self.local.run(lambda local: self._apply(conn, local, since, now))
+            self.watermark = now
+        self.synced_at = started
+        return applied
+
+    def _apply(self, conn, local, since, now):
+        applied = 0
+        cur = local.cursor()
+        try:
+            # One local transaction; parents may arrive after their children, so check references at commit
+            cur.execute("PRAGMA defer_foreign_keys = ON")
+            for rows in operations.stream(conn, CHANGED_SPECS_QUERY, (since,), SYNC_CHUNK):
+                cur.execute(f"DELETE FROM carSpecs WHERE inventoryID IN ({in_list(rows)})", [row[0] for row in rows])
+                cur.executemany(INSERT_SPECS_QUERY, rows)
+                applied += len(rows)
+            for query, upsert in ((CHANGED_INVENTORY_QUERY, UPSERT_INVENTORY_QUERY),
+                                  (CHANGED_CARS_QUERY, UPSERT_CARS_QUERY)):
+                for rows in operations.stream(conn, query, (since,), SYNC_CHUNK):
+                    cur.executemany(upsert, rows)
+                    applied += len(rows)
+            for rows in operations.stream(conn, DELETED_QUERY, (since,), SYNC_CHUNK):
+                # Specs go with their inventory row (ON DELETE CASCADE)
+                cur.execute(f"DELETE FROM carInventory WHERE inventoryID IN ({in_list(rows)})",
+                            [row[0] for row in rows])
+                applied += len(rows)
+            cur.execute("INSERT INTO replicaState (stateID, watermark) VALUES (1, %s) "
+                        "ON DUPLICATE KEY UPDATE watermark = VALUES(watermark)", (now,))
+            local.commit()
+            if since == EPOCH:
+                # Planner statistics for the freshly filled tables, as seed.py gathers on the primary
+                for table in REPLICA_TABLES:
+                    cur.execute(f"ANALYZE TABLE {table}")
+                    cur.fetchall()
+            return applied
+        finally:
+            cur.close()
+
+    def start(self):
+        """Sync now and then every sync_interval seconds on a background thread."""
+        self._thread = threading.Thread(target=self._run, name="replica-sync", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            try:
+                self.primary.run(self.sync)
+                self.last_error = None
+            except Exception as err:
+                # Keep serving until the staleness bound passes, then reads go to the primary
+                self.last_error = err
+            self._wake.wait(self.sync_interval)
+            self._wake.clear()
+
+    def written(self):
+        """This desk just changed the primary: read from it until a sync that started afterwards completes."""
+        self.written_at = time.monotonic()
+        self._wake.set()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self.local is not None:
+            self.local.close_all()
+
+    # ------------------ Reads ------------------
+    @property
+    def fresh(self):
+        synced = self.synced_at
+        return (synced is not None and (self.written_at is None or synced > self.written_at)
+                and time.monotonic() - synced <= self.max_staleness)
+
+    def read(self, conn, work):
+        """work(conn) on the replica while it is fresh enough, otherwise on the primary connection."""
+        if self.fresh:
+            return self.local.run(work)
+        return work(conn)
+
+    # Same signatures as their operations.py counterparts; conn is the primary connection
+    def fetch_inventory_page(self, conn, *args, **kwargs):
+        return self.read(conn, lambda c: operations.fetch_inventory_page(c, *args, **kwargs))
+
+    def fetch_available_page(self, conn, *args, **kwargs):
+        return self.read(conn, lambda c: operations.fetch_available_page(c, *args, **kwargs))
+
+    def fetch_specs(self, conn, inventoryID):
+        return self.read(conn, lambda c: operations.fetch_specs(c, inventoryID))
+
+    def fetch_specs_batch(self, conn, inventoryIDs):
+        return self.read(conn, lambda c: operations.fetch_specs_batch(c, inventoryIDs))
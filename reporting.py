@@ -0,0 +1,215 @@
+import argparse
+import sys
+from datetime import timedelta
+
+# ------------------ Revenue and Utilization Aggregates ------------------
+# The admin reports read two summary tables (migrations/006) instead of
+# joining years of rentals:
+#   carRevenueMonthly    per car, month and insurance type
+#   fleetRevenueMonthly  per month and insurance type, for the whole fleet
+# Each row holds rentals started, rental and insurance revenue (counted in
+# the month a rental starts) and booked days (split over the months they
+# fall in). rent_car, return_car and remove_car apply their change to both
+# tables as upserts in their own transaction, so the aggregates commit or
+# roll back together with the rows they summarize.
+#
+# This module is also the maintenance tool: --rebuild recomputes both tables
+# from the rental tables (backfill after migrating, or repair), and --check
+# compares them against those and exits 1 on any difference.
+
+UPSERT_CAR_QUERY = """
+    INSERT INTO carRevenueMonthly
+        (inventoryID, month, insuranceType, rentals, rentalRevenue, insuranceRevenue, bookedDays)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE rentals = rentals + VALUES(rentals), rentalRevenue = rentalRevenue + VALUES(rentalRevenue),
+        insuranceRevenue = insuranceRevenue + VALUES(insuranceRevenue), bookedDays = bookedDays + VALUES(bookedDays)
+"""
+
+UPSERT_FLEET_QUERY = """
+    INSERT INTO fleetRevenueMonthly (month, insuranceType, rentals, rentalRevenue, insuranceRevenue, bookedDays)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE rentals = rentals + VALUES(rentals), rentalRevenue = rentalRevenue + VALUES(rentalRevenue),
+        insuranceRevenue = insuranceRevenue + VALUES(insuranceRevenue), bookedDays = bookedDays + VALUES(bookedDays)
+"""
+
+CAR_TOTALS_QUERY = """
+    SELECT month, insuranceType, rentals, rentalRevenue, insuranceRevenue, bookedDays
+    FROM carRevenueMonthly WHERE inventoryID = %s
+"""
+
+# Archived rentals (see archive.py) still count
+RAW_RENTALS_QUERY = """
+    SELECT inventoryID, insuranceType, rentDate, returnDate, rentalCost, insuranceCost
+    FROM rentedCars WHERE inventoryID >= %s AND inventoryID <= %s
+    UNION ALL
+    SELECT inventoryID, insuranceType, rentDate, returnDate, rentalCost, insuranceCost
+    FROM rentedCarsArchive WHERE inventoryID >= %s AND inventoryID <= %s
+"""
+
+STORED_CARS_QUERY = """
+    SELECT inventoryID, month, insuranceType, rentals, rentalRevenue, insuranceRevenue, bookedDays
+    FROM carRevenueMonthly WHERE inventoryID >= %s AND inventoryID <= %s
+"""
+
+STORED_FLEET_QUERY = """
+    SELECT month, insuranceType, rentals, rentalRevenue, insuranceRevenue, bookedDays FROM fleetRevenueMonthly
+"""
+
+CARS_CHUNK = 1000
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+def next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def booked_days(start, end):
+    """Days of [start, end) in each calendar month, as {first of month: days}."""
+    days = {}
+    while start < end:
+        month_end = min(next_month(start), end)
+        days[month_start(start)] = (month_end - start).days
+        start = month_end
+    return days
+
+
+def rental_totals(rentDate, returnDate, rentalCost, insuranceCost):
+    """{month: [rentals, rentalRevenue, insuranceRevenue, bookedDays]} contributed by one rental."""
+    totals = {month: [0, 0, 0, days] for month, days in booked_days(rentDate, returnDate).items()}
+    totals.setdefault(month_start(rentDate), [0, 0, 0, 0])[:3] = [1, rentalCost, insuranceCost]
+    return totals
+
+def return_totals(rentDate, planned, returned):
+    """Change in booked days when a rental planned to end on `planned` ends on `returned` instead."""
+    totals = {month: [0, 0, 0, days] for month, days in booked_days(rentDate, returned).items()}
+    for month, days in booked_days(rentDate, planned).items():
+        totals.setdefault(month, [0, 0, 0, 0])[3] -= days
+    return totals
+
+
+def apply_totals(cur, inventoryID, insuranceType, totals):
+    """Add {month: [rentals, rentalRevenue, insuranceRevenue, bookedDays]} for one car to both tables."""
+    rows = [(month, insuranceType, *values) for month, values in sorted(totals.items()) if any(values)]
+    if not rows:
+        return
+    # Same order in every transaction (car row, then fleet rows by month), so concurrent ones can't deadlock
+    cur.executemany(UPSERT_CAR_QUERY, [(inventoryID, *row) for row in rows])
+    cur.executemany(UPSERT_FLEET_QUERY, rows)
+
+def record_rental(cur, inventoryID, insuranceType, rentDate, returnDate, rentalCost, insuranceCost):
+    apply_totals(cur, inventoryID, insuranceType, rental_totals(rentDate, returnDate, rentalCost, insuranceCost))
+
+def record_return(cur, inventoryID, insuranceType, rentDate, planned, returned):
+    apply_totals(cur, inventoryID, insuranceType, return_totals(rentDate, planned, returned))
+
+def forget_car(cur, inventoryID):
+    """Take a car's totals out of the fleet table; its own rows go with it (ON DELETE CASCADE)."""
+    cur.execute(CAR_TOTALS_QUERY, (inventoryID,))
+    rows = sorted((month, insuranceType, *[-value for value in values])
+                  for month, insuranceType, *values in cur.fetchall())
+    if rows:
+        cur.executemany(UPSERT_FLEET_QUERY, rows)
+
+
+# ------------------ Rebuild and Consistency Check ------------------
+def fetch_all(cur, query, params=()):
+    cur.execute(query, params)
+    return cur.fetchall()
+
+def car_chunks(cur):
+    """Consecutive (first, last) inventoryID ranges of up to CARS_CHUNK cars."""
+    after = 0
+    while True:
+        ids = [row[0] for row in fetch_all(cur, "SELECT inventoryID FROM carInventory WHERE inventoryID > %s "
+                                                "ORDER BY inventoryID LIMIT %s", (after, CARS_CHUNK))]
+        if not ids:
+            return
+        yield ids[0], ids[-1]
+        after = ids[-1]
+
+def add_into(target, key, values):
+    current = target.setdefault(key, [0, 0, 0, 0])
+    for i, value in enumerate(values):
+        current[i] += value
+
+def expected_totals(cur, first, last, fleet):
+    """Aggregates for cars first..last recomputed from rentedCars; also adds them into `fleet`."""
+    cars = {}
+    for inventoryID, insuranceType, rentDate, returnDate, rentalCost, insuranceCost in fetch_all(
+            cur, RAW_RENTALS_QUERY, (first, last, first, last)):
+        for month, values in rental_totals(rentDate, returnDate, rentalCost, insuranceCost).items():
+            add_into(cars, (inventoryID, month, insuranceType), values)
+            add_into(fleet, (month, insuranceType), values)
+    return cars
+
+
+def rebuild(conn, log=print):
+    cur = conn.cursor()
+    try:
+        # Deleting first locks the tables, so rentals committing meanwhile wait and then add on top
+        cur.execute("DELETE FROM carRevenueMonthly")
+        cur.execute("DELETE FROM fleetRevenueMonthly")
+        fleet, cars_done = {}, 0
+        for first, last in car_chunks(cur):
+            cars = expected_totals(cur, first, last, fleet)
+            cur.executemany(UPSERT_CAR_QUERY, [(*key, *values) for key, values in sorted(cars.items())])
+            cars_done += len({key[0] for key in cars})
+        cur.executemany(UPSERT_FLEET_QUERY, [(*key, *values) for key, values in sorted(fleet.items())])
+        conn.commit()
+        log(f"Rebuilt aggregates for {cars_done} cars with rentals, {len(fleet)} fleet month rows")
+    finally:
+        cur.close()
+
+def differences(expected, stored, what):
+    # A missing row and an all-zero row are the same thing (a return can zero one out)
+    for key in sorted(set(expected) | set(stored), key=str):
+        want, have = expected.get(key, [0, 0, 0, 0]), stored.get(key, [0, 0, 0, 0])
+        if any(abs(a - b) > 0.005 for a, b in zip(want, have)):
+            yield f"{what} {key}: expected {want}, stored {have}"
+
+def check(conn, log=print):
+    """Compare the aggregates with rentedCars; returns the list of differences found."""
+    cur = conn.cursor()
+    problems, fleet = [], {}
+    try:
+        for first, last in car_chunks(cur):
+            expected = expected_totals(cur, first, last, fleet)
+            stored = {tuple(row[:3]): list(row[3:]) for row in fetch_all(cur, STORED_CARS_QUERY, (first, last))}
+            problems.extend(differences(expected, stored, "car"))
+        stored = {tuple(row[:2]): list(row[2:]) for row in fetch_all(cur, STORED_FLEET_QUERY)}
+        problems.extend(differences(fleet, stored, "fleet"))
+    finally:
+        cur.close()
+    for problem in problems[:50]:
+        log(problem)
+    log(f"{len(problems)} differences" if problems else "Aggregates match the rental tables.")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or check the revenue and utilization aggregates")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--rebuild", action="store_true", help="recompute the aggregates from rentedCars")
+    action.add_argument("--check", action="store_true", help="compare the aggregates with rentedCars; exit 1 on drift")
+    parser.add_argument("--sqlite", metavar="PATH", help="use an embedded SQLite database instead of MySQL")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from sqlite_backend import SQLitePool
+        pool = SQLitePool(args.sqlite)
+    else:
+        from dotenv import load_dotenv
+        from db_pool import ConnectionPool
+        load_dotenv()
+        pool = ConnectionPool.from_env()
+    try:
+        if args.rebuild:
+            pool.run(rebuild)
+        elif pool.run(check):
+            sys.exit(1)
+    finally:
+        pool.close_all()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import threading
+from bisect import bisect_left
+from datetime import date, timedelta
+
+import operations
+
+# ------------------ Reservation Index ------------------
+# In-memory index of open bookings (rentals without a transaction yet), kept
+# per vehicle as a list of [rentDate, returnDate) intervals sorted by start.
+# Bookings for one car never overlap (rent_car rejects overlaps), so the
+# interval ending last before a given date is always the one just before it
+# in start order, and a free/busy check is one bisect.
+#
+# The index is a read-side cache for browsing by date range, and for the cars
+# free right now: a booking made for a later date takes its car off the list
+# once that date arrives, which the isAvailable flag set at booking time does
+# not. rent_car checks overlaps again in the database under a row lock.
+#
+# A refresh pulls bookings and returns by ID. Auto-increment IDs are handed out
+# at insert but only become visible at commit, so a lower ID can show up after
+# a higher one has been read. Each refresh therefore re-reads the ID_LOOKBACK
+# IDs below its watermarks too; adding or removing a booking twice is a no-op.
+#
+# archive.py moves old closed rentals and their transactions out of the hot
+# tables. An index left idle for longer than ARCHIVE_AFTER_DAYS could lose the
+# transaction that closes one of its bookings that way, so a refresh that finds
+# archived transactions past its watermark throws the index away and reloads.
+
+# More rentals (or returns) than can start while an earlier one is still uncommitted
+ID_LOOKBACK = 500
+
+OPEN_BOOKINGS_QUERY = """
+    SELECT r.rentalID, r.inventoryID, r.rentDate, r.returnDate
+    FROM rentedCars r
+    WHERE r.rentalID > %s
+      AND NOT EXISTS (SELECT 1 FROM transactions t WHERE t.rentalID = r.rentalID)
+    ORDER BY r.rentalID
+"""
+
+CLOSED_BOOKINGS_QUERY = """
+    SELECT transactionID, rentalID FROM transactions WHERE transactionID > %s ORDER BY transactionID
+"""
+
+ARCHIVED_UP_TO_QUERY = "SELECT COALESCE(MAX(transactionID), 0) FROM transactionsArchive"
+
+
+class ReservationIndex:
+    def __init__(self, fetch_page=operations.fetch_inventory_page):
+        # Inventory pages come from fetch_page, e.g. a read replica's (see replica.py)
+        self.fetch_page = fetch_page
+        self._starts = {}      # inventoryID -> sorted rentDates
+        self._bookings = {}    # inventoryID -> [(rentDate, returnDate, rentalID)] in the same order
+        self._cars = {}        # rentalID -> inventoryID
+        self.last_rentalID = 0
+        self.last_transactionID = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def add(self, rentalID, inventoryID, start, end):
+        with self._lock:
+            if rentalID in self._cars:
+                return
+            starts = self._starts.setdefault(inventoryID, [])
+            bookings = self._bookings.setdefault(inventoryID, [])
+            i = bisect_left(starts, start)
+            starts.insert(i, start)
+            bookings.insert(i, (start, end, rentalID))
+            self._cars[rentalID] = inventoryID
+
+    def remove(self, rentalID):
+        with self._lock:
+            inventoryID = self._cars.pop(rentalID, None)
+            if inventoryID is None:
+                return
+            bookings = self._bookings[inventoryID]
+            i = next(i for i, booking in enumerate(bookings) if booking[2] == rentalID)
+            del bookings[i]
+            del self._starts[inventoryID][i]
+            if not bookings:
+                del self._bookings[inventoryID]
+                del self._starts[inventoryID]
+
+    def _overlaps(self, inventoryID, start, end, tomorrow):
+        starts = self._starts.get(inventoryID)
+        if not starts:
+            return False
+        # Last booking starting before our end is the only one that can reach into our window;
+        # a car that is overdue is still out, so it stays busy until at least tomorrow
+        i = bisect_left(starts, end)
+        return i > 0 and max(self._bookings[inventoryID][i - 1][1], tomorrow) > start
+
+    def is_free(self, inventoryID, start, end):
+        with self._lock:
+            return not self._overlaps(inventoryID, start, end, date.today() + timedelta(days=1))
+
+    def busy_cars(self, start, end):
+        tomorrow = date.today() + timedelta(days=1)
+        with self._lock:
+            return {inventoryID for inventoryID in self._starts if self._overlaps(inventoryID, start, end, tomorrow)}
+
+    def refresh(self, conn):
+        """Pull bookings opened and closed since the last refresh."""
+        with self._refresh_lock:
+            self._refresh(conn)
+
+    def reset(self):
+        with self._lock:
+            self._starts.clear()
+            self._bookings.clear()
+            self._cars.clear()
+            self.last_rentalID = 0
+            self.last_transactionID = None
+
+    def _refresh(self, conn):
+        if (self.last_transactionID is not None
+                and operations.fetch_one(conn, ARCHIVED_UP_TO_QUERY)[0] > self.last_transactionID):
+            # Closes we never saw may have been archived; start over from the open bookings
+            self.reset()
+        if self.last_transactionID is None:
+            # First load: open bookings already exclude everything closed so far; a return still
+            # committing below this maximum is caught by the next refresh's lookback
+            self.last_transactionID = operations.fetch_one(
+                conn, "SELECT COALESCE(MAX(transactionID), 0) FROM transactions")[0]
+        else:
+            for transactionID, rentalID in operations.fetch_all(
+                    conn, CLOSED_BOOKINGS_QUERY, (max(self.last_transactionID - ID_LOOKBACK, 0),)):
+                self.remove(rentalID)
+                self.last_transactionID = max(self.last_transactionID, transactionID)
+        for rentalID, inventoryID, start, end in operations.fetch_all(
+                conn, OPEN_BOOKINGS_QUERY, (max(self.last_rentalID - ID_LOOKBACK, 0),)):
+            self.add(rentalID, inventoryID, start, end)
+            self.last_rentalID = max(self.last_rentalID, rentalID)
+
+    def fetch_free_page(self, conn, start, end, after=None, before=None, limit=200,
+                        search=None, sort="id", descending=False):
+        """A page of inventory rows for cars with no booking overlapping [start, end)."""
+        self.refresh(conn)
+        busy = self.busy_cars(start, end)
+        rows = []
+        while len(rows) < limit:
+            page = self.fetch_page(conn, after, before, limit, search=search, sort=sort, descending=descending)
+            if before is not None:
+                rows[:0] = [row for row in page if row[0] not in busy]
+                if len(page) < limit:
+                    break
+                before = operations.sort_key(page[0], sort)
+            else:
+                rows.extend(row for row in page if row[0] not in busy)
+                if len(page) < limit:
+                    break
+                after = operations.sort_key(page[-1], sort)
+        # Trim back to one page, keeping the rows nearest to where paging started
+        return rows[-limit:] if before is not None else rows[:limit]
+
+    def fetch_available_page(self, conn, after=None, before=None, limit=200, search=None, sort="id",
+                             descending=False):
+        """A page of inventory rows for cars free today, i.e. with no booking overlapping [today, tomorrow)."""
+        today = date.today()
+        return self.fetch_free_page(conn, today, today + timedelta(days=1), after, before, limit,
+                                    search=search, sort=sort, descending=descending)
@@ -0,0 +1,161 @@
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from itertools import islice
+
+import operations
+import fleet_import
+import reporting
+
+# ------------------ Synthetic Data Generator ------------------
+# Fills an empty (test!) database with users, cars, specs and rental history
+# shaped like a real rental business, so query plans and latencies can be
+# measured at production scale (millions of rows):
+#   - a few makes dominate the fleet, prices follow make and model year
+#   - rentals per customer and per car are heavy-tailed (power-law), so a
+#     small share of regulars and popular cars account for most rentals
+#   - rental starts peak in summer and around year end, durations are mostly
+#     a few days with a long tail, and most rentals are closed
+# Rows are generated and inserted in batches, so memory stays flat at any size.
+
+BATCH_SIZE = 5000
+
+# (make, model, weight, base price per day)
+MAKES = [("Toyota", "Corolla", 18, 45), ("Honda", "Civic", 15, 48), ("Ford", "Focus", 12, 40),
+         ("Hyundai", "Elantra", 10, 42), ("Kia", "Rio", 10, 35), ("Nissan", "Sentra", 9, 40),
+         ("Volkswagen", "Golf", 8, 55), ("BMW", "320i", 6, 110), ("Mercedes", "C200", 5, 125),
+         ("Tesla", "Model 3", 4, 140), ("Toyota", "RAV4", 8, 70), ("Ford", "Transit", 3, 95)]
+MAKE_WEIGHTS = [make[2] for make in MAKES]
+SEATS = [2, 4, 5, 7, 9]
+SEAT_WEIGHTS = [3, 15, 65, 12, 5]
+INSURANCE = ["basic", "standard", "premium"]
+INSURANCE_WEIGHTS = [50, 35, 15]
+# Relative rental demand per month, January first
+MONTH_WEIGHTS = [6, 5, 7, 8, 9, 11, 14, 14, 9, 7, 6, 10]
+
+
+def batches(iterable, size=BATCH_SIZE):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def skewed_index(rng, n, skew=2.5):
+    # Power-law rank in [0, n): with skew 2.5 the top 1% of ranks get ~16% of picks
+    return int(n * rng.random() ** skew)
+
+
+def seed_users(conn, count, rng, admin_ratio=0.001):
+    hashed = operations.hash_password("password")  # one hash for all; bcrypt is slow on purpose
+    start = operations.fetch_one(conn, "SELECT COALESCE(MAX(userID), 0) FROM users")[0]
+    cur = conn.cursor()
+    for batch in batches(range(start, start + count)):
+        cur.executemany("INSERT INTO users (userName, email, password, role) VALUES (%s, %s, %s, %s)",
+                        [(f"s{i}", f"s{i}@example.com", hashed, "admin" if rng.random() < admin_ratio else "user")
+                         for i in batch])
+        conn.commit()
+    cur.close()
+
+
+def generate_car(rng, i, this_year):
+    make, model, _, base = rng.choices(MAKES, MAKE_WEIGHTS)[0]
+    year = this_year - min(int(rng.expovariate(1 / 3)), 12)
+    price = round(base * (1 - 0.04 * (this_year - year)) * rng.uniform(0.9, 1.15), 2)
+    seats = rng.choices(SEATS, SEAT_WEIGHTS)[0]
+    return (make, model, year, f"S-{i:09d}", max(price, 15), str(rng.randint(90, 450)), seats,
+            f"{rng.randint(15, 60)} mpg")
+
+
+def seed_cars(conn, count, rng):
+    this_year = date.today().year
+    start = operations.fetch_one(conn, "SELECT COALESCE(MAX(carID), 0) FROM cars")[0]
+    for batch in batches(range(start, start + count)):
+        fleet_import.insert_batch(conn, [generate_car(rng, i, this_year) for i in batch])
+
+
+def rental_start(rng, today, years):
+    year = today.year - rng.randint(0, years - 1)
+    month = rng.choices(range(1, 13), MONTH_WEIGHTS)[0]
+    start = date(year, month, rng.randint(1, 28))
+    if start >= today:
+        start = today - timedelta(days=rng.randint(1, 365))
+    return start
+
+
+def seed_rentals(conn, count, rng, years=3, closed_ratio=0.95):
+    user_min, user_max = operations.fetch_one(conn, "SELECT MIN(userID), MAX(userID) FROM users")
+    inv_min, inv_max = operations.fetch_one(conn, "SELECT MIN(inventoryID), MAX(inventoryID) FROM carInventory")
+    users, cars = user_max - user_min + 1, inv_max - inv_min + 1
+    # Shuffle rank -> id so popular customers and cars are spread over the ID range
+    user_offset, car_offset = rng.randrange(users), rng.randrange(cars)
+    today = date.today()
+    cur = conn.cursor()
+    for batch in batches(range(count)):
+        rows = []
+        for _ in batch:
+            start = rental_start(rng, today, years)
+            days = max(1, min(int(rng.lognormvariate(1.2, 0.7)), 60))
+            insurance = rng.choices(INSURANCE, INSURANCE_WEIGHTS)[0]
+            renter = user_min + (skewed_index(rng, users) * 7919 + user_offset) % users
+            car = inv_min + (skewed_index(rng, cars) * 104729 + car_offset) % cars
+            rows.append((renter, car, start, start + timedelta(days=days), insurance,
+                         operations.RATES.insurance_cost(insurance, days), days * rng.randint(25, 250)))
+        last_id = operations.fetch_one(conn, "SELECT COALESCE(MAX(rentalID), 0) FROM rentedCars")[0]
+        cur.executemany("""
+            INSERT INTO rentedCars (renterID, inventoryID, rentDate, returnDate, insuranceType, insuranceCost, rentalCost)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, rows)
+        cur.execute("SELECT rentalID, returnDate FROM rentedCars WHERE rentalID > %s ORDER BY rentalID", (last_id,))
+        closed = [(rentalID, returnDate) for rentalID, returnDate in cur.fetchall()
+                  if returnDate < today and rng.random() < closed_ratio]
+        cur.executemany("INSERT INTO transactions (rentalID, transactionDate) VALUES (%s, %s)", closed)
+        conn.commit()
+    cur.close()
+
+
+def seed(conn, users, cars, rentals, random_seed=42, log=print):
+    rng = random.Random(random_seed)
+    for name, count, step in (("users", users, lambda: seed_users(conn, users, rng)),
+                              ("cars", cars, lambda: seed_cars(conn, cars, rng)),
+                              ("rentals", rentals, lambda: seed_rentals(conn, rentals, rng))):
+        start = time.perf_counter()
+        step()
+        elapsed = time.perf_counter() - start
+        log(f"Seeded {count} {name} in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.0f}/s)")
+    # Rentals were inserted directly, so the report aggregates are recomputed from them once
+    reporting.rebuild(conn, log)
+    cur = conn.cursor()
+    for table in ("users", "cars", "carInventory", "carSpecs", "rentedCars", "transactions",
+                  "carRevenueMonthly", "fleetRevenueMonthly"):
+        cur.execute(f"ANALYZE TABLE {table}")
+        cur.fetchall()
+    cur.close()
+
+
+def main():
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Seed a test database with synthetic users, cars and rentals")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--cars", type=int, default=20000)
+    parser.add_argument("--rentals", type=int, default=200000)
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--sqlite", metavar="PATH", help="seed an embedded SQLite database instead of MySQL")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from sqlite_backend import SQLitePool
+        pool = SQLitePool(args.sqlite)
+    else:
+        from db_pool import ConnectionPool
+        load_dotenv()
+        pool = ConnectionPool.from_env()
+    pool.run(lambda conn: seed(conn, args.users, args.cars, args.rentals, args.random_seed))
+    pool.close_all()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,621 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from urllib.parse import parse_qs, urlsplit
+
+import operations
+import fleet_import
+from reservations import ReservationIndex
+from instrumentation import METRICS
+from hashing import HASHER
+from pricing import RATES
+
+# ------------------ Rental Service (HTTP/JSON) ------------------
+# A headless asyncio server exposing the operations behind the Login, Sign Up,
+# Admin and User screens, so many desk clients share one backend: one
+# connection pool, one set of caches and one reservation index, instead of a
+# pool per desktop. The Tk app runs as a thin client against it when
+# SERVICE_URL is set (see service_client.py).
+#
+#   - Database work runs on a small thread pool over the existing
+#     ConnectionPool (or the SQLite stand-in), bounded by a semaphore, so the
+#     event loop never blocks on a query. bcrypt runs in the hasher's worker
+#     processes and never holds a connection.
+#   - Inventory pages and specs are cached for SERVICE_CACHE_TTL seconds and
+#     dropped as soon as this service changes the inventory.
+#   - Identical reads arriving while one is in flight share its result, and
+#     specs lookups arriving within SERVICE_BATCH_MS are answered by one
+#     fetch_specs_batch query.
+#   - /login hands out a session token, sent back as "Authorization: Bearer
+#     <token>". Every route but login, sign-up, rates and health needs one;
+#     inventory changes, imports and reports need an admin's, and a user only
+#     sees, books and returns their own rentals.
+#
+# Settings (.env): SERVICE_HOST (default 127.0.0.1), SERVICE_PORT (8080),
+# SERVICE_DB_WORKERS (8), SERVICE_CACHE_TTL (2), SERVICE_BATCH_MS (2),
+# SERVICE_SESSION_TTL (idle seconds before a session token expires, 28800).
+
+MAX_BODY = 64 * 1024 * 1024
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+           404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def to_json(value):
+    # Same text the Treeview shows for date and datetime values in direct mode
+    if isinstance(value, datetime):
+        return value.isoformat(" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"Invalid date: {value!r} (use YYYY-MM-DD)")
+
+
+def int_param(params, name, default=None):
+    value = params.get(name, default)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"{name} must be an integer")
+
+
+def key_param(params, name):
+    # A keyset cursor: a plain inventoryID, or a JSON array of sort key values
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        key = json.loads(value)
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer or a JSON array")
+    return tuple(key) if isinstance(key, list) else key
+
+
+# ------------------ Async Pool, Caches and Batching ------------------
+class AsyncPool:
+    """Runs work(conn) from the sync pool on worker threads, at most `workers` at a time."""
+
+    def __init__(self, pool, workers=8):
+        self.pool = pool
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="service-db")
+        self._slots = asyncio.Semaphore(workers)
+        # (IntegrityError, Error) of the pool's driver, taken from the first connection used
+        self._errors = None
+
+    async def run(self, work):
+        def bound(conn):
+            if self._errors is None:
+                self._errors = operations.driver_error(conn, "IntegrityError"), operations.driver_error(conn)
+            return work(conn)
+
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self.pool.run, bound)
+
+    def driver_errors(self):
+        """(IntegrityError, Error) of the database driver; MySQL's until a connection has been used."""
+        return self._errors or (operations.driver_error(None, "IntegrityError"), operations.driver_error(None))
+
+    async def call(self, function, *args):
+        """Run a function that needs no connection (e.g. bcrypt) without taking a database slot."""
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.pool.close_all()
+
+
+class TTLCache:
+    def __init__(self, ttl, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        if len(self._entries) >= self.max_entries:
+            # Cheap bound: drop everything rather than track recency per entry
+            self._entries.clear()
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class Session:
+    def __init__(self, userID, role, expires):
+        self.userID = userID
+        self.role = role
+        self.expires = expires
+
+
+class Sessions:
+    """Login session tokens; a token lapses after ttl seconds without a request."""
+
+    def __init__(self, ttl=8 * 3600):
+        self.ttl = ttl
+        self._sessions = {}  # token -> Session
+
+    def issue(self, userID, role):
+        now = time.monotonic()
+        # Drop lapsed sessions as new ones come in, so the table stays bounded
+        for token in [token for token, session in self._sessions.items() if session.expires <= now]:
+            del self._sessions[token]
+        token = secrets.token_urlsafe(32)
+        self._sessions[token] = Session(userID, role, now + self.ttl)
+        return token
+
+    def get(self, authorization):
+        """The session an "Authorization: Bearer <token>" header belongs to, or None."""
+        scheme, _, token = (authorization or "").partition(" ")
+        session = self._sessions.get(token.strip()) if scheme.lower() == "bearer" else None
+        now = time.monotonic()
+        if session is None or session.expires <= now:
+            return None
+        session.expires = now + self.ttl
+        return session
+
+
+class SpecsBatcher:
+    """Collects specs lookups for a few milliseconds and answers them with one query."""
+
+    def __init__(self, db, delay_ms=2, max_batch=500):
+        self.db = db
+        self.delay = delay_ms / 1000
+        self.max_batch = max_batch
+        self._waiting = {}  # inventoryID -> [futures]
+        self._flush_handle = None
+
+    def get(self, inventoryID):
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(inventoryID, []).append(future)
+        if len(self._waiting) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.delay, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        waiting, self._waiting = self._waiting, {}
+        if waiting:
+            asyncio.ensure_future(self._load(waiting))
+
+    async def _load(self, waiting):
+        try:
+            specs = await self.db.run(lambda conn: operations.fetch_specs_batch(conn, waiting))
+        except Exception as err:
+            for futures in waiting.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(err)
+            return
+        for inventoryID, futures in waiting.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(specs.get(inventoryID))
+
+
+# ------------------ Service ------------------
+class RentalService:
+    def __init__(self, pool, workers=8, cache_ttl=2.0, batch_ms=2, session_ttl=8 * 3600):
+        self.db = AsyncPool(pool, workers)
+        self.sessions = Sessions(session_ttl)
+        self.pages = TTLCache(cache_ttl)
+        self.free_pages = TTLCache(cache_ttl)
+        self.specs = TTLCache(cache_ttl)
+        self.batcher = SpecsBatcher(self.db, batch_ms)
+        self.reservations = ReservationIndex()
+        self._inflight = {}
+        # (method, path, handler, access): access is None (anyone), "user" (any session) or "admin"
+        self.routes = [
+            ("POST", r"/login", self.login, None),
+            ("POST", r"/users", self.create_user, None),
+            ("GET", r"/inventory", self.inventory, "user"),
+            ("GET", r"/inventory/version", self.inventory_version, "user"),
+            ("GET", r"/available", self.available, "user"),
+            ("POST", r"/cars", self.add_car, "admin"),
+            ("POST", r"/cars/import", self.import_cars, "admin"),
+            ("PATCH", r"/cars/(\d+)", self.update_price, "admin"),
+            ("DELETE", r"/cars/(\d+)", self.remove_car, "admin"),
+            ("GET", r"/specs", self.specs_batch, "user"),
+            ("GET", r"/specs/(\d+)", self.car_specs, "user"),
+            ("POST", r"/rentals", self.rent_car, "user"),
+            ("GET", r"/rentals/active", self.active_rentals, "user"),
+            ("POST", r"/rentals/(\d+)/return", self.return_car, "user"),
+            ("GET", r"/transactions", self.transactions, "user"),
+            ("GET", r"/reports/revenue", self.revenue_report, "admin"),
+            ("GET", r"/reports/cars", self.top_cars, "admin"),
+            ("GET", r"/rates", self.rates, None),
+            ("GET", r"/health", self.health, None),
+            ("GET", r"/metrics", self.metrics, "admin"),
+        ]
+        self.routes = [(method, re.compile(pattern + "$"), handler, access)
+                       for method, pattern, handler, access in self.routes]
+
+    @classmethod
+    def from_env(cls, pool):
+        return cls(pool,
+                   workers=int(os.getenv("SERVICE_DB_WORKERS", "8")),
+                   cache_ttl=float(os.getenv("SERVICE_CACHE_TTL", "2")),
+                   batch_ms=float(os.getenv("SERVICE_BATCH_MS", "2")),
+                   session_ttl=float(os.getenv("SERVICE_SESSION_TTL", "28800")))
+
+    async def shared(self, key, work):
+        """Run work(conn) once for all concurrent requests with the same key."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self.db.run(work))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def cached_page(self, cache, key, work):
+        rows = cache.get(key)
+        if rows is None:
+            rows = await self.shared(key, work)
+            cache.put(key, rows)
+        return rows
+
+    def inventory_changed(self, cars=True):
+        # Any booking change affects the pages worked out from bookings (date ranges and
+        # cars free today); the inventory grid only changes when a car's row does
+        self.free_pages.clear()
+        if cars:
+            self.pages.clear()
+
+    # ------------------ Auth ------------------
+    async def login(self, session, params, body):
+        username, password = body.get("username", ""), body.get("password", "")
+        # Only the lookup holds a connection; the deliberately slow bcrypt check does not
+        row = await self.db.run(lambda conn: operations.fetch_login(conn, username))
+        status, userID, role, upgraded = await self.db.call(operations.verify_login, row, password)
+        if upgraded:
+            await self.db.run(lambda conn: operations.store_password_hash(conn, userID, upgraded))
+        token = self.sessions.issue(userID, role) if status == "ok" else None
+        return 200, {"status": status, "userID": userID, "role": role, "token": token}
+
+    async def create_user(self, session, params, body):
+        username, email, password = body.get("username", ""), body.get("email", ""), body.get("password", "")
+        if len(username) < 3 or len(password) < 5:
+            raise HTTPError(400, "Username must be at least 3 characters and password at least 5 characters.")
+        hashed = await self.db.call(operations.hash_password, password)
+        role = operations.signup_role(username, password)
+        await self.db.run(lambda conn: operations.insert_user(conn, username, email, hashed, role))
+        return 201, {}
+
+    # ------------------ Inventory ------------------
+    def page_params(self, params):
+        return (key_param(params, "after"), key_param(params, "before"),
+                min(int_param(params, "limit", 200), 1000))
+
+    def query_params(self, params):
+        sort = params.get("sort", "id")
+        if sort not in operations.SORT_KEYS:
+            raise HTTPError(400, f"sort must be one of: {', '.join(operations.SORT_KEYS)}")
+        return {"search": params.get("search") or None, "sort": sort, "descending": params.get("desc") == "1"}
+
+    async def inventory(self, session, params, body):
+        after, before, limit = self.page_params(params)
+        query = self.query_params(params)
+        rows = await self.cached_page(self.pages, ("inventory", after, before, limit, *query.values()),
+                                      lambda conn: operations.fetch_inventory_page(conn, after, before, limit, **query))
+        return 200, rows
+
+    async def inventory_version(self, session, params, body):
+        version = await self.shared(("version",), operations.fetch_inventory_version)
+        return 200, {"version": version}
+
+    async def available(self, session, params, body):
+        after, before, limit = self.page_params(params)
+        query = self.query_params(params)
+        if "from" in params or "to" in params:
+            start, end = parse_date(params.get("from")), parse_date(params.get("to"))
+            if end <= start:
+                raise HTTPError(400, "End date must be after start date.")
+            work = lambda conn: self.reservations.fetch_free_page(conn, start, end, after, before, limit, **query)
+            rows = await self.cached_page(self.free_pages, ("free", start, end, after, before, limit,
+                                                            *query.values()), work)
+        else:
+            work = lambda conn: self.reservations.fetch_available_page(conn, after, before, limit, **query)
+            rows = await self.cached_page(self.free_pages, ("available", after, before, limit, *query.values()),
+                                          work)
+        return 200, rows
+
+    async def add_car(self, session, params, body):
+        try:
+            car = fleet_import.validate(body)
+        except (ValueError, TypeError) as err:
+            raise HTTPError(400, str(err))
+        version, row = await self.db.run(lambda conn: operations.add_car(conn, *car))
+        self.inventory_changed()
+        return 201, {"version": version, "row": row}
+
+    async def import_cars(self, session, params, body):
+        records = body.get("records")
+        if not isinstance(records, list) or not all(
+                isinstance(pair, list) and len(pair) == 2 and isinstance(pair[0], int) and isinstance(pair[1], dict)
+                for pair in records):
+            raise HTTPError(400, "records must be a list of [row number, car] pairs")
+        report = await self.db.run(lambda conn: fleet_import.import_records(conn, records))
+        self.inventory_changed()
+        return 200, {"inserted": report.inserted, "errors": report.errors, "elapsed": report.elapsed}
+
+    async def update_price(self, session, params, body, inventoryID):
+        try:
+            price = float(body["pricePerDay"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPError(400, "pricePerDay must be a number")
+        version, row = await self.db.run(lambda conn: operations.update_price(conn, int(inventoryID), price))
+        self.inventory_changed()
+        return 200, {"version": version, "row": row}
+
+    async def remove_car(self, session, params, body, inventoryID):
+        version = await self.db.run(lambda conn: operations.remove_car(conn, int(inventoryID)))
+        self.inventory_changed()
+        self.specs.clear()
+        return 200, {"version": version}
+
+    async def car_specs(self, session, params, body, inventoryID):
+        inventoryID = int(inventoryID)
+        specs = self.specs.get(inventoryID)
+        if specs is None:
+            specs = await self.batcher.get(inventoryID)
+            if specs is not None:
+                self.specs.put(inventoryID, specs)
+        return 200, specs
+
+    async def specs_batch(self, session, params, body):
+        try:
+            ids = [int(value) for value in params.get("ids", "").split(",") if value]
+        except ValueError:
+            raise HTTPError(400, "ids must be a comma-separated list of integers")
+        found, missing = {}, []
+        for inventoryID in ids:
+            specs = self.specs.get(inventoryID)
+            if specs is None:
+                missing.append(inventoryID)
+            else:
+                found[inventoryID] = specs
+        if missing:
+            loaded = await self.db.run(lambda conn: operations.fetch_specs_batch(conn, missing))
+            for inventoryID, specs in loaded.items():
+                self.specs.put(inventoryID, specs)
+            found.update(loaded)
+        # JSON object keys would turn the IDs into strings, so send [id, specs] pairs
+        return 200, [[inventoryID, specs] for inventoryID, specs in found.items()]
+
+    # ------------------ Rentals ------------------
+    @staticmethod
+    def own(session, renterID):
+        # Users book, list and return only their own rentals
+        if renterID != session.userID:
+            raise HTTPError(403, "Not your rentals")
+        return renterID
+
+    async def rent_car(self, session, params, body):
+        try:
+            renterID, inventoryID = int(body.get("renterID", session.userID)), int(body["inventoryID"])
+            insuranceType = body["insuranceType"]
+            pricePerDay = body.get("pricePerDay")
+            pricePerDay = None if pricePerDay is None else Decimal(str(pricePerDay))
+        except (KeyError, TypeError, ValueError, ArithmeticError):
+            raise HTTPError(400, "inventoryID and insuranceType are required, and pricePerDay must be a number")
+        self.own(session, renterID)
+        rentDate, returnDate = parse_date(body.get("rentDate")), parse_date(body.get("returnDate"))
+        if insuranceType not in RATES.insurance:
+            raise HTTPError(400, f"Choose: {', '.join(RATES.insurance)}")
+        if returnDate <= rentDate:
+            raise HTTPError(400, "Return date must be after rent date.")
+        rentalID = await self.db.run(lambda conn: operations.rent_car(
+            conn, renterID, inventoryID, rentDate, returnDate, insuranceType, pricePerDay))
+        self.inventory_changed(cars=False)
+        return 201, {"rentalID": rentalID}
+
+    async def active_rentals(self, session, params, body):
+        renterID = self.own(session, int_param(params, "renterID", session.userID))
+        return 200, await self.db.run(lambda conn: operations.fetch_active_rentals(conn, renterID))
+
+    async def return_car(self, session, params, body, rentalID):
+        await self.db.run(lambda conn: operations.return_car(conn, int(rentalID), session.userID))
+        self.inventory_changed(cars=False)
+        return 200, {}
+
+    async def transactions(self, session, params, body):
+        renterID = self.own(session, int_param(params, "renterID", session.userID))
+        return 200, await self.db.run(lambda conn: operations.fetch_transactions(conn, renterID))
+
+    # ------------------ Reports ------------------
+    async def revenue_report(self, session, params, body):
+        months = min(max(int_param(params, "months", 12), 1), 120)
+        monthly, insurance = await self.db.run(lambda conn: operations.fetch_revenue_report(conn, months))
+        return 200, {"monthly": monthly, "insurance": insurance}
+
+    async def top_cars(self, session, params, body):
+        month, limit = parse_date(params.get("month")), min(int_param(params, "limit", 20), 100)
+        return 200, await self.db.run(lambda conn: operations.fetch_top_cars(conn, month, limit))
+
+    async def rates(self, session, params, body):
+        return 200, RATES.to_dict()
+
+    # ------------------ Operations ------------------
+    async def health(self, session, params, body):
+        await self.db.run(lambda conn: operations.fetch_one(conn, "SELECT 1"))
+        return 200, {"status": "ok"}
+
+    async def metrics(self, session, params, body):
+        snapshot = METRICS.snapshot()
+        snapshot["cache"] = {name: {"hits": cache.hits, "misses": cache.misses} for name, cache in (
+            ("pages", self.pages), ("free_pages", self.free_pages), ("specs", self.specs))}
+        return 200, snapshot
+
+    # ------------------ HTTP ------------------
+    def authorize(self, access, authorization):
+        if access is None:
+            return None
+        session = self.sessions.get(authorization)
+        if session is None:
+            raise HTTPError(401, "Log in first")
+        if access == "admin" and session.role != "admin":
+            raise HTTPError(403, "Admins only")
+        return session
+
+    async def dispatch(self, method, target, body, authorization=None):
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        allowed = False
+        for route_method, pattern, handler, access in self.routes:
+            match = pattern.match(url.path)
+            if match:
+                if route_method != method:
+                    allowed = True
+                    continue
+                session = self.authorize(access, authorization)
+                with METRICS.timer("service", f"{method} {pattern.pattern[:-1]}"):
+                    return await handler(session, params, body, *match.groups())
+        if allowed:
+            raise HTTPError(405, f"{method} not allowed on {url.path}")
+        raise HTTPError(404, f"No route for {url.path}")
+
+    async def respond(self, method, target, raw_body, authorization=None):
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+            if not isinstance(body, dict):
+                raise HTTPError(400, "Request body must be a JSON object")
+            return await self.dispatch(method, target, body, authorization)
+        except json.JSONDecodeError as err:
+            return 400, {"error": f"Invalid JSON: {err}"}
+        except HTTPError as err:
+            return err.status, {"error": str(err)}
+        except operations.BookingConflict as err:
+            return 409, {"error": str(err)}
+        except Exception as err:
+            # MySQL's or the SQLite stand-in's errors, whichever the pool uses
+            integrity, error = self.db.driver_errors()
+            if isinstance(err, integrity):
+                return 409, {"error": str(err), "errno": getattr(err, "errno", None)}
+            if isinstance(err, error):
+                return 503, {"error": str(err), "errno": getattr(err, "errno", None)}
+            return 500, {"error": f"{type(err).__name__}: {err}"}
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0") or 0)
+                if length > MAX_BODY:
+                    status, payload = 413, {"error": "Request body too large"}
+                    keep_alive = False
+                else:
+                    raw_body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.respond(method.upper(), target, raw_body,
+                                                         headers.get("authorization"))
+                    keep_alive = (headers.get("connection", "").lower() != "close"
+                                  and version.upper() == "HTTP/1.1")
+                data = json.dumps(payload, default=to_json).encode("utf-8")
+                writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                             + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        return await asyncio.start_server(self.handle_client, host, port, limit=MAX_BODY)
+
+    def close(self):
+        self.db.close()
+
+
+# ------------------ Command Line ------------------
+def main():
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Serve the rental operations over HTTP/JSON for thin clients")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--sqlite", metavar="PATH", help="serve an embedded SQLite database instead of MySQL")
+    args = parser.parse_args()
+
+    load_dotenv()
+    METRICS.configure_from_env()
+    HASHER.configure_from_env()
+    RATES.configure_from_env()
+    if args.sqlite:
+        from sqlite_backend import SQLitePool
+        pool = SQLitePool(args.sqlite)
+    else:
+        from db_pool import ConnectionPool
+        pool = ConnectionPool.from_env()
+    service = RentalService.from_env(pool)
+    host = args.host or os.getenv("SERVICE_HOST", "127.0.0.1")
+    port = args.port or int(os.getenv("SERVICE_PORT", "8080"))
+
+    async def run():
+        server = await service.serve(host, port)
+        print(f"Serving on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+        HASHER.shutdown()
+        METRICS.write()
+
+if __name__ == "__main__":
+    main()
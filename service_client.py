@@ -0,0 +1,204 @@
+import http.client
+import json
+import threading
+from itertools import islice
+from urllib.parse import urlencode, urlsplit
+
+import operations
+import fleet_import
+from pricing import RateTable
+
+# ------------------ Thin Client ------------------
+# Drop-in stand-ins for the operations module and the connection pool that
+# talk to service.py over HTTP instead of MySQL. Every function keeps the
+# signature of its operations.py counterpart (the conn argument is ignored),
+# so the screens submit the same work to the DB executor in both modes.
+# Each executor thread keeps one keep-alive HTTP connection to the service.
+
+
+class ServiceError(Exception):
+    def __init__(self, msg, errno=None):
+        super().__init__(msg)
+        self.errno = errno
+
+
+class ServiceClient:
+    def __init__(self, url, timeout=30):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 8080
+        self.timeout = timeout
+        # Session token from the last login, sent with every request
+        self.token = None
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def request(self, method, path, params=None, body=None):
+        if params:
+            path += "?" + urlencode({key: value for key, value in params.items() if value is not None})
+        data = json.dumps(body, default=str).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, data, headers)
+                response = conn.getresponse()
+                payload = json.loads(response.read() or b"null")
+                break
+            except (ConnectionError, http.client.HTTPException, OSError) as err:
+                # The service closed an idle keep-alive connection; reconnect once
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise ServiceError(f"Rental service unreachable: {err}")
+        if response.status == 409 and "errno" not in payload:
+            raise operations.BookingConflict(payload["error"])
+        if response.status >= 400:
+            raise ServiceError(payload.get("error", response.reason), payload.get("errno"))
+        return payload
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RemotePool:
+    """ConnectionPool look-alike: work(conn) runs locally with conn=None and reaches the service itself."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def acquire(self):
+        self.client.request("GET", "/health")
+
+    def release(self, conn):
+        pass
+
+    def run(self, work):
+        return work(None)
+
+    def close_all(self):
+        self.client.close()
+
+
+class RemoteOperations:
+    BookingConflict = operations.BookingConflict
+
+    def __init__(self, client):
+        self.client = client
+
+    def ping(self, conn):
+        self.client.request("GET", "/health")
+
+    def fetch_rates(self):
+        return RateTable.from_dict(self.client.request("GET", "/rates"))
+
+    def authenticate(self, conn, username, password):
+        result = self.client.request("POST", "/login", body={"username": username, "password": password})
+        if result["status"] == "ok":
+            self.client.token = result["token"]
+        return result["status"], result["userID"], result["role"]
+
+    def create_user(self, conn, username, email, password):
+        self.client.request("POST", "/users", body={"username": username, "email": email, "password": password})
+
+    @staticmethod
+    def page_params(after, before, limit, search, sort, descending):
+        # Sort keys travel as JSON arrays, e.g. after=["Civic", "ABC-123"]
+        return {"after": json.dumps(after) if after is not None else None,
+                "before": json.dumps(before) if before is not None else None,
+                "limit": limit, "search": search, "sort": sort, "desc": int(descending)}
+
+    def fetch_inventory_page(self, conn, after=None, before=None, limit=200, search=None, sort="id",
+                             descending=False):
+        return self.client.request("GET", "/inventory", self.page_params(after, before, limit, search, sort,
+                                                                         descending))
+
+    def fetch_available_page(self, conn, after=None, before=None, limit=200, search=None, sort="id",
+                             descending=False):
+        return self.client.request("GET", "/available", self.page_params(after, before, limit, search, sort,
+                                                                         descending))
+
+    def fetch_free_page(self, conn, start, end, after=None, before=None, limit=200, search=None, sort="id",
+                        descending=False):
+        params = self.page_params(after, before, limit, search, sort, descending)
+        params.update({"from": start.isoformat(), "to": end.isoformat()})
+        return self.client.request("GET", "/available", params)
+
+    def fetch_inventory_version(self, conn):
+        return self.client.request("GET", "/inventory/version")["version"]
+
+    def add_car(self, conn, carName, model, year, plate, price, hp, seat, fuel):
+        result = self.client.request("POST", "/cars", body=dict(zip(fleet_import.FIELDS, (
+            carName, model, year, plate, price, hp, seat, fuel))))
+        return result["version"], result["row"]
+
+    def remove_car(self, conn, inventoryID):
+        return self.client.request("DELETE", f"/cars/{inventoryID}")["version"]
+
+    def update_price(self, conn, inventoryID, new_cost):
+        result = self.client.request("PATCH", f"/cars/{inventoryID}", body={"pricePerDay": new_cost})
+        return result["version"], result["row"]
+
+    def fetch_specs(self, conn, inventoryID):
+        specs = self.client.request("GET", f"/specs/{inventoryID}")
+        return tuple(specs) if specs else None
+
+    def fetch_specs_batch(self, conn, inventoryIDs):
+        ids = ",".join(str(inventoryID) for inventoryID in inventoryIDs)
+        pairs = self.client.request("GET", "/specs", {"ids": ids})
+        return {inventoryID: tuple(specs) for inventoryID, specs in pairs}
+
+    def rent_car(self, conn, renterID, inventoryID, rentDate, returnDate, insuranceType, pricePerDay=None):
+        return self.client.request("POST", "/rentals", body={
+            "renterID": renterID, "inventoryID": inventoryID, "rentDate": rentDate.isoformat(),
+            "returnDate": returnDate.isoformat(), "insuranceType": insuranceType,
+            "pricePerDay": pricePerDay})["rentalID"]
+
+    def fetch_active_rentals(self, conn, renterID):
+        return self.client.request("GET", "/rentals/active", {"renterID": renterID})
+
+    def return_car(self, conn, rentalID, renterID=None):
+        # The service returns only the logged-in user's rentals
+        self.client.request("POST", f"/rentals/{rentalID}/return")
+
+    def fetch_transactions(self, conn, renterID):
+        return self.client.request("GET", "/transactions", {"renterID": renterID})
+
+    def iter_transactions(self, conn, renterID, size=operations.HISTORY_CHUNK):
+        # The service answers with one document; the screen still gets it in chunks
+        rows = self.fetch_transactions(conn, renterID)
+        for i in range(0, len(rows), size):
+            yield rows[i:i + size]
+
+    def fetch_revenue_report(self, conn, months=12):
+        report = self.client.request("GET", "/reports/revenue", {"months": months})
+        return report["monthly"], report["insurance"]
+
+    def fetch_top_cars(self, conn, month, limit=20):
+        return self.client.request("GET", "/reports/cars", {"month": str(month), "limit": limit})
+
+    def import_file(self, conn, path, batch_size=fleet_import.DEFAULT_BATCH_SIZE, progress=None):
+        # Records are read and streamed here; validation and inserts happen in the service
+        report = fleet_import.ImportReport()
+        records = fleet_import.read_records(path, report.add_error)
+        while True:
+            chunk = list(islice(records, batch_size))
+            if not chunk:
+                break
+            result = self.client.request("POST", "/cars/import", body={"records": chunk})
+            report.inserted += result["inserted"]
+            report.errors.extend(tuple(error) for error in result["errors"])
+            report.elapsed += result["elapsed"]
+            if progress:
+                progress(report)
+        return report
@@ -0,0 +1,69 @@
+import os
+from collections import OrderedDict
+
+# ------------------ Car Specs Cache ------------------
+# Bounded LRU cache of carSpecs rows keyed by inventoryID. The grids prefetch
+# specs for every page of rows they load with one IN (...) query, so opening
+# a car's specs normally needs no database round trip. A car with no specs
+# row is cached too (as None). Specs never change once a car is added, so
+# entries only need dropping when a car is added or removed.
+#
+# Settings (.env): SPECS_CACHE_SIZE (default 5000 cars).
+
+
+class SpecsCache:
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or int(os.getenv("SPECS_CACHE_SIZE", "5000"))
+        self._entries = OrderedDict()
+        self._loading = {}  # inventoryID -> prefetch job
+        self.hits = self.misses = 0
+
+    def __contains__(self, inventoryID):
+        return inventoryID in self._entries
+
+    def get(self, inventoryID):
+        """Cached specs (or None for a car without specs); check `in` first."""
+        self._entries.move_to_end(inventoryID)
+        return self._entries[inventoryID]
+
+    def lookup(self, inventoryID):
+        """Return (hit, specs), counting hits and misses."""
+        if inventoryID in self._entries:
+            self.hits += 1
+            return True, self.get(inventoryID)
+        self.misses += 1
+        return False, None
+
+    def put(self, inventoryID, specs):
+        self._entries[inventoryID] = specs
+        self._entries.move_to_end(inventoryID)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, inventoryID=None):
+        if inventoryID is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(inventoryID, None)
+
+    def prefetch(self, executor, fetch_batch, inventoryIDs):
+        """Load specs for the given cars that aren't cached or already being loaded, in one query."""
+        ids = [inventoryID for inventoryID in inventoryIDs if inventoryID not in self._entries
+               and not (inventoryID in self._loading and not self._loading[inventoryID].cancelled)]
+        if not ids:
+            return
+
+        def on_loaded(specs):
+            for inventoryID in ids:
+                self._loading.pop(inventoryID, None)
+                self.put(inventoryID, specs.get(inventoryID))
+
+        def on_failed(err):
+            # A prefetch is only an optimisation; view_specs falls back to a direct query
+            for inventoryID in ids:
+                self._loading.pop(inventoryID, None)
+
+        job = executor.submit(lambda conn: fetch_batch(conn, ids), on_success=on_loaded, on_error=on_failed,
+                              label="Loading specs...")
+        for inventoryID in ids:
+            self._loading[inventoryID] = job
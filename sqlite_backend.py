@@ -0,0 +1,194 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+from instrumentation import METRICS
+
+# ------------------ Embedded SQLite Stand-in ------------------
+# A small adapter that lets operations.py, the tools and the benchmarks run
+# against an embedded SQLite database instead of MySQL: same connection and
+# cursor methods, %s placeholders, and the handful of MySQL-only constructs
+# the app uses rewritten on the fly. The schema comes from the base SQL file
+# plus migrations/, translated the same way. Meant for headless benchmarks and
+# local runs, not as a production backend.
+
+BASE_SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "carRentalManagementSystemDataBase.sql")
+
+REWRITES = [
+    (re.compile(r"^\s*CREATE\s+SCHEMA\b.*$", re.I | re.S), "SELECT 1"),
+    (re.compile(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"\bENUM\s*\([^)]*\)", re.I), "TEXT"),
+    # Column types barely matter to SQLite (ENUMs are TEXT already), so type changes are no-ops
+    (re.compile(r"^\s*ALTER\s+TABLE\s+\w+\s+MODIFY\b.*$", re.I | re.S), "SELECT 1"),
+    # MySQL's default collation compares strings case-insensitively; NOCASE also lets LIKE 'x%' use an index
+    (re.compile(r"\bVARCHAR\s*\(\d+\)", re.I), r"\g<0> COLLATE NOCASE"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.I), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bVALUES\((\w+)\)", re.I), r"excluded.\1"),
+    (re.compile(r"\bANALYZE\s+TABLE\b", re.I), "ANALYZE"),
+    (re.compile(r"\bCURDATE\(\)", re.I), "date('now', 'localtime')"),
+    (re.compile(r"\bNOW\(\)", re.I), "datetime('now', 'localtime')"),
+    (re.compile(r"\bGREATEST\(", re.I), "MAX("),
+    (re.compile(r"\bLEAST\(", re.I), "MIN("),
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.I), ""),
+    (re.compile(r"%s"), "?"),
+]
+
+
+@lru_cache(maxsize=512)
+def translate(query):
+    for pattern, replacement in REWRITES:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+def _convert_date(value):
+    return date.fromisoformat(value.decode())
+
+def _convert_datetime(value):
+    return datetime.fromisoformat(value.decode())
+
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_converter("DATE", _convert_date)
+sqlite3.register_converter("DATETIME", _convert_datetime)
+
+
+class Cursor:
+    def __init__(self, conn):
+        self._cur = conn.cursor()
+
+    def execute(self, query, params=()):
+        self._cur.execute(translate(query), tuple(params))
+
+    def executemany(self, query, seq_params):
+        self._cur.executemany(translate(query), seq_params)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def fetchmany(self, size=1):
+        return self._cur.fetchmany(size)
+
+    @property
+    def lastrowid(self):
+        return self._cur.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    def close(self):
+        self._cur.close()
+
+
+class Connection:
+    # The driver's exceptions, as DB-API connections expose them (see operations.driver_error)
+    Error = sqlite3.Error
+    IntegrityError = sqlite3.IntegrityError
+
+    def __init__(self, path):
+        # Wait for other connections' write locks instead of failing with "database is locked"
+        self._conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                                     timeout=30)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        # SQLite connections aren't safe to share between threads; serialize use of this one
+        self.lock = threading.RLock()
+
+    def cursor(self, **kwargs):
+        return Cursor(self._conn)
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def ping(self, **kwargs):
+        pass
+
+    def close(self):
+        self._conn.close()
+
+
+def create_schema(conn):
+    import migrate
+
+    with open(BASE_SCHEMA, encoding="utf-8") as f:
+        statements = migrate.split_statements(f.read())
+    cur = conn.cursor()
+    for statement in statements:
+        cur.execute(statement)
+    conn.commit()
+    cur.close()
+    migrate.migrate(conn, log=lambda message: None)
+
+
+def connect(path=":memory:"):
+    """Open (and on first use, create) an embedded database at path, applying pending migrations."""
+    conn = Connection(path)
+    cur = conn.cursor()
+    cur.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'users'")
+    exists = cur.fetchone() is not None
+    cur.close()
+    if not exists:
+        create_schema(conn)
+    else:
+        import migrate
+        migrate.migrate(conn, log=lambda message: None)
+    return conn
+
+
+class SQLitePool:
+    """ConnectionPool look-alike over an embedded database.
+
+    By default all work shares one connection, one job at a time. With
+    per_thread=True (file databases only) every thread gets a connection of
+    its own, so jobs run concurrently and SQLite's file locking serializes
+    the writes, as the server would under contention.
+    """
+
+    def __init__(self, path=":memory:", per_thread=False):
+        self.path = path
+        self.per_thread = per_thread
+        self.conn = connect(path)
+        self._local = threading.local()
+        self._connections = [self.conn]
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if not self.per_thread:
+            return self.conn
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = Connection(self.path)
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def run(self, work):
+        conn = self._connection()
+        with conn.lock:
+            try:
+                return work(METRICS.wrap(conn))
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()